@@ -0,0 +1,304 @@
+"""Persistent cache of cycle simulation results. Results are stored as compressed columnar NumPy archives on local disk,
+addressed by a hash of the simulation inputs, and evicted in least-recently-used order when the cache exceeds its size
+limit."""
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+import zlib
+
+import numpy as np
+
+from app import qsm
+
+# Attributes that are (re)calculated during a simulation and thus do not identify the inputs.
+DERIVED_SYSTEM_PROPERTIES = ('tether_length', 'tether_mass', 'pitch')
+DERIVED_AERODYNAMICS = ('aerodynamic_force_coefficient', 'lift_to_drag')
+DERIVED_ENVIRONMENT_STATE = ('wind_speed', 'downwind_direction', 'air_density')
+
+CACHE_VERSION = 1
+
+
+def _model_fingerprint():
+    """Hash of the model source, such that results of a modified model are not served from the cache."""
+    with open(qsm.__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+MODEL_FINGERPRINT = _model_fingerprint()
+
+
+def _canonical(obj):
+    """Convert an input object to a JSON-serializable structure that does not depend on the object identities."""
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, type):
+        return "{}.{}".format(obj.__module__, obj.__qualname__)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    raise TypeError("Unsupported input for the cache key: {!r}.".format(obj))
+
+
+def input_fields(obj):
+    """Attributes of a system properties or environment state object that specify the simulation inputs.
+
+    Args:
+        obj (`SysPropsFixedAeroCoeffs` or `Environment` or children): Object describing the inputs.
+
+    Returns:
+        dict: Class name and input attributes.
+
+    """
+    fields = dict(vars(obj))
+    if isinstance(obj, qsm.SysPropsFixedAeroCoeffs):
+        derived = DERIVED_SYSTEM_PROPERTIES
+        if isinstance(obj, (qsm.SystemProperties, qsm.SysPropsAeroCurves)):
+            derived += DERIVED_AERODYNAMICS
+    elif isinstance(obj, qsm.EnvAtmosphericPressure):
+        # The wind speed only is an input for the height independent environment.
+        derived = DERIVED_ENVIRONMENT_STATE
+    else:
+        derived = ()
+    for key in derived:
+        fields.pop(key, None)
+    fields['class'] = type(obj)
+    return fields
+
+
+def content_hash(inputs):
+    """Hash of a structure of simulation inputs, independent of the object identities and dictionary order.
+
+    Args:
+        inputs (dict): Simulation inputs, see `_canonical` for the supported types.
+
+    Returns:
+        str: Hexadecimal SHA-256 hash.
+
+    """
+    serialized = json.dumps(_canonical(inputs), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def cycle_key(system_properties, environment_state, settings, steady_state_config={}):
+    """Content-addressed key of a cycle simulation.
+
+    Args:
+        system_properties (`SystemProperties`): Collection of system properties.
+        environment_state (`Environment` or child): Specification of environment.
+        settings (dict): Cycle settings, see `Cycle`.
+        steady_state_config (dict, optional): Iterative procedure settings for finding the steady state.
+
+    Returns:
+        str: Hexadecimal SHA-256 hash of the canonical inputs.
+
+    """
+    inputs = {
+        'version': CACHE_VERSION,
+        'model': MODEL_FINGERPRINT,
+        'system_properties': input_fields(system_properties),
+        'environment_state': input_fields(environment_state),
+        'settings': settings,
+        'steady_state_config': steady_state_config,
+    }
+    return content_hash(inputs)
+
+
+class CycleResult:
+    """Compact result of a cycle simulation, as stored in the cache.
+
+    Attributes:
+        summary (tuple): Output of `Cycle.run_simulation`.
+        energy (float): Energy produced during the cycle [J].
+        duration (float): Duration of the cycle [s].
+        average_power (float): Time average of the produced power [W].
+        columns (dict): Time series of the numeric fields of `TimeSeriesColumns` as arrays, and the phase of each time
+            point as 'phase_id', see `Cycle`.
+
+    """
+    def __init__(self, summary, energy, duration, average_power, columns):
+        self.summary = summary
+        self.energy = energy
+        self.duration = duration
+        self.average_power = average_power
+        self.columns = columns
+
+    @property
+    def time(self):
+        """ndarray: Points in time of the time series [s]."""
+        return self.columns['time']
+
+    @classmethod
+    def from_cycle(cls, cycle, summary):
+        """Extract the result of a simulated cycle.
+
+        Args:
+            cycle (`Cycle`): Simulated cycle.
+            summary (tuple): Output of `Cycle.run_simulation`.
+
+        Returns:
+            `CycleResult`: Result of the cycle.
+
+        """
+        columns = {f: cycle.columns[f].copy() for f in qsm.TimeSeriesColumns.FIELDS
+                   if cycle.columns[f].dtype != object}
+        columns['phase_id'] = cycle.phase_id.copy()
+        return cls(tuple(summary), float(cycle.energy), float(cycle.duration), float(cycle.average_power), columns)
+
+    @classmethod
+    def from_batch(cls, cycle, i, summary):
+        """Extract the result of a member of a simulated batch.
+
+        Args:
+            cycle (`CycleBatch`): Simulated batch of cycles.
+            i (int): Index of the member.
+            summary (tuple): Output of `CycleBatch.run_simulation` for the member.
+
+        Returns:
+            `CycleResult`: Result of the cycle, with the same columns as `from_cycle` where available.
+
+        """
+        result = cycle.results[i]
+        columns = {f: np.array(result[f]) for f in qsm.TimeSeriesColumns.FIELDS + ('phase_id',)
+                   if f in result and np.asarray(result[f]).dtype != object}
+        return cls(tuple(summary), float(cycle.energy[i]), float(cycle.duration[i]), float(cycle.average_power[i]),
+                   columns)
+
+
+class ResultCache:
+    """On-disk cache of `CycleResult` objects, which may be shared by several processes.
+
+    Attributes:
+        directory (str): Directory in which the results are stored.
+        max_bytes (int): Size limit of the cache [bytes].
+
+    """
+    SUFFIX = '.npz'
+
+    def __init__(self, directory=None, max_bytes=256*2**20):
+        """
+        Args:
+            directory (str, optional): Value for `directory` attribute, defaults to the AWES_CACHE_DIR environment
+                variable or a directory in the temporary directory.
+            max_bytes (int, optional): Value for `max_bytes` attribute.
+
+        """
+        if directory is None:
+            directory = os.environ.get('AWES_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'awes-app-cache'))
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key):
+        """Load a result and mark it as recently used.
+
+        Args:
+            key (str): Key of the result, see `cycle_key`.
+
+        Returns:
+            `CycleResult` or None: Cached result or None if not available or unreadable.
+
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as archive:
+                meta = json.loads(str(archive['meta']))
+                columns = {f: archive[f] for f in archive.files if f != 'meta'}
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile, zlib.error):
+            # The entry is corrupt or truncated, it is removed such that it is simulated and stored again.
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return CycleResult(tuple(meta['summary']), meta['energy'], meta['duration'], meta['average_power'], columns)
+
+    def put(self, key, result):
+        """Store a result and evict the least recently used results if the size limit is exceeded.
+
+        Args:
+            key (str): Key of the result, see `cycle_key`.
+            result (`CycleResult`): Result to store.
+
+        """
+        meta = {
+            'summary': _canonical(result.summary),
+            'energy': result.energy,
+            'duration': result.duration,
+            'average_power': result.average_power,
+        }
+        # Write to a temporary file first, such that readers never see partially written results.
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, meta=np.array(json.dumps(meta)), **result.columns)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used results until the cache is within its size limit."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove all results."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.SUFFIX):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+def run_cycle_cached(cache, settings, system_properties, environment_state, steady_state_config={}):
+    """Simulate a cycle, or load its result if it has been simulated before. Failing simulations are not cached.
+
+    Args:
+        cache (`ResultCache`): Result cache.
+        settings (dict): Cycle settings, see `Cycle`.
+        system_properties (`SystemProperties`): Collection of system properties.
+        environment_state (`Environment` or child): Specification of environment.
+        steady_state_config (dict, optional): Iterative procedure settings for finding the steady state.
+
+    Returns:
+        `CycleResult`: Result of the cycle.
+
+    """
+    key = cycle_key(system_properties, environment_state, settings, steady_state_config)
+    result = cache.get(key)
+    if result is None:
+        cycle = qsm.Cycle(settings)
+        summary = cycle.run_simulation(system_properties, environment_state, steady_state_config,
+                                       print_summary=False)
+        result = CycleResult.from_cycle(cycle, summary)
+        cache.put(key, result)
+    return result
@@ -0,0 +1,331 @@
+"""Headless batch runner of wind-speed sweeps, for parameter studies without the web app. A JSON parameter file specifies
+the kite areas, reference wind speeds, sites, and gearbox ratios of the study, e.g.:
+
+    {
+        "kite_areas": [7.0, 10.0],
+        "wind_speeds": {"min": 5.0, "max": 12.0, "steps": 20},
+        "gearbox_ratios": [4.26, 6.0],
+        "sites": [
+            {"name": "default", "h_0": 0.073, "altitude": 1450.0},
+            {"name": "madrid", "lat": 40.4, "lon": -3.7, "wind_speeds": [4.0, 6.0, 8.0, 10.0]}
+        ],
+        "location_data": "data/Wind_Data.nc"
+    }
+
+Sites are given by their roughness length and ground altitude, or by a location of which these are looked up in the
+location data, see `location_utils`. A site may specify its own "wind_speeds", in either format, which replace the
+wind speeds of the study for that site. Optional entries are "h_ref", "rmax", "rmin", "tether_angle" [deg],
+"drum_radius", and "time_step_tolerance", see `DEFAULTS`. Every combination of kite area and site is a grid point,
+whose sweep is simulated in a pool of worker processes and written to a columnar result file as soon as it completes.
+The drivetrain does not affect the simulation, such that the gearbox ratios are only applied in the summary. Result
+files of completed grid points are kept, such that an interrupted study resumes where it stopped. Run from the
+repository root with:
+
+    python -m app.cli study.json -o results
+
+"""
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from app.cache import MODEL_FINGERPRINT, ResultCache, content_hash
+from app.drivetrain import Drivetrain
+from app.metrics import pad, sweep_metrics
+from app.sweep import SweepPointError, kite_system_properties, run_sweep
+
+# Defaults of the optional entries of the parameter file, as used by the web app.
+DEFAULTS = {
+    'gearbox_ratios': [4.26],
+    'location_data': 'data/Wind_Data.nc',
+    'h_ref': 10.,
+    'rmax': 200.,
+    'rmin': 100.,
+    'tether_angle': 26.6,
+    'drum_radius': 0.2,
+    'time_step_tolerance': None,
+}
+
+# Metrics of `sweep_metrics` in the summary.
+SUMMARY_METRICS = ('mean_power', 'max_power', 'min_power', 'mean_power_generation', 'energy', 'energy_generation',
+                   'final_reeling_speed')
+
+
+def _wind_speeds(spec):
+    if isinstance(spec, dict):
+        return np.linspace(float(spec['min']), float(spec['max']), int(spec.get('steps', 20)))
+    return np.asarray(spec, dtype=float)
+
+
+def load_study(path):
+    """Read and validate a parameter file. Sites given by a location are resolved with the location data.
+
+    Args:
+        path (str): Path of the JSON parameter file.
+
+    Returns:
+        dict: Parameters of the study with the defaults filled in, and the wind speeds as an array, the roughness
+            length, and the altitude of every site.
+
+    """
+    with open(path) as f:
+        study = {**DEFAULTS, **json.load(f)}
+    for key in ('kite_areas', 'sites'):
+        if not study.get(key):
+            raise ValueError("Parameter file should specify '{}'.".format(key))
+    study['kite_areas'] = [float(a) for a in study['kite_areas']]
+    study['wind_speeds'] = _wind_speeds(study['wind_speeds']) if study.get('wind_speeds') else None
+    study['gearbox_ratios'] = [float(r) for r in study['gearbox_ratios']]
+
+    sites = []
+    for i, site in enumerate(study['sites']):
+        site = dict(site)
+        site.setdefault('name', 'site{}'.format(i + 1))
+        if site.get('wind_speeds'):
+            site['wind_speeds'] = _wind_speeds(site['wind_speeds'])
+        elif study['wind_speeds'] is not None:
+            site['wind_speeds'] = study['wind_speeds']
+        else:
+            raise ValueError("Parameter file should specify 'wind_speeds' for the study or for site '{}'."
+                             .format(site['name']))
+        if 'h_0' not in site or 'altitude' not in site:
+            if 'lat' not in site or 'lon' not in site:
+                raise ValueError("Site '{}' should specify either 'h_0' and 'altitude', or 'lat' and 'lon'."
+                                 .format(site['name']))
+            # Imported here, such that studies of sites with known parameters do not need the location data.
+            from app.location_utils import get_location_service
+            h_0, altitude = get_location_service(study['location_data']).lookup(site['lat'], site['lon'])
+            if not (np.isfinite(h_0) and np.isfinite(altitude)):
+                raise ValueError("No location data for site '{}'.".format(site['name']))
+            site.setdefault('h_0', float(h_0))
+            site.setdefault('altitude', float(altitude))
+        sites.append(site)
+    if len({site['name'] for site in sites}) != len(sites):
+        raise ValueError("Site names should be unique.")
+    study['sites'] = sites
+    return study
+
+
+def grid_points(study):
+    """Grid points of a study, one per combination of kite area and site.
+
+    Args:
+        study (dict): Output of `load_study`.
+
+    Returns:
+        list: Per grid point, a dict with the kite area [m^2], site name, roughness length [m], altitude [m], and
+            reference wind speeds of the site [m/s].
+
+    """
+    return [{'kite_area': kite_area, 'site': site['name'], 'h_0': float(site['h_0']),
+             'altitude': float(site['altitude']), 'wind_speeds': [float(v) for v in site['wind_speeds']]}
+            for kite_area in study['kite_areas'] for site in study['sites']]
+
+
+def point_key(study, point):
+    """Content-addressed key of the simulation inputs and the site name of a grid point. The name is included, such
+    that sites with equal parameters have their own result file.
+
+    Args:
+        study (dict): Output of `load_study`.
+        point (dict): Grid point, see `grid_points`.
+
+    Returns:
+        str: Hexadecimal SHA-256 hash.
+
+    """
+    return content_hash({
+        'model': MODEL_FINGERPRINT,
+        'site': point['site'],
+        'kite_area': point['kite_area'],
+        'h_0': point['h_0'],
+        'altitude': point['altitude'],
+        'wind_speeds': np.asarray(point['wind_speeds'], dtype=float),
+        'h_ref': study['h_ref'],
+        'rmax': study['rmax'],
+        'rmin': study['rmin'],
+        'tether_angle': study['tether_angle'],
+        'time_step_tolerance': study['time_step_tolerance'],
+    })
+
+
+def simulate_point(study, point, cache_dir=None):
+    """Simulate the sweep of a grid point.
+
+    Args:
+        study (dict): Output of `load_study`.
+        point (dict): Grid point, see `grid_points`.
+        cache_dir (str, optional): Directory of a `ResultCache` shared with other runs, results are not cached if
+            None.
+
+    Returns:
+        dict: Columns of the result, per wind speed: the reference wind speed [m/s], the error message (empty if
+            successful), the metrics of `sweep_metrics`, and the time series of the time [s], reeling speed [m/s],
+            tether force [N], and power [W] padded with NaN to equal length, with a mask of the valid samples.
+
+    """
+    cache = None if cache_dir is None else ResultCache(cache_dir)
+    results = run_sweep(kite_system_properties(point['kite_area']), point['wind_speeds'], study['h_ref'],
+                        point['h_0'], point['altitude'], study['rmax'], study['rmin'],
+                        np.deg2rad(study['tether_angle']), cache, time_step_tolerance=study['time_step_tolerance'])
+    failed = np.array([isinstance(res, SweepPointError) for _, res in results])
+    empty = np.empty(0)
+
+    def series(field):
+        return [empty if isinstance(res, SweepPointError) else res.columns[field] for _, res in results]
+
+    columns = {
+        'wind_speed': np.array([v for v, _ in results]),
+        'error': np.array([str(res) if isinstance(res, SweepPointError) else '' for _, res in results]),
+    }
+    for name, values in sweep_metrics(series('time'), series('power_ground'), series('reeling_speed')).items():
+        columns[name] = np.where(failed, np.nan, values)
+    for name, field in (('time', 'time'), ('reeling_speed', 'reeling_speed'), ('tether_force', 'tether_force_ground'),
+                        ('power', 'power_ground')):
+        columns[name], columns['valid'] = pad(series(field))
+    return columns
+
+
+def _point_path(output_dir, key):
+    return os.path.join(output_dir, 'point-{}.npz'.format(key[:32]))
+
+
+def write_point(path, point, columns):
+    """Write the result of a grid point, such that an interrupted run never leaves a partial file.
+
+    Args:
+        path (str): Path of the result file.
+        point (dict): Grid point, see `grid_points`.
+        columns (dict): Output of `simulate_point`.
+
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, point=np.array(json.dumps(point)), **columns)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_point(path):
+    """Read the result of a grid point.
+
+    Args:
+        path (str): Path of the result file.
+
+    Returns:
+        tuple: Grid point and columns, see `write_point`, or None if not available.
+
+    """
+    try:
+        with np.load(path) as archive:
+            return json.loads(str(archive['point'])), {f: archive[f] for f in archive.files if f != 'point'}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_summary(path, study, results):
+    """Write the metrics of all grid points, wind speeds, and gearbox ratios as a CSV file.
+
+    Args:
+        path (str): Path of the CSV file.
+        study (dict): Output of `load_study`.
+        results (list): Grid point and columns per grid point, see `read_point`.
+
+    """
+    drivetrain = Drivetrain(study['gearbox_ratios'], study['drum_radius'])
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['site', 'kite_area', 'h_0', 'altitude', 'wind_speed', 'gearbox_ratio'] +
+                        list(SUMMARY_METRICS) + ['max_torque', 'max_omega_rpm', 'error'])
+        for point, columns in results:
+            with np.errstate(invalid='ignore'):
+                max_force = np.max(np.where(columns['valid'], columns['tether_force'], -np.inf), axis=1)
+                max_speed = np.max(np.where(columns['valid'], columns['reeling_speed'], -np.inf), axis=1)
+            max_torque = drivetrain.torque(max_force)
+            max_omega_rpm = drivetrain.angular_speed(max_speed) * 60 / (2 * np.pi)
+            for k, ratio in enumerate(study['gearbox_ratios']):
+                for i, wind_speed in enumerate(columns['wind_speed']):
+                    failed = bool(columns['error'][i])
+                    writer.writerow([point['site'], point['kite_area'], point['h_0'], point['altitude'], wind_speed,
+                                     ratio] + [columns[m][i] for m in SUMMARY_METRICS] +
+                                    [np.nan if failed else max_torque[k, i],
+                                     np.nan if failed else max_omega_rpm[k, i], columns['error'][i]])
+
+
+def run_study(study, output_dir, max_workers=None, cache_dir=None, progress=None):
+    """Simulate all grid points of a study that have no result file yet, and write the summary.
+
+    Args:
+        study (dict): Output of `load_study`.
+        output_dir (str): Directory of the result files.
+        max_workers (int, optional): Number of worker processes, defaults to the number of processors. The grid
+            points are simulated in the current process if 1.
+        cache_dir (str, optional): Directory of a `ResultCache` shared with other runs, results are not cached if
+            None.
+        progress (callable, optional): Called with the grid point, the number of completed and total grid points.
+
+    Returns:
+        str: Path of the summary file.
+
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    points = grid_points(study)
+    paths = [_point_path(output_dir, point_key(study, point)) for point in points]
+    # Results are labelled with the grid points of this run rather than the points stored in the files.
+    results = [read_point(path) for path in paths]
+    results = [None if result is None else (point, result[1]) for point, result in zip(points, results)]
+    pending = [i for i, result in enumerate(results) if result is None]
+    n_completed = len(points) - len(pending)
+
+    if max_workers == 1:
+        completed = ((i, simulate_point(study, points[i], cache_dir)) for i in pending)
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        futures = {executor.submit(simulate_point, study, points[i], cache_dir): i for i in pending}
+        completed = ((futures[f], f.result()) for f in concurrent.futures.as_completed(futures))
+    try:
+        for i, columns in completed:
+            write_point(paths[i], points[i], columns)
+            results[i] = points[i], columns
+            n_completed += 1
+            if progress is not None:
+                progress(points[i], n_completed, len(points))
+    finally:
+        if executor is not None:
+            # Stop pending grid points when the run is interrupted, completed points are kept in their files.
+            executor.shutdown(cancel_futures=True)
+
+    summary_path = os.path.join(output_dir, 'summary.csv')
+    write_summary(summary_path, study, results)
+    return summary_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate the wind-speed sweeps of a parameter study.")
+    parser.add_argument('parameter_file', help="Path of the JSON parameter file.")
+    parser.add_argument('-o', '--output', default='results', help="Directory of the result files.")
+    parser.add_argument('-j', '--workers', type=int, help="Number of worker processes, defaults to the number of "
+                                                          "processors.")
+    parser.add_argument('--cache-dir', help="Directory of a result cache shared with other runs.")
+    args = parser.parse_args(argv)
+
+    study = load_study(args.parameter_file)
+
+    def progress(point, n_completed, n_points):
+        print("[{}/{}] kite area {:.2f} m^2, site {}".format(n_completed, n_points, point['kite_area'],
+                                                            point['site']), flush=True)
+
+    print("Written", run_study(study, args.output, args.workers, args.cache_dir, progress))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Decimation of long time series before they are sent to the browser as Plotly traces. A chart is at most about a
+thousand pixels wide, such that a cycle simulated with a small time step carries far more samples than can be shown.
+The samples are reduced to a bounded number per trace while the extremes, e.g. the peak tether force and the minimum
+power, are kept exactly."""
+import numpy as np
+import plotly.graph_objs as go
+
+# Upper bound of the number of points per trace.
+MAX_TRACE_POINTS = 2000
+# Traces with more points than this, after decimation, are rendered with WebGL instead of SVG. It is below
+# `MAX_TRACE_POINTS`, such that series that are long enough to be decimated are rendered with WebGL.
+WEBGL_THRESHOLD = 1000
+
+
+def minmax_indices(x, y, n_buckets):
+    """Indices of the minimum and maximum sample of each of `n_buckets` equally wide buckets of `x`, and of the first
+    and last sample. The envelope of the series is preserved at the resolution of the buckets.
+
+    Args:
+        x (ndarray): Non-decreasing sample positions, e.g. time points.
+        y (ndarray): Sample values, non-finite values are skipped.
+        n_buckets (int): Number of buckets, e.g. the chart width in pixels.
+
+    Returns:
+        ndarray: Sorted unique sample indices, at most 2 * `n_buckets` + 2.
+
+    """
+    n = len(x)
+    if n <= 2:
+        return np.arange(n)
+    edges = np.linspace(x[0], x[-1], n_buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, n_buckets - 1)
+
+    # Sorting by bucket and then value puts the minimum and maximum of each bucket at the ends of its group.
+    finite = np.flatnonzero(np.isfinite(y))
+    order = finite[np.lexsort((y[finite], bucket[finite]))]
+    if not len(order):
+        return np.array([0, n - 1])
+    sorted_bucket = bucket[order]
+    starts = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+    ends = np.r_[starts[1:], len(order)] - 1
+    return np.unique(np.concatenate([[0, n - 1], order[starts], order[ends]]))
+
+
+def lttb_indices(x, y, n_out):
+    """Indices selected with the largest-triangle-three-buckets algorithm. The interior samples are divided into
+    `n_out` - 2 buckets of equal count, from each of which the sample is selected that spans the largest triangle with
+    the previously selected sample and the mean of the next bucket. The first and last sample are always selected.
+
+    Args:
+        x (ndarray): Non-decreasing sample positions, e.g. time points.
+        y (ndarray): Finite sample values.
+        n_out (int): Number of samples to select.
+
+    Returns:
+        ndarray: Sorted sample indices.
+
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        # Twice the triangle area, which suffices for the comparison.
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def decimate(x, y, max_points=MAX_TRACE_POINTS, method='minmax'):
+    """Reduce a time series to a bounded number of points that keeps its extremes.
+
+    Args:
+        x (array_like): Non-decreasing sample positions, e.g. time points.
+        y (array_like): Sample values.
+        max_points (int, optional): Upper bound of the number of points, None to not decimate.
+        method (str, optional): 'minmax' for the minimum and maximum per bucket or 'lttb' for
+            largest-triangle-three-buckets, to which the overall minimum and maximum are added.
+
+    Returns:
+        tuple: Decimated `x` and `y` as arrays.
+
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) != len(y):
+        raise ValueError("Sample positions and values should have the same length.")
+    if max_points is None or len(x) <= max_points:
+        return x, y
+
+    if method == 'minmax':
+        idx = minmax_indices(x, y, max(1, (max_points - 2) // 2))
+    elif method == 'lttb':
+        finite = np.isfinite(y)
+        if not finite.all():
+            x, y = x[finite], y[finite]
+        if len(x) <= max_points:
+            return x, y
+        idx = np.union1d(lttb_indices(x, y, max_points - 2), [np.argmin(y), np.argmax(y)])
+    else:
+        raise ValueError("Unknown decimation method: {}.".format(method))
+    return x[idx], y[idx]
+
+
+def line_trace(x, y, max_points=MAX_TRACE_POINTS, method='minmax', webgl_threshold=WEBGL_THRESHOLD, **kwargs):
+    """Line trace of a decimated time series.
+
+    Args:
+        x (array_like): Non-decreasing sample positions, e.g. time points.
+        y (array_like): Sample values.
+        max_points (int, optional): Upper bound of the number of points, None to not decimate.
+        method (str, optional): Decimation method, see `decimate`.
+        webgl_threshold (int, optional): Number of points above which a `Scattergl` trace is returned, None to always
+            return a `Scatter` trace.
+        **kwargs: Further trace properties, e.g. name and line.
+
+    Returns:
+        `go.Scatter` or `go.Scattergl`: Trace with mode 'lines'.
+
+    """
+    x, y = decimate(x, y, max_points, method)
+    trace_type = go.Scattergl if webgl_threshold is not None and len(x) > webgl_threshold else go.Scatter
+    return trace_type(x=x, y=y, mode='lines', **kwargs)
@@ -0,0 +1,58 @@
+"""Transformation of the mechanical cycle results at the tether to the rotational quantities at the electrical machine.
+The drivetrain does not affect the kite dynamics, such that the gearbox ratio and drum radius can be changed without
+simulating the cycle again."""
+import numpy as np
+
+
+class Drivetrain:
+    """Drum and gearbox between the tether and the electrical machine.
+
+    Attributes:
+        gearbox_ratio (float or ndarray): Ratio of the machine speed to the drum speed [-], a 1-D array evaluates
+            several ratios at once.
+        drum_radius (float): Radius of the drum [m].
+
+    """
+    def __init__(self, gearbox_ratio, drum_radius=0.2):
+        """
+        Args:
+            gearbox_ratio (float or array_like): Value for `gearbox_ratio` attribute.
+            drum_radius (float, optional): Value for `drum_radius` attribute.
+
+        """
+        gearbox_ratio = np.asarray(gearbox_ratio, dtype=float)
+        if gearbox_ratio.ndim > 1:
+            raise ValueError("Gearbox ratio should be a scalar or a 1-D array.")
+        if np.any(gearbox_ratio <= 0.) or drum_radius <= 0.:
+            raise ValueError("Gearbox ratio and drum radius should be positive.")
+        self.gearbox_ratio = gearbox_ratio[()] if gearbox_ratio.ndim == 0 else gearbox_ratio
+        self.drum_radius = drum_radius
+
+    def _per_ratio(self, values, factor):
+        # Multiple ratios add a leading axis to the result.
+        values = np.asarray(values, dtype=float)
+        return np.multiply.outer(factor, values) if np.ndim(factor) else factor * values
+
+    def torque(self, tether_force):
+        """Torque at the machine shaft.
+
+        Args:
+            tether_force (float or array_like): Tether force at the ground [N].
+
+        Returns:
+            float or ndarray: Torque [Nm], with a leading axis for multiple gearbox ratios.
+
+        """
+        return self._per_ratio(tether_force, self.drum_radius / self.gearbox_ratio)
+
+    def angular_speed(self, reeling_speed):
+        """Rotational speed of the machine shaft.
+
+        Args:
+            reeling_speed (float or array_like): Reeling speed of the tether [m/s].
+
+        Returns:
+            float or ndarray: Angular speed [rad/s], with a leading axis for multiple gearbox ratios.
+
+        """
+        return self._per_ratio(reeling_speed, self.gearbox_ratio / self.drum_radius)
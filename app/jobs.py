@@ -0,0 +1,334 @@
+"""Simulation jobs that run in the background of the app. A job fans its cycle simulations out over a pool of worker
+processes shared by all sessions and returns immediately, such that the page can show the progress and the partial
+results while the points complete. The points of a sweep are simulated in chunks, one `CycleBatch` per worker. Points
+of which the result is in the result cache complete at submission."""
+import collections
+import concurrent.futures
+import functools
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+
+from app.cache import CycleResult, run_cycle_cached
+from app.qsm import Cycle
+from app.sweep import SweepPointError, SweepResult, simulate_sweep_batch, sweep_point_inputs
+
+
+def simulate_cycle(cache, settings, system_properties, environment_state):
+    """Simulate a single cycle in a worker process.
+
+    Args:
+        cache (`ResultCache`): Result cache, results are not cached if None.
+        settings (dict): Cycle settings, see `Cycle`.
+        system_properties (`SystemProperties`): Collection of system properties.
+        environment_state (`Environment` or child): Specification of environment.
+
+    Returns:
+        `CycleResult`: Result of the cycle.
+
+    """
+    if cache is not None:
+        return run_cycle_cached(cache, settings, system_properties, environment_state)
+    cycle = Cycle(settings)
+    summary = cycle.run_simulation(system_properties, environment_state, print_summary=False)
+    return CycleResult.from_cycle(cycle, summary)
+
+
+class Job:
+    """Background simulation of one or several cycles, one per reference wind speed.
+
+    Attributes:
+        job_id (int): Identifier of the job, unique per runner.
+        wind_speeds (list): Reference wind speed per point [m/s].
+        results (list): `CycleResult` or `SweepPointError` per point, None while the point is pending.
+        status (str): 'running', 'done', 'cancelled', or 'failed'.
+        error (Exception): Error that stopped the job, None unless it failed.
+        started (float): Submission time, see `time.monotonic` [s].
+        finished (float): Completion time, None while running [s].
+        key (tuple): Result cache keys of the points of a sweep, see `sweep_point_inputs`, None for a single cycle.
+
+    """
+    def __init__(self, job_id, wind_speeds, key=None):
+        """
+        Args:
+            job_id (int): Value for `job_id` attribute.
+            wind_speeds (list): Value for `wind_speeds` attribute.
+            key (tuple, optional): Value for `key` attribute.
+
+        """
+        self.job_id = job_id
+        self.wind_speeds = list(wind_speeds)
+        self.key = key
+        self.results = [None] * len(self.wind_speeds)
+        self.status = 'running'
+        self.error = None
+        self.started = time.monotonic()
+        self.finished = None
+        self._futures = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        """bool: True if the job is no longer running."""
+        return self._done.is_set()
+
+    @property
+    def n_completed(self):
+        """int: Number of completed points."""
+        return sum(result is not None for result in self.results)
+
+    @property
+    def progress(self):
+        """float: Fraction of the completed points."""
+        return self.n_completed / len(self.results) if self.results else 1.
+
+    def completed(self):
+        """Completed points in wind speed order.
+
+        Returns:
+            list: Tuples of the reference wind speed [m/s] and the `CycleResult` or `SweepPointError`.
+
+        """
+        with self._lock:
+            return [(v, result) for v, result in zip(self.wind_speeds, self.results) if result is not None]
+
+    def sweep_result(self):
+        """Sweep result of the completed points.
+
+        Returns:
+            `SweepResult`: Result of the completed points.
+
+        """
+        return SweepResult(self.completed())
+
+    def wait(self, timeout=None):
+        """Block until the job is no longer running.
+
+        Args:
+            timeout (float, optional): Maximum waiting time [s], waits indefinitely if None.
+
+        Returns:
+            bool: True if the job is no longer running.
+
+        """
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """Stop the job. Pending points are not simulated, the results of points that are being simulated are
+        discarded.
+
+        Returns:
+            bool: False if the job was no longer running.
+
+        """
+        if not self._finish('cancelled'):
+            return False
+        for future in self._futures:
+            future.cancel()
+        return True
+
+    def _finish(self, status, error=None):
+        with self._lock:
+            if self.status != 'running':
+                return False
+            self.status = status
+            self.error = error
+            self.finished = time.monotonic()
+        self._done.set()
+        return True
+
+    def _set_result(self, i, result):
+        with self._lock:
+            if self.status != 'running':
+                return
+            self.results[i] = result
+            complete = all(r is not None for r in self.results)
+        if complete:
+            self._finish('done')
+
+
+class SweepResultStore:
+    """Bounded store of the results of completed sweep jobs, which may be shared by several sessions, such that the
+    metrics of a sweep are derived once.
+
+    Attributes:
+        max_size (int): Maximum number of stored results, the least recently used result is dropped first.
+
+    """
+    def __init__(self, max_size=16):
+        """
+        Args:
+            max_size (int, optional): Value for `max_size` attribute.
+
+        """
+        self.max_size = max_size
+        self._results = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Stored result of a sweep.
+
+        Args:
+            key (tuple): Key of the sweep, see `sweep_key`.
+
+        Returns:
+            `SweepResult`: Stored result, None if there is none.
+
+        """
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def add(self, job):
+        """Store the result of a completed sweep job.
+
+        Args:
+            job (`Job`): Completed sweep job.
+
+        Returns:
+            `SweepResult`: Stored result of a sweep with the same inputs, or the result of the job, which is stored.
+
+        """
+        with self._lock:
+            result = self._results.get(job.key)
+            if result is None:
+                result = self._results[job.key] = job.sweep_result()
+                if len(self._results) > self.max_size:
+                    self._results.popitem(last=False)
+            else:
+                self._results.move_to_end(job.key)
+            return result
+
+
+class JobRunner:
+    """Runner of background simulation jobs over a pool of worker processes, which may be shared by several sessions.
+
+    Attributes:
+        cache (`ResultCache`): Result cache, results are not cached if None.
+        max_workers (int): Number of worker processes, None for the number of processors.
+
+    """
+    def __init__(self, cache=None, max_workers=None):
+        """
+        Args:
+            cache (`ResultCache`, optional): Value for `cache` attribute.
+            max_workers (int, optional): Value for `max_workers` attribute.
+
+        """
+        self.cache = cache
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Forking the multi-threaded server process is unsafe, the workers are started from scratch instead.
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def _discard_executor(self, executor):
+        # A broken pool is replaced at the next submission.
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_done(self, executor, job, indices, keys, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, concurrent.futures.process.BrokenProcessPool):
+            self._discard_executor(executor)
+            job._finish('failed', error)
+            return
+        if error is None:
+            # A chunk of a sweep returns a result per point, a single cycle its result.
+            results = future.result()
+            if isinstance(results, CycleResult):
+                results = [results]
+        else:
+            results = [SweepPointError(job.wind_speeds[i], getattr(error, 'msg', str(error)), error.__class__.__name__)
+                       for i in indices]
+        for i, key, result in zip(indices, keys, results):
+            if key is not None and self.cache is not None and isinstance(result, CycleResult):
+                self.cache.put(key, result)
+            job._set_result(i, result)
+
+    def _submit(self, job, indices, keys, fn, *args):
+        executor = self._get_executor()
+        future = executor.submit(fn, *args)
+        job._futures.append(future)
+        future.add_done_callback(functools.partial(self._on_done, executor, job, indices, keys))
+
+    def submit_cycle(self, settings, system_properties, environment_state, wind_speed):
+        """Simulate a single cycle in the background.
+
+        Args:
+            settings (dict): Cycle settings, see `Cycle`.
+            system_properties (`SystemProperties`): Collection of system properties.
+            environment_state (`Environment` or child): Specification of environment.
+            wind_speed (float): Reference wind speed of the environment [m/s], used to label the result.
+
+        Returns:
+            `Job`: Running job with a single point.
+
+        """
+        job = Job(next(self._job_ids), [float(wind_speed)])
+        self._submit(job, [0], [None], simulate_cycle, self.cache, settings, system_properties, environment_state)
+        return job
+
+    def submit_sweep(self, sys_props, wind_speeds, h_ref, h_0, altitude, rmax, rmin, tether_angle,
+                     time_step_tolerance=None):
+        """Simulate a wind-speed sweep in the background, with the same points and cache entries as `run_sweep`. The
+        points that are not in the result cache are split in a chunk per worker, the progress of the job advances per
+        completed chunk.
+
+        Args:
+            sys_props (`SystemProperties`): Collection of system properties.
+            wind_speeds (iterable): Reference wind speeds [m/s].
+            h_ref (float): Reference height of the wind profile [m].
+            h_0 (float): Roughness length [m].
+            altitude (float): Altitude of the ground station [m].
+            rmax (float): Tether length at the start of the retraction phase [m].
+            rmin (float): Tether length at the end of the retraction phase [m].
+            tether_angle (float): Elevation angle of the traction phase [rad].
+            time_step_tolerance (float, optional): Tolerance of the adaptive time stepping, fixed time steps are used
+                if None.
+
+        Returns:
+            `Job`: Running job with a point per wind speed.
+
+        """
+        wind_speeds, _, _, keys = sweep_point_inputs(sys_props, wind_speeds, h_ref, h_0, altitude, rmax, rmin,
+                                                     tether_angle, time_step_tolerance)
+        job = Job(next(self._job_ids), wind_speeds, tuple(keys))
+        if not wind_speeds:
+            job._finish('done')
+        cached = [None if self.cache is None else self.cache.get(key) for key in keys]
+        for i, result in enumerate(cached):
+            if result is not None:
+                job._set_result(i, result)
+        missing = [i for i, result in enumerate(cached) if result is None]
+        # The chunks interleave the wind speeds, such that the chunks take similar times.
+        n_chunks = min(len(missing), self.max_workers or os.cpu_count() or 1)
+        for c in range(n_chunks):
+            chunk = missing[c::n_chunks]
+            self._submit(job, chunk, [keys[i] for i in chunk], simulate_sweep_batch, sys_props,
+                         [wind_speeds[i] for i in chunk], h_ref, h_0, altitude, rmax, rmin, tether_angle,
+                         time_step_tolerance)
+        return job
+
+    def shutdown(self):
+        """Stop the worker processes, pending points of running jobs are not simulated."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
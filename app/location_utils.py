@@ -1,20 +1,389 @@
-import netCDF4
+"""Roughness length and ground altitude of the ERA5 grid cell closest to a location. The data is read either from the
+original NetCDF file or, if available, from a preprocessed site grid file that is accessed through memory mapping.
+
+The site grid file is created once with:
+
+    python -m app.location_utils data/Wind_Data.nc
+"""
+import abc
+import json
+import os
+import threading
+from functools import lru_cache
+
 import numpy as np
 
+GRAVITATIONAL_ACCELERATION = 9.80665  # [m/s^2]
+
+SITE_GRID_SUFFIX = '.sitegrid'
+SITE_GRID_MAGIC = b'AWESGRD1'
+SITE_GRID_ALIGNMENT = 64  # Arrays start at multiples of the alignment [bytes].
+
+
+class LocationService(abc.ABC):
+    """Nearest grid cell lookup of the ERA5 surface data. The grid indices are computed from the regular grid spacing,
+    such that a lookup only reads the requested cells. Children provide the access to the data.
+
+    Attributes:
+        latitudes (ndarray): Latitudes of the grid [deg].
+        longitudes (ndarray): Longitudes of the grid [deg].
+
+    """
+    def __init__(self, latitudes, longitudes):
+        """
+        Args:
+            latitudes (array_like): Value for `latitudes` attribute.
+            longitudes (array_like): Value for `longitudes` attribute.
+
+        """
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+
+        self._lat_start, self._lat_step = self._regular_spacing(self.latitudes)
+        self._lon_start, self._lon_step = self._regular_spacing(self.longitudes)
+        n_lons = len(self.longitudes)
+        if self._lon_step is not None:
+            self._lon_span = (n_lons - 1) * self._lon_step
+            self._lon_global = np.isclose(abs(self._lon_span) + abs(self._lon_step), 360.)
+
+    @staticmethod
+    def _regular_spacing(values):
+        """Start and step of a regularly spaced coordinate, the step is None for an irregular coordinate."""
+        if len(values) < 2:
+            return values[0], None
+        steps = np.diff(values)
+        if not np.allclose(steps, steps[0]):
+            return values[0], None
+        return values[0], float(steps[0])
+
+    @property
+    def grid_spacing(self):
+        """tuple: Latitude and longitude spacing of the grid [deg], the median spacing for an irregular coordinate and
+        0 for a coordinate with a single value."""
+        def spacing(values, step):
+            if step is not None:
+                return abs(step)
+            return float(np.median(np.abs(np.diff(values)))) if len(values) > 1 else 0.
+        return spacing(self.latitudes, self._lat_step), spacing(self.longitudes, self._lon_step)
+
+    def latitude_index(self, lat):
+        """Index of the grid latitude closest to the given latitude.
+
+        Args:
+            lat (float or array_like): Latitude [deg].
+
+        Returns:
+            int or ndarray: Latitude index.
+
+        """
+        lat = np.asarray(lat, dtype=float)
+        if self._lat_step is None:
+            i = np.abs(self.latitudes - lat[..., np.newaxis]).argmin(axis=-1)
+        else:
+            i = np.clip(np.rint((lat - self._lat_start) / self._lat_step).astype(int), 0, len(self.latitudes) - 1)
+        return int(i) if i.ndim == 0 else i
+
+    def longitude_index(self, lon):
+        """Index of the grid longitude closest to the given longitude, either in the range -180..180 or 0..360.
+
+        Args:
+            lon (float or array_like): Longitude [deg].
+
+        Returns:
+            int or ndarray: Longitude index.
+
+        """
+        lon = np.asarray(lon, dtype=float)
+        if self._lon_step is None:
+            # ERA5 lons: 0..360, user may give -180..180
+            lon_wrapped = np.where(lon >= 0, lon, lon + 360)
+            i = np.abs(self.longitudes - lon_wrapped[..., np.newaxis]).argmin(axis=-1)
+        else:
+            # Offset from the first grid longitude, wrapped into the 360 degree window centred on the grid.
+            half_span = self._lon_span / 2.
+            offset = (lon - self._lon_start - half_span + 180.) % 360. - 180. + half_span
+            i = np.rint(offset / self._lon_step).astype(int)
+            if self._lon_global:
+                i = i % len(self.longitudes)
+            else:
+                i = np.clip(i, 0, len(self.longitudes) - 1)
+        return int(i) if i.ndim == 0 else i
+
+    @abc.abstractmethod
+    def read_roughness(self, time_index, lat_idx, lon_idx):
+        """Roughness length at the given cells.
+
+        Args:
+            time_index (int or slice): Month index, the data holds monthly means such that 0 is January.
+            lat_idx (int or ndarray): Latitude indices.
+            lon_idx (int or ndarray): Longitude indices, same shape as `lat_idx`.
+
+        Returns:
+            float or ndarray: Roughness lengths [m] with the months as leading axis if `time_index` is a slice, missing
+                values are NaN.
+
+        """
+
+    @abc.abstractmethod
+    def read_altitude(self, lat_idx, lon_idx):
+        """Ground altitude at the given cells.
+
+        Args:
+            lat_idx (int or ndarray): Latitude indices.
+            lon_idx (int or ndarray): Longitude indices, same shape as `lat_idx`.
+
+        Returns:
+            float or ndarray: Altitudes [m], missing values are NaN.
+
+        """
+
+    def lookup(self, lat, lon, time_index=0):
+        """Roughness length and altitude of the grid cell closest to the given location.
+
+        Args:
+            lat (float): Latitude [deg].
+            lon (float): Longitude [deg].
+            time_index (int, optional): Month index of the roughness length, the data holds monthly means such that 0
+                is January.
+
+        Returns:
+            tuple: Roughness length [m] and altitude [m].
+
+        """
+        lat_idx, lon_idx = self.latitude_index(lat), self.longitude_index(lon)
+        return float(self.read_roughness(time_index, lat_idx, lon_idx)), float(self.read_altitude(lat_idx, lon_idx))
+
+    def lookup_many(self, lats, lons, all_months=False):
+        """Roughness length and altitude of the grid cells closest to the given locations.
+
+        Args:
+            lats (array_like): Latitudes [deg].
+            lons (array_like): Longitudes [deg], same shape as `lats`.
+            all_months (bool, optional): Return the roughness length of all months instead of only January.
+
+        Returns:
+            tuple: Roughness lengths [m], with a leading month axis if `all_months` is set, and altitudes [m].
+                Missing values are NaN.
+
+        """
+        lats, lons = np.broadcast_arrays(np.asarray(lats, dtype=float), np.asarray(lons, dtype=float))
+        lat_idx = np.atleast_1d(self.latitude_index(lats.ravel()))
+        lon_idx = np.atleast_1d(self.longitude_index(lons.ravel()))
+        roughness = np.asarray(self.read_roughness(slice(None) if all_months else 0, lat_idx, lon_idx), dtype=float)
+        altitude = np.asarray(self.read_altitude(lat_idx, lon_idx), dtype=float)
+        return roughness.reshape(roughness.shape[:-1] + lats.shape), altitude.reshape(lats.shape)
+
+    def close(self):
+        """Release the underlying file."""
+        pass
+
+
+class NetCDFLocationService(LocationService):
+    """Location service reading the original ERA5 NetCDF file, which is opened once.
+
+    Attributes:
+        nc_path (str): Path of the NetCDF file.
+        dataset (`netCDF4.Dataset`): Opened NetCDF file.
+
+    """
+    def __init__(self, nc_path):
+        """
+        Args:
+            nc_path (str): Value for `nc_path` attribute.
+
+        """
+        # Imported here such that the netCDF/HDF5 stack is only loaded when no site grid file is available.
+        import netCDF4
+
+        self.nc_path = nc_path
+        self.dataset = netCDF4.Dataset(nc_path)
+        # The NetCDF library is not thread-safe, reads of concurrent sessions are serialized.
+        self._lock = threading.Lock()
+        super().__init__(self.dataset.variables['latitude'][:], self.dataset.variables['longitude'][:])
+
+    def _read_cells(self, name, time_index, lat_idx, lon_idx):
+        """Read the values of a variable at the given cells. NetCDF only supports orthogonal indexing, thus arrays of
+        cells are read with a single orthogonal read of the unique rows and columns, from which the cells are picked.
+        """
+        if np.ndim(lat_idx) == 0:
+            with self._lock:
+                value = self.dataset.variables[name][time_index, lat_idx, lon_idx]
+            return float(np.ma.filled(np.ma.asarray(value, dtype=float), np.nan))
+        rows, row_inv = np.unique(lat_idx, return_inverse=True)
+        cols, col_inv = np.unique(lon_idx, return_inverse=True)
+        with self._lock:
+            block = self.dataset.variables[name][time_index, rows, cols]
+        block = np.ma.filled(np.ma.asarray(block, dtype=float), np.nan)
+        return block[..., row_inv, col_inv]
+
+    def read_roughness(self, time_index, lat_idx, lon_idx):
+        return self._read_cells('fsr', time_index, lat_idx, lon_idx)
+
+    def read_altitude(self, lat_idx, lon_idx):
+        return self._read_cells('z', 0, lat_idx, lon_idx) / GRAVITATIONAL_ACCELERATION
+
+    def close(self):
+        self.dataset.close()
+
+
+class SiteGridLocationService(LocationService):
+    """Location service reading a site grid file, see `convert_to_site_grid`. The grids are memory mapped, such that
+    opening the file is instantaneous and a lookup only touches the pages of the requested cells.
+
+    Attributes:
+        path (str): Path of the site grid file.
+        header (dict): Grid metadata and layout of the file.
+        roughness (`np.memmap`): Monthly roughness lengths [m], indexed by month, latitude, and longitude.
+        altitude (`np.memmap`): Ground altitudes [m], indexed by latitude and longitude.
+
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Value for `path` attribute.
+
+        """
+        self.path = path
+        self.header = read_site_grid_header(path)
+        arrays = {name: np.memmap(path, dtype=spec['dtype'], mode='r', offset=spec['offset'],
+                                  shape=tuple(spec['shape']))
+                  for name, spec in self.header['arrays'].items()}
+        self.roughness = arrays['roughness']
+        self.altitude = arrays['altitude']
+        super().__init__(arrays['latitude'], arrays['longitude'])
+
+    def read_roughness(self, time_index, lat_idx, lon_idx):
+        return self.roughness[time_index, lat_idx, lon_idx]
+
+    def read_altitude(self, lat_idx, lon_idx):
+        return self.altitude[lat_idx, lon_idx]
+
+    def close(self):
+        # Memory maps are released once the arrays are no longer referenced.
+        self.roughness = self.altitude = None
+
+
+def read_site_grid_header(path):
+    """Read the header of a site grid file.
+
+    Args:
+        path (str): Path of the site grid file.
+
+    Returns:
+        dict: Grid metadata and, per array, its dtype, shape, and offset in the file.
+
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(SITE_GRID_MAGIC)) != SITE_GRID_MAGIC:
+            raise ValueError("{} is not a site grid file.".format(path))
+        header_size = int(np.frombuffer(f.read(8), dtype='<u8')[0])
+        return json.loads(f.read(header_size).decode())
+
+
+def convert_to_site_grid(nc_path, path=None):
+    """Convert the ERA5 NetCDF file to a site grid file: a JSON header with the grid metadata followed by the
+    coordinate vectors (float64) and the roughness length and altitude grids (float32), each aligned for memory
+    mapping. Missing values are stored as NaN.
+
+    Args:
+        nc_path (str): Path of the NetCDF file.
+        path (str, optional): Path of the site grid file, defaults to `nc_path` with the site grid suffix.
+
+    Returns:
+        str: Path of the site grid file.
+
+    """
+    import netCDF4
+
+    if path is None:
+        path = os.path.splitext(nc_path)[0] + SITE_GRID_SUFFIX
+    with netCDF4.Dataset(nc_path) as ds:
+        latitudes = np.asarray(ds.variables['latitude'][:], dtype='<f8')
+        longitudes = np.asarray(ds.variables['longitude'][:], dtype='<f8')
+        fsr, z = ds.variables['fsr'], ds.variables['z']
+        n_months, n_lats, n_lons = fsr.shape
+
+        shapes = {
+            'latitude': ((n_lats,), '<f8'),
+            'longitude': ((n_lons,), '<f8'),
+            'roughness': ((n_months, n_lats, n_lons), '<f4'),
+            'altitude': ((n_lats, n_lons), '<f4'),
+        }
+        # The offsets depend on the header size, which is padded to the alignment. The header is grown until it
+        # fits, its size hardly depends on the offsets.
+        header_size = SITE_GRID_ALIGNMENT
+        while True:
+            header = {'source': os.path.basename(nc_path), 'arrays': {}}
+            offset = len(SITE_GRID_MAGIC) + 8 + header_size
+            for name, (shape, dtype) in shapes.items():
+                offset = -(-offset // SITE_GRID_ALIGNMENT) * SITE_GRID_ALIGNMENT
+                header['arrays'][name] = {'dtype': dtype, 'shape': list(shape), 'offset': offset}
+                offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+            header_bytes = json.dumps(header).encode()
+            if len(header_bytes) <= header_size:
+                break
+            header_size = -(-len(header_bytes) // SITE_GRID_ALIGNMENT) * SITE_GRID_ALIGNMENT
+
+        # Write to a temporary file first, such that readers never see a partially written file.
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(SITE_GRID_MAGIC)
+            f.write(np.array(header_size, dtype='<u8').tobytes())
+            f.write(header_bytes.ljust(header_size))
+            f.truncate(offset)
+        arrays = {name: np.memmap(tmp_path, dtype=spec['dtype'], mode='r+', offset=spec['offset'],
+                                  shape=tuple(spec['shape']))
+                  for name, spec in header['arrays'].items()}
+        arrays['latitude'][:] = latitudes
+        arrays['longitude'][:] = longitudes
+        # The roughness length is converted per month to limit the memory use.
+        for i in range(n_months):
+            arrays['roughness'][i] = np.ma.filled(np.ma.asarray(fsr[i], dtype='<f4'), np.nan)
+        arrays['altitude'][:] = np.ma.filled(np.ma.asarray(z[0], dtype='<f8') / GRAVITATIONAL_ACCELERATION, np.nan)
+        for a in arrays.values():
+            a.flush()
+        del arrays
+    os.replace(tmp_path, path)
+    return path
+
+
+@lru_cache(maxsize=None)
+def get_location_service(nc_path):
+    """Location service of a data file, shared within the process. The site grid file next to the NetCDF file is
+    preferred, the NetCDF file is used if it has not been converted.
+
+    Args:
+        nc_path (str): Path of the NetCDF or site grid file.
+
+    Returns:
+        `LocationService`: Opened location service.
+
+    """
+    if nc_path.endswith(SITE_GRID_SUFFIX):
+        return SiteGridLocationService(nc_path)
+    site_grid_path = os.path.splitext(nc_path)[0] + SITE_GRID_SUFFIX
+    if os.path.exists(site_grid_path):
+        return SiteGridLocationService(site_grid_path)
+    return NetCDFLocationService(nc_path)
+
+
 def get_location_data(nc_path, lat, lon):
     """
     Given a NetCDF file, latitude, and longitude, return the closest roughness length and altitude (geopotential/9.80665).
     """
-    ds = netCDF4.Dataset(nc_path)
-    lats = ds.variables['latitude'][:]
-    lons = ds.variables['longitude'][:]
-    # ERA5 lons: 0..360, user may give -180..180
-    lon_wrapped = lon if lon >= 0 else lon + 360
-    lat_idx = np.abs(lats - lat).argmin()
-    lon_idx = np.abs(lons - lon_wrapped).argmin()
-    # Use first time index (monthly means, so 0=Jan)
-    roughness = ds.variables['fsr'][0, lat_idx, lon_idx]
-    geopotential = ds.variables['z'][0, lat_idx, lon_idx]
-    altitude = geopotential / 9.80665
-    ds.close()
-    return float(roughness), float(altitude)
+    return get_location_service(nc_path).lookup(lat, lon)
+
+
+def get_locations_data(nc_path, lats, lons, all_months=False):
+    """Batch version of `get_location_data`, see `LocationService.lookup_many`."""
+    return get_location_service(nc_path).lookup_many(lats, lons, all_months)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert the ERA5 NetCDF file to a memory-mappable site grid file.")
+    parser.add_argument('nc_path', help="Path of the NetCDF file.")
+    parser.add_argument('-o', '--output', help="Path of the site grid file.")
+    args = parser.parse_args()
+    print("Written", convert_to_site_grid(args.nc_path, args.output))
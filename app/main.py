@@ -5,10 +5,14 @@
 import streamlit as st
 import numpy as np
 from PIL import Image
-import time
-import concurrent.futures
 import pandas as pd
-from app.qsm import Cycle, LogProfile, SystemProperties, TractionPhase
+from app.qsm import TractionPhase
+from app.sweep import SweepPointError, kite_system_properties, site_environment, sweep_key
+from app.cache import ResultCache
+from app.drivetrain import Drivetrain
+from app.jobs import JobRunner, SweepResultStore
+from app.metrics import bin_nearest, bin_rounded
+from app.decimation import line_trace
 import plotly.graph_objs as go
 # For map and NetCDF
 import folium
@@ -19,6 +23,33 @@ from app.location_utils import get_location_data
 
 st.set_page_config(page_title="AWES App UC3M", layout="wide")
 
+@st.cache_resource
+def result_cache():
+    # Cycle results on local disk, shared by all sessions of the deployment.
+    return ResultCache()
+
+
+# Tolerances of the time stepping options, fixed time steps are used if None.
+TIME_STEP_TOLERANCES = {
+    "Fixed": None,
+    "Adaptive (1 %)": 1e-2,
+    "Adaptive (0.3 %)": 3e-3,
+    "Adaptive (0.1 %)": 1e-3,
+}
+
+
+@st.cache_resource
+def job_runner():
+    # Worker processes of the background simulations, shared by all sessions of the deployment.
+    return JobRunner(result_cache())
+
+
+@st.cache_resource
+def sweep_results():
+    # Results of the completed sweeps, shared by all sessions and analysis types, such that the metrics of a sweep are
+    # derived once.
+    return SweepResultStore()
+
 
 class KiteApp:
 
@@ -242,8 +273,16 @@ class KiteApp:
                 "Power-speed boxplot",  "Power-distribution boxplot (reel-out)", "Power-distribution boxplot (reel-in)"
             ],
             key="cycle_type",
-            on_change=self.clear_all_plots
         )
+        # Adaptive time stepping takes larger time steps where the reeling and elevation speeds change slowly.
+        time_stepping = st.sidebar.selectbox(
+            "Time stepping",
+            list(TIME_STEP_TOLERANCES),
+            key="time_stepping",
+            help="Fixed time steps, or adaptive time steps that keep the relative error of the phase energies below "
+                 "the given tolerance."
+        )
+        time_step_tolerance = TIME_STEP_TOLERANCES[time_stepping]
 
         if cycletype == "AWES Cycle (linear variables)":
             st.markdown("<h3 style='color:#002060;'>AWES Cycle (Linear Variables)</h3>", unsafe_allow_html=True)
@@ -269,11 +308,12 @@ class KiteApp:
             )
 
             if st.sidebar.button("Simulate", key="add_simulate_linear"):
-                with st.spinner("Simulating for wind speed…"):
-                    sys_props=self.initiate(float(kite_area),wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle)
-                    self.add_linear_profile(float(wind_speed), float(kite_area), float(scale_factor), cycletype,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props)
-                st.success("✅ Simulation complete!")
-                # Use a unique key for each chart based on the number of plots
+                sys_props=self.initiate(float(kite_area),wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle)
+                self.add_linear_profile(float(wind_speed), float(kite_area), float(scale_factor), cycletype,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props,time_step_tolerance)
+            # The simulation runs in the background, the profile is added once it has completed.
+            self.collect_job()
+            # The stored profiles are rendered on every run, also after switching the analysis type.
+            if st.session_state.get('plot_data'):
                 self.plot_graphs_linear()
 
         elif cycletype == "AWES Cycle (rotational variables)":
@@ -301,11 +341,10 @@ class KiteApp:
 
             doomie=True
             if st.sidebar.button("Simulate", key="add_simulate_rotational"):
-                with st.spinner("Simulating for wind speed…"):
-                    sys_props=self.initiate(float(kite_area),wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle)
-                    self.add_rotational_profile(float(wind_speed), float(kite_area), float(scale_factor), cycletype,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props)
-                st.success("✅ Simulation complete!")
-                self.plot_graphs_rotational()
+                sys_props=self.initiate(float(kite_area),wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle)
+                self.add_rotational_profile(float(wind_speed), float(kite_area), float(scale_factor), cycletype,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props,time_step_tolerance)
+            self.collect_job()
+            self.plot_graphs_rotational()
 
         elif cycletype in [
                 "Torque-speed char.",
@@ -349,11 +388,6 @@ class KiteApp:
                     help="Enter a wind speed between 10 m/s and 50 m/s"
                 )
 
-            update_text = st.empty()
-            update_text.info("Values Updated")
-
-            time.sleep(2)
-            update_text.empty()
             #st.markdown(
                 #f'<div style="background-color:#f0f0f0;padding:10px;border-radius:5px;">'
                 #f'<p style="font-weight:bold;">Newest updated values:</p>'
@@ -372,30 +406,24 @@ class KiteApp:
             #)
             # Botón para simular
             if st.sidebar.button("Simulate", key="add_simulate"):
-                with st.spinner("Simulating across wind speeds…"):
-                    self.initiate(float(kite_area),wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle)
-
-                    # Convertir los valores de cadena a flotante
-                    try:
-                        kite_area = float(kite_area)
-                        min_wind_speed = float(min_wind_speed)
-                        max_wind_speed = float(max_wind_speed)
-                    except ValueError:
-                        st.error(
-                            "Please enter valid numerical values for kite area, minimum wind speed, and maximum wind speed.")
-                        st.stop()  # Detener la ejecución del script si hay un error de valor
-
-                    # Llamar a la función para generar los gráficos
-                    st.subheader("Graph")
-                    fig = self.energy_plots(kite_area, scale_factor, cycletype, min_wind_speed, max_wind_speed)
-                    # Mostrar la figura en Streamlit
-                    st.plotly_chart(fig, use_container_width=True, key=f"energy_fig_{cycletype}_1")
-                st.success("✅ Simulation complete!")
-
-
-            else:
-                # Placeholder for additional code
-                pass
+                # Convertir los valores de cadena a flotante
+                try:
+                    kite_area = float(kite_area)
+                    min_wind_speed = float(min_wind_speed)
+                    max_wind_speed = float(max_wind_speed)
+                except ValueError:
+                    st.error(
+                        "Please enter valid numerical values for kite area, minimum wind speed, and maximum wind speed.")
+                    st.stop()  # Detener la ejecución del script si hay un error de valor
+                self.add_energy_sweep(kite_area, scale_factor, cycletype, min_wind_speed, max_wind_speed,
+                                      h_ref, h_0, altitude, rmax, rmin, tether_angle, time_step_tolerance)
+            # The sweep runs in the background, the graph is generated once all wind speeds have completed.
+            self.collect_job()
+            # The stored sweeps are rendered on every run, changing the analysis type does not simulate them again.
+            fig = self.generate_energy_plots(cycletype)
+            if fig is not None:
+                st.subheader("Graph")
+                st.plotly_chart(fig, use_container_width=True, key=f"energy_fig_{cycletype}_1")
         
         elif cycletype in [
                 "Max. power reel in",
@@ -443,11 +471,6 @@ class KiteApp:
                     step=0.1,
                     help="Enter a wind speed between 10 m/s and 50 m/s"
                 )
-            update_text = st.empty()
-            update_text.info("Values Updated")
-
-            time.sleep(2)
-            update_text.empty()
             #st.markdown(
                # f'<div style="background-color:#f0f0f0;padding:10px;border-radius:5px;">'
                 #f'<p style="font-weight:bold;">Newest updated values:</p>'
@@ -463,23 +486,24 @@ class KiteApp:
             #)
             # Botón para simular
             if st.sidebar.button("Simulate", key="add_simulate"):
-                with st.spinner("Simulating across wind speeds…"):
-                    self.initiate(float(kite_area),wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle)
-                    # Convertir los valores de cadena a flotante
-                    try:
-                        kite_area = float(kite_area)
-                        min_wind_speed = float(min_wind_speed)
-                        max_wind_speed = float(max_wind_speed)
-                    except ValueError:
-                        st.error(
-                            "Please enter valid numerical values for kite area, minimum wind speed, and maximum wind speed.")
-                        st.stop()  # Detener la ejecución del script si hay un error de valor
-                    # Llamar a la función para generar los gráficos
-                    st.subheader("Graph")
-                    fig = self.energy_plots(kite_area, 1, cycletype, min_wind_speed, max_wind_speed) #scale_factor mandamos 1 porque no se usa
-                    # Mostrar la figura en Streamlit
-                    st.plotly_chart(fig, use_container_width=True, key=f"energy_fig_{cycletype}_2")   
-                st.success("✅ Simulation complete!")
+                # Convertir los valores de cadena a flotante
+                try:
+                    kite_area = float(kite_area)
+                    min_wind_speed = float(min_wind_speed)
+                    max_wind_speed = float(max_wind_speed)
+                except ValueError:
+                    st.error(
+                        "Please enter valid numerical values for kite area, minimum wind speed, and maximum wind speed.")
+                    st.stop()  # Detener la ejecución del script si hay un error de valor
+                self.add_energy_sweep(kite_area, 1, cycletype, min_wind_speed, max_wind_speed,
+                                      h_ref, h_0, altitude, rmax, rmin, tether_angle, time_step_tolerance) #scale_factor mandamos 1 porque no se usa
+            # The sweep runs in the background, the graph is generated once all wind speeds have completed.
+            self.collect_job()
+            # The stored sweeps are rendered on every run, changing the analysis type does not simulate them again.
+            fig = self.generate_energy_plots(cycletype)
+            if fig is not None:
+                st.subheader("Graph")
+                st.plotly_chart(fig, use_container_width=True, key=f"energy_fig_{cycletype}_2")
           
         if st.sidebar.button("Clear Plot", key="clear_plot"):
             self.clear_plot()
@@ -495,21 +519,8 @@ class KiteApp:
 
     def plot_graphs_linear(self):
         # —————————————————————————————————————————————————————
-        # 1. Pad all data series to the same max_time
-        all_times = [d["time"] for *_, d in st.session_state['plot_data']]
-        max_time = max(max(t) for t in all_times)
-        dt = 0.04  # must match your sim4lation time step
-
-        for *_, data in st.session_state['plot_data']:
-            t = data["time"]
-            if t[-1] < max_time:
-                pad = np.arange(t[-1] + dt, max_time + 1e-8, dt)
-                data["time"] = np.concatenate([t, pad])
-                for key in ("reeling_speed", "tether_force", "power"):
-                    data[key] = np.concatenate([
-                        data[key],
-                        np.full(pad.shape, data[key][-1])
-                    ])
+        # 1. Common time axis of all profiles
+        max_time = max(profile["data"]["time"][-1] for profile in st.session_state['plot_data'])
 
         # —————————————————————————————————————————————————————
         # 2. Build three Plotly figures
@@ -518,22 +529,22 @@ class KiteApp:
         fig3 = go.Figure()
         colors = ['blue', 'red', 'green', 'purple', 'orange', 'pink']
 
-        for idx, (f1, f2, f3, wind_speed, kite_area, data) in enumerate(st.session_state['plot_data']):
+        for idx, profile in enumerate(st.session_state['plot_data']):
+            data = profile["data"]
             color = colors[idx % len(colors)]
-            label = f"WS={wind_speed:.2f} m/s, Area={kite_area:.2f} m²"
-
-            fig1.add_trace(go.Scatter(
-                x=data["time"], y=data["reeling_speed"], mode='lines',
-                name=label, line=dict(color=color)
-            ))
-            fig2.add_trace(go.Scatter(
-                x=data["time"], y=data["tether_force"], mode='lines',
-                name=label, line=dict(color=color)
-            ))
-            fig3.add_trace(go.Scatter(
-                x=data["time"], y=data["power"], mode='lines',
-                name=label, line=dict(color=color)
-            ))
+            label = f"WS={profile['wind_speed']:.2f} m/s, Area={profile['kite_area']:.2f} m²"
+
+            # Shorter cycles hold their final value until the end of the longest cycle, which takes a single point.
+            t = np.asarray(data["time"])
+            hold = t[-1] < max_time
+            if hold:
+                t = np.append(t, max_time)
+
+            for fig, key in ((fig1, "reeling_speed"), (fig2, "tether_force"), (fig3, "power")):
+                y = np.asarray(data[key])
+                if hold:
+                    y = np.append(y, y[-1])
+                fig.add_trace(line_trace(t, y, name=label, line=dict(color=color)))
 
         for fig, title, ytitle in [
             (fig1, 'Reeling Speed vs Time', 'Reeling Speed (m/s)'),
@@ -566,7 +577,10 @@ class KiteApp:
 
     def plot_graphs_rotational(self):
         import contextlib
-        if 'plot_data' in st.session_state:
+        # Profiles simulated on the linear page have no gearbox ratio, and thus no rotational variables.
+        profiles = [profile for profile in st.session_state.get('plot_data', [])
+                    if profile["gearbox_ratio"] is not None]
+        if profiles:
             # 1. Prepare figures
             fig1 = go.Figure()
             fig2 = go.Figure()
@@ -574,25 +588,18 @@ class KiteApp:
             colors = ['blue', 'red', 'green', 'purple', 'orange', 'pink']
 
             # 2. Populate traces
-            for idx, (_, _, _, wind_speed, kite_area, data) in enumerate(st.session_state['plot_data']):
+            for idx, profile in enumerate(profiles):
+                data = profile["data"]
                 color = colors[idx % len(colors)]
-                label = f"WS={wind_speed:.2f} m/s, Area={kite_area:.2f} m²"
-
-                # rotational speed in rpm
-                omega_arr = np.array(data["omega"])
-                omega_rpm = omega_arr * 60 / (2 * np.pi)
-                fig1.add_trace(go.Scatter(
-                    x=data["time"], y=omega_rpm, mode='lines',
-                    name=label, line=dict(color=color)
-                ))
-                fig2.add_trace(go.Scatter(
-                    x=data["time"], y=data["torque"], mode='lines',
-                    name=label, line=dict(color=color)
-                ))
-                fig3.add_trace(go.Scatter(
-                    x=data["time"], y=data["power"], mode='lines',
-                    name=label, line=dict(color=color)
-                ))
+                label = f"WS={profile['wind_speed']:.2f} m/s, Area={profile['kite_area']:.2f} m²"
+
+                # The drivetrain only rescales the mechanical result, see `Drivetrain`.
+                drivetrain = Drivetrain(profile["gearbox_ratio"], profile["drum_radius"])
+                omega_rpm = drivetrain.angular_speed(data["reeling_speed"]) * 60 / (2 * np.pi)
+                fig1.add_trace(line_trace(data["time"], omega_rpm, name=label, line=dict(color=color)))
+                fig2.add_trace(line_trace(data["time"], drivetrain.torque(data["tether_force"]), name=label,
+                                          line=dict(color=color)))
+                fig3.add_trace(line_trace(data["time"], data["power"], name=label, line=dict(color=color)))
 
             # 3. Apply consistent layout
             for fig, title, ytitle in [
@@ -625,7 +632,7 @@ class KiteApp:
 
 
 
-    def add_linear_profile(self, wind_speed, kite_area, scale_factor, cycletype,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props):
+    def add_linear_profile(self, wind_speed, kite_area, scale_factor, cycletype,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props,time_step_tolerance=None):
 
         try:
             wind_speed_value = float(wind_speed)
@@ -635,16 +642,14 @@ class KiteApp:
             return
 
         #self.initiate(float(kite_area),wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle)
-        fig1, fig2, fig3, data = awes_cycle_linear(wind_speed_value, kite_area_value, scale_factor,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props)
-
-        if fig1 is not None and fig2 is not None and fig3 is not None:
-            if 'plot_data' not in st.session_state:
-                st.session_state['plot_data'] = []
-
-            st.session_state['plot_data'].append((fig1, fig2, fig3, wind_speed_value, kite_area_value, data))
+        # Results of earlier simulations with identical inputs are loaded from the shared result cache.
+        job = job_runner().submit_cycle(profile_cycle_settings(rmax, rmin, time_step_tolerance), sys_props,
+                                        site_environment(wind_speed_value, h_ref, h_0, altitude), wind_speed_value)
+        self.submit_job(cycletype, job, wind_speed=wind_speed_value, kite_area=kite_area_value,
+                        gearbox_ratio=None, drum_radius=drum_radius)
             
             
-    def add_rotational_profile(self, wind_speed, kite_area, scale_factor, cycletype,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props):
+    def add_rotational_profile(self, wind_speed, kite_area, scale_factor, cycletype,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props,time_step_tolerance=None):
 
         try:
             wind_speed_value = float(wind_speed)
@@ -654,92 +659,146 @@ class KiteApp:
             return
 
         #self.initiate(float(kite_area),wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle)
-        fig1, fig2, fig3, data = awes_cycle_rotational(wind_speed_value, kite_area_value, scale_factor,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props)
+        # Results of earlier simulations with identical inputs are loaded from the shared result cache.
+        job = job_runner().submit_cycle(profile_cycle_settings(rmax, rmin, time_step_tolerance), sys_props,
+                                        site_environment(wind_speed_value, h_ref, h_0, altitude), wind_speed_value)
+        self.submit_job(cycletype, job, wind_speed=wind_speed_value, kite_area=kite_area_value,
+                        gearbox_ratio=scale_factor, drum_radius=drum_radius)
+            
 
-        if fig1 is not None and fig2 is not None and fig3 is not None:
-            if 'plot_data' not in st.session_state:
-                st.session_state['plot_data'] = []
+    def store_profile(self, job):
+        result = job["job"].results[0]
+        if isinstance(result, SweepPointError):
+            st.error(f"An error occurred: {result.msg}")
+            return
+        params = job["params"]
+        if 'plot_data' not in st.session_state:
+            st.session_state['plot_data'] = []
+
+        st.session_state['plot_data'].append({
+            "wind_speed": params["wind_speed"],
+            "kite_area": params["kite_area"],
+            "gearbox_ratio": params["gearbox_ratio"],
+            "drum_radius": params["drum_radius"],
+            "data": profile_data(result)
+        })
 
-            st.session_state['plot_data'].append((fig1, fig2, fig3, wind_speed_value, kite_area_value, data))
-            
+    def add_energy_sweep(self, kite_area, gearbox_ratio, graph_type, min_wind_speed, max_wind_speed, h_ref, h_0,
+                         altitude, rmax, rmin, tether_angle, time_step_tolerance=None):
+        # The wind speeds of a range are fixed, such that the points are shared through the result cache.
+        wind_speeds = np.linspace(float(min_wind_speed), float(max_wind_speed), 20, True)
+        sys_props = kite_system_properties(float(kite_area))
+        sweep = (sys_props, wind_speeds, float(h_ref), float(h_0), float(altitude), float(rmax), float(rmin),
+                 float(tether_angle), time_step_tolerance)
+        params = dict(kite_area=kite_area, gearbox_ratio=gearbox_ratio, graph_type=graph_type,
+                      min_wind_speed=min_wind_speed, max_wind_speed=max_wind_speed, h_ref=h_ref, h_0=h_0,
+                      altitude=altitude, rmax=rmax, rmin=rmin, tether_angle=tether_angle)
+        # The drivetrain only rescales a stored sweep, another gearbox ratio does not simulate the sweep again.
+        result = sweep_results().get(sweep_key(*sweep))
+        if result is not None:
+            self.energy_plots(**params, result=result)
+            return
+        self.submit_job(graph_type, job_runner().submit_sweep(*sweep), **params)
+
+    def submit_job(self, kind, job, **params):
+        """Make a background job the running job of the session, which cancels the previous one.
+
+        Args:
+            kind (str): Analysis type of the job.
+            job (`Job`): Submitted job.
+            **params: Inputs to process the result with once the job has completed.
+
+        """
+        previous = st.session_state.get('job')
+        if previous is not None:
+            previous["job"].cancel()
+        st.session_state['job'] = {"kind": kind, "job": job, "params": params}
 
-    def energy_plots(self,kite_area, gearbox_ratio, graph_type, min_wind_speed, max_wind_speed):
-        data=sweep_data(kite_area, gearbox_ratio, min_wind_speed, max_wind_speed)
+    def finished_job(self):
+        """Show the progress of the running job of the session, or hand over the job once it has completed.
+
+        Returns:
+            dict or None: Completed job with its parameters, see `submit_job`, None while running or if there is none.
+
+        """
+        entry = st.session_state.get('job')
+        if entry is None:
+            return None
+        job = entry["job"]
+        if not job.done:
+            self.job_progress()
+            return None
+        del st.session_state['job']
+        if job.status == 'cancelled':
+            st.warning("Simulation cancelled.")
+        elif job.status == 'failed':
+            st.error(f"An error occurred: {job.error}")
+        else:
+            return entry
+        return None
+
+    def collect_job(self):
+        # The result of a completed job is stored whichever analysis type is shown, a single cycle as profile and a
+        # sweep for the sweep-based analyses.
+        job = self.finished_job()
+        if job is None:
+            return
+        if job["job"].key is None:
+            self.store_profile(job)
+        else:
+            self.energy_plots(**job["params"], result=sweep_results().add(job["job"]))
+        st.success("✅ Simulation complete!")
+
+    @st.fragment(run_every=0.5)
+    def job_progress(self):
+        # Reruns by itself while the job is running, the completed points are shown as they come in.
+        entry = st.session_state.get('job')
+        if entry is None:
+            return
+        job = entry["job"]
+        if job.done:
+            st.rerun()
+
+        n_points = len(job.wind_speeds)
+        st.progress(job.progress, text=f"Simulated {job.n_completed} of {n_points} wind speed(s)…")
+        completed = [(v, res) for v, res in job.completed() if not isinstance(res, SweepPointError)]
+        if n_points > 1 and completed:
+            fig = go.Figure(go.Scatter(x=[v for v, _ in completed], y=[res.average_power for _, res in completed],
+                                       mode='lines+markers', name='Average power'))
+            fig.update_layout(
+                title='Average cycle power (partial)',
+                xaxis=dict(title='Wind speed (m/s)', range=[job.wind_speeds[0], job.wind_speeds[-1]]),
+                yaxis_title='Power (W)',
+                width=1000, height=400,
+            )
+            st.plotly_chart(fig, use_container_width=True, key="job_progress_fig")
+        if st.button("Cancel", key="cancel_job"):
+            job.cancel()
+            st.rerun()
+
+    def energy_plots(self,kite_area, gearbox_ratio, graph_type, min_wind_speed, max_wind_speed,h_ref,h_0,altitude,rmax,rmin,tether_angle,result):
+        # All analysis types share one sweep per site, kite, and wind speed range, see `sweep_results`.
+        if result.errors:
+            st.warning("Simulation failed for {} wind speed(s): {}".format(
+                len(result.errors), "; ".join(str(e) for e in result.errors)))
          # Verificar si ya hay datos almacenados en session_state
         if 'energy_plot_data' not in st.session_state:
             st.session_state['energy_plot_data'] = []
 
-        # Añadir los datos de la simulación actual a session_state
+        # Only the sweep result and the parameters are kept in the session, the drivetrain quantities are derived from
+        # the result when rendered.
         st.session_state['energy_plot_data'].append({
             "kite_area": kite_area,
             "gearbox_ratio": gearbox_ratio,
             "min_wind_speed": min_wind_speed,
             "max_wind_speed": max_wind_speed,
-            "data": data
+            "result": result
         })
-        max_powers= [np.max(sublist) if sublist else np.nan for sublist in data["power"]]
-        min_powers= [np.max(np.min(sublist)) if sublist else np.nan for sublist in data["power"]]
-        mean_powers= [np.mean(sublist) if sublist else np.nan for sublist in data["power"]]
-        mean_powers_gen = [np.mean([x for x in sublist if x > 0]) if any(x > 0 for x in sublist) else np.nan for sublist in data["power"]]
-        max_omega_gen = [60 * sublist[-1] / (2 * np.pi) if sublist else np.nan for sublist in data["omega"]]
-
-
-        energy_all = []
-        for t, p in zip(data["time"], data["power"]):
-            t_arr = np.asarray(t, dtype=np.float64)
-            p_arr = np.asarray(p, dtype=np.float64)
-            if t_arr.ndim < 1 or p_arr.ndim < 1:
-                energy_all.append(0.0)
-            else:
-                energy_all.append( energy_calc(t_arr, p_arr) )
-
-
-        energy_gen = []
-        for power_list, time_list in zip(data["power"], data["time"]):
-            # Force both into at least 1-D arrays:
-            p_arr = np.atleast_1d(power_list).astype(np.float64)
-            t_arr = np.atleast_1d(time_list).astype(np.float64)
-
-            # Now iterate safely
-            positive_powers = [p for p in p_arr if p > 0]
-            positive_times  = [t for t, p in zip(t_arr, p_arr) if p > 0]
-
-            energy_gen.append( energy_calc(positive_times, positive_powers) )
-
-        fig = self.generate_energy_plots(graph_type, max_powers, min_powers, mean_powers, mean_powers_gen, max_omega_gen, energy_all, energy_gen)
-        return fig
 
     def initiate(self,kite_area,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle):
+        return kite_system_properties(kite_area)
 
-        m_p_area = (13.9 - 3.7) / (19 - 5)  # y = mx+n / Area to Projected Area based on Ozone Edge specs
-        n_p_area = 13.9 - m_p_area * 19
-
-        m_weight = (4.7 - 2.2) / (19 - 5)  # y = mx+n / Weight from area based on Ozone Edge specs
-        n_weight = 4.7 - m_weight * 19
-
-        sys_props = {
-            'kite_projected_area': kite_area * m_p_area + n_p_area,  # kite_area,  # [m^2]
-            'kite_mass': kite_area * m_weight + n_weight + 0.5,  # estimated weight + electronics  [kg]
-            'tether_density': 724.,  # [kg/m^3]
-            'tether_diameter': 0.002,  # [m]
-            'kite_lift_coefficient_powered': 0.69,  # [-]
-            'kite_drag_coefficient_powered': 0.69 / 3.6,  # [-]
-            'kite_lift_coefficient_depowered': .17,  # [-]
-            'kite_drag_coefficient_depowered': .17 / 3.5,  # [-]
-            'tether_drag_coefficient': 2 * 1.1,  # [-]
-            'reeling_speed_min_limit': 0.,  # [m/s]
-            'reeling_speed_max_limit': 10.,  # [m/s]
-            'tether_force_min_limit': 500.,  # [N]
-            'tether_force_max_limit': 50000.,  # [N]
-        }
-        sys_props = SystemProperties(sys_props)
-
-        rmax = 200
-        rmin = 100
-        tether_angle = 26.6 * np.pi / 180.
-        return sys_props
-        
-    def generate_energy_plots(self, graph_type, max_powers, min_powers, mean_powers, mean_powers_gen, max_omega_gen, energy_all, energy_gen):
+    def generate_energy_plots(self, graph_type):
         if 'energy_plot_data' not in st.session_state or not st.session_state['energy_plot_data']:
             return None
 
@@ -747,23 +806,20 @@ class KiteApp:
         colors = ['blue', 'red', 'green', 'purple', 'orange', 'pink']  # Colores para diferenciar las simulaciones
 
         for idx, sim_data in enumerate(st.session_state['energy_plot_data']):
-            data = sim_data["data"]
+            result = sim_data["result"]  # Metrics are memoized by the shared sweep result.
             kite_area = sim_data["kite_area"]
             gearbox_ratio = sim_data["gearbox_ratio"]
             Min_wind_speed = sim_data['min_wind_speed']
             Max_wind_speed = sim_data['max_wind_speed']
             color = colors[idx % len(colors)]  # Asignar color cíclicamente
 
-            if graph_type == "Torque-speed char.":
-                omega = data["omega"]
-                omega_rpm = [[val * 60 / (2 * np.pi) for val in sublist] for sublist in omega]
-                torque = data["torque"]
-
-                # Flatten the lists for plotting
-                torque_flat = [item for sublist in torque for item in sublist]
-                omega_rpm_flat = [item for sublist in omega_rpm for item in sublist]
+            if graph_type == "Torque-speed char." and result.points:
+                # The samples of all wind speeds form a single scatter trace.
+                drivetrain = Drivetrain(float(gearbox_ratio))
+                omega_flat = drivetrain.angular_speed(np.concatenate(result.series('reeling_speed')))
+                omega_rpm_flat = omega_flat * 60 / (2 * np.pi)
+                torque_flat = drivetrain.torque(np.concatenate(result.series('tether_force_ground')))
 
-                
                 fig.add_trace(
                     go.Scatter(x=omega_rpm_flat, y=torque_flat, mode='markers', marker=dict(symbol='circle', size=2,opacity=0.5,color=color),
                 name=f'Kite area: {kite_area}, Gearbox ratio: {gearbox_ratio}, Min wind speed: {Min_wind_speed}, Max wind speed: {Max_wind_speed}'))
@@ -780,8 +836,8 @@ class KiteApp:
                 
                 fig.add_trace(
                     go.Scatter(
-                        x=data["wind"],
-                        y=min_powers,
+                        x=result.wind_speeds,
+                        y=result.min_power,
                         mode='lines+markers',
                         marker=dict(symbol='circle',size=2, opacity=0.5,color=color),
                         name=f'Kite area: {kite_area}, Min wind speed: {Min_wind_speed}, Max wind speed: {Max_wind_speed}')
@@ -804,8 +860,8 @@ class KiteApp:
                 
                 fig.add_trace(
                     go.Scatter(
-                        x=data["wind"],
-                        y=max_powers,
+                        x=result.wind_speeds,
+                        y=result.max_power,
                         mode='lines+markers',
                         marker=dict(symbol='circle',size=2, opacity=0.5,color=color),
                         name=f'Kite area: {kite_area}, Min wind speed: {Min_wind_speed}, Max wind speed: {Max_wind_speed}'
@@ -825,7 +881,8 @@ class KiteApp:
             elif graph_type == "Max. speed reel out":
 
                 
-                fig.add_trace(go.Scatter(x=data["wind"], y=max_omega_gen,mode='lines+markers',
+                max_omega_gen = 60 * Drivetrain(float(gearbox_ratio)).angular_speed(result.final_reeling_speed) / (2 * np.pi)
+                fig.add_trace(go.Scatter(x=result.wind_speeds, y=max_omega_gen,mode='lines+markers',
                         marker=dict(symbol='circle', opacity=0.5,color=color),
                         name=f'Kite area: {kite_area}, Gearbox ratio: {gearbox_ratio}, Min wind speed: {Min_wind_speed}, Max wind speed: {Max_wind_speed}'))
 
@@ -845,8 +902,8 @@ class KiteApp:
                 
                 fig.add_trace(
                     go.Scatter(
-                        x=data["wind"],
-                        y=mean_powers,
+                        x=result.wind_speeds,
+                        y=result.mean_power,
                         mode='lines+markers',
                         marker=dict(symbol='circle', opacity=0.5,color=color),
                         name=f'Kite area: {kite_area}, Min wind speed: {Min_wind_speed}, Max wind speed: {Max_wind_speed}'
@@ -864,12 +921,12 @@ class KiteApp:
                 
 
             elif graph_type == "Mean-max power ratio complete cycle":
-                mean_max_total=[mean_power / max_power for mean_power, max_power in zip(mean_powers, max_powers)]
+                mean_max_total = result.mean_power / result.max_power
 
                 
                 fig.add_trace(
                     go.Scatter(
-                        x=data["wind"],
+                        x=result.wind_speeds,
                         y=mean_max_total,
                         mode='lines+markers',
                         marker=dict(symbol='circle', opacity=0.5,color=color),
@@ -890,12 +947,12 @@ class KiteApp:
 
             elif graph_type == "Mean-max power ratio only generation":
                 
-                mean_max_gen=[mean_power_gen / max_power for mean_power_gen, max_power in zip(mean_powers_gen, max_powers)]
+                mean_max_gen = result.mean_power_generation / result.max_power
 
                 
                 fig.add_trace(
                     go.Scatter(
-                        x=data["wind"],
+                        x=result.wind_speeds,
                         y=mean_max_gen,
                         mode='lines+markers',
                         marker=dict(symbol='circle', opacity=0.5,color=color),
@@ -917,8 +974,8 @@ class KiteApp:
                 
                 fig.add_trace(
                     go.Scatter(
-                        x=data["wind"],
-                        y=energy_all,
+                        x=result.wind_speeds,
+                        y=result.energy,
                         mode='lines+markers',
                         marker=dict(symbol='circle', opacity=0.5,color=color),
                         name=f'Kite area: {kite_area}, Gearbox ratio: {gearbox_ratio}, Min wind speed: {Min_wind_speed}, Max wind speed: {Max_wind_speed}'
@@ -939,8 +996,8 @@ class KiteApp:
                 
                 fig.add_trace(
                     go.Scatter(
-                        x=data["wind"],
-                        y=energy_gen,
+                        x=result.wind_speeds,
+                        y=result.energy_generation,
                         mode='lines+markers',
                         marker=dict(symbol='circle', opacity=0.5,color=color),
                 name=f'Kite area: {kite_area}, Min wind speed: {Min_wind_speed}, Max wind speed: {Max_wind_speed}'
@@ -958,29 +1015,16 @@ class KiteApp:
                 
 
             elif graph_type == "Torque-speed boxplot":
-                # Convert omega to rpm
-                omega = data["omega"]
-                omega_rpm = [[val * 60 / (2 * np.pi) for val in sublist] for sublist in omega]
-                torque = data["torque"]
-
-                # Flatten torque and omega_rpm for plotting
-                torque_flat = np.array([item for sublist in torque for item in sublist])
-                omega_rpm_flat = np.array([item for sublist in omega_rpm for item in sublist])
-
-                # Calculate unique rounded values for omega_rpm
-                unique_values = np.linspace(np.min(omega_rpm_flat), np.max(omega_rpm_flat), num=20)
-                rounded_arr = np.array([min(unique_values, key=lambda x: abs(x - val)) for val in omega_rpm_flat.ravel()]).reshape(omega_rpm_flat.shape)
-
-                # Create a dictionary to store x values corresponding to each unique value in rounded_arr
-                x_dict = {}
-                for i, val in enumerate(rounded_arr):
-                    if val not in x_dict:
-                        x_dict[val] = []
-                    x_dict[val].append(torque_flat[i])
+                # Group the samples by the nearest of 20 rpm bin centres.
+                drivetrain = Drivetrain(float(gearbox_ratio))
+                omega_flat = drivetrain.angular_speed(np.concatenate(result.series('reeling_speed')))
+                omega_rpm_flat = omega_flat * 60 / (2 * np.pi)
+                torque_flat = drivetrain.torque(np.concatenate(result.series('tether_force_ground')))
+                rpm_bins, torque_per_bin, _ = bin_nearest(omega_rpm_flat, torque_flat)
 
                 # Prepare data for the box plot
                 data_plot = []
-                for i, (rpm, torques) in enumerate(x_dict.items(), start=1):
+                for rpm, torques in zip(rpm_bins, torque_per_bin):
                     data_plot.append(go.Box(
                         y=torques,
                         name=f'{int(rpm)}',
@@ -1020,29 +1064,16 @@ class KiteApp:
                 
 
             elif graph_type == "Power-speed boxplot":
-                # Convert omega to rpm
-                omega = data["omega"]
-                omega_rpm = [[val * 60 / (2 * np.pi) for val in sublist] for sublist in omega]
-                power = data["power"]
-
-                # Flatten torque and omega_rpm for plotting
-                power_flat = np.array([item for sublist in power for item in sublist])
-                omega_rpm_flat = np.array([item for sublist in omega_rpm for item in sublist])
-
-                # Calculate unique rounded values for omega_rpm
-                unique_values = np.linspace(np.min(omega_rpm_flat), np.max(omega_rpm_flat), num=20)
-                rounded_arr = np.array([min(unique_values, key=lambda x: abs(x - val)) for val in omega_rpm_flat.ravel()]).reshape(omega_rpm_flat.shape)
-
-                # Create a dictionary to store x values corresponding to each unique value in rounded_arr
-                x_dict = {}
-                for i, val in enumerate(rounded_arr):
-                    if val not in x_dict:
-                        x_dict[val] = []
-                    x_dict[val].append(power_flat[i])
+                # Group the samples by the nearest of 20 rpm bin centres.
+                drivetrain = Drivetrain(float(gearbox_ratio))
+                omega_flat = drivetrain.angular_speed(np.concatenate(result.series('reeling_speed')))
+                omega_rpm_flat = omega_flat * 60 / (2 * np.pi)
+                power_flat = np.concatenate(result.series('power_ground'))
+                rpm_bins, power_per_bin, _ = bin_nearest(omega_rpm_flat, power_flat)
 
                 # Prepare data for the box plot
                 data_plot = []
-                for i, (rpm, powers) in enumerate(x_dict.items(), start=1):
+                for rpm, powers in zip(rpm_bins, power_per_bin):
                     data_plot.append(go.Box(
                         y=powers,
                         name=f'{int(rpm)}',
@@ -1080,24 +1111,19 @@ class KiteApp:
                     showlegend=False
                 )
 
-            elif graph_type == "Power-distribution boxplot (reel-out)":
-                winds = data["wind"]    # e.g. [5.0, 5.263, 5.526, …]
-                powers = data["power"]  # list of lists
-
-                # 1) Bin by integer wind-speed:
-                speed_bins = {}
-                for ws, p_list in zip(winds, powers):
-                    bin_ws = int(round(ws))           # round to nearest m/s
-                    pos = [p for p in p_list if p > 0]
-                    if not pos:
-                        continue
-                    speed_bins.setdefault(bin_ws, []).extend(pos)
+            elif graph_type == "Power-distribution boxplot (reel-out)" and result.points:
+                # 1) Bin the positive power samples by the wind speed rounded to m/s:
+                powers = result.series('power_ground')
+                power_flat = np.concatenate(powers)
+                wind_flat = np.repeat(result.wind_speeds, [len(p) for p in powers])
+                positive = power_flat > 0
+                speed_bins, power_per_bin = bin_rounded(wind_flat[positive], power_flat[positive])
 
                 # Build one Box trace per integer bin:
                 boxes = []
-                for ws_int in sorted(speed_bins):
+                for ws_int, pos in zip(speed_bins, power_per_bin):
                     boxes.append(go.Box(
-                    y=speed_bins[ws_int],
+                    y=pos,
                     name=f"{ws_int}",
                     boxpoints="outliers",
                     jitter=0.3,
@@ -1130,23 +1156,18 @@ class KiteApp:
                     margin=dict(l=60, r=20, t=40, b=60)
                 )
 
-            elif graph_type == "Power-distribution boxplot (reel-in)":
-                winds = data["wind"]
-                retraction_powers = data["retraction_power"]
-
-                # Bin by integer wind-speed:
-                speed_bins = {}
-                for ws, p_list in zip(winds, retraction_powers):
-                    bin_ws = int(round(ws))
-                    neg = [p for p in p_list if p < 0]
-                    if not neg:
-                        continue
-                    speed_bins.setdefault(bin_ws, []).extend(neg)
+            elif graph_type == "Power-distribution boxplot (reel-in)" and result.points:
+                # Bin the negative power samples of the retraction phase by the wind speed rounded to m/s:
+                powers = result.phase_series('power_ground', 0)
+                power_flat = np.concatenate(powers)
+                wind_flat = np.repeat(result.wind_speeds, [len(p) for p in powers])
+                negative = power_flat < 0
+                speed_bins, power_per_bin = bin_rounded(wind_flat[negative], power_flat[negative])
 
                 boxes = []
-                for ws_int in sorted(speed_bins):
+                for ws_int, neg in zip(speed_bins, power_per_bin):
                     boxes.append(go.Box(
-                        y=speed_bins[ws_int],
+                        y=neg,
                         name=f"{ws_int}",
                         boxpoints=False,  # Hide all points, show only the box
                         jitter=0.3,
@@ -1175,233 +1196,99 @@ class KiteApp:
                 )
         return fig
     
-    def clear_all_plots(self):
-        """Wipe both linear/rotational and energy plot data."""
-        st.session_state['plot_data']       = []
-        st.session_state['energy_plot_data'] = []
-
     def export_data_button(self, graph_type):
         combined_data = []
         if ('plot_data' in st.session_state and st.session_state['plot_data']):
-            for idx, (_, _, _, wind_speed, kite_area, data) in enumerate(st.session_state['plot_data']):
-                for i in range(len(data['time'])):
-                    combined_data.append({
-                        'Profile': idx + 1,
-                        'Time': data['time'][i],
-                        'Reeling Speed': data['reeling_speed'][i],
-                        'Tether Force': data['tether_force'][i],
-                        'Power': data['power'][i],
-                        'Wind Speed': wind_speed,
-                        'Kite Area': kite_area
-                    })
+            # The time series are exported column-wise, one frame per profile.
+            combined_data = pd.concat([pd.DataFrame({
+                'Profile': idx + 1,
+                'Time': profile['data']['time'],
+                'Reeling Speed': profile['data']['reeling_speed'],
+                'Tether Force': profile['data']['tether_force'],
+                'Power': profile['data']['power'],
+                'Wind Speed': profile['wind_speed'],
+                'Kite Area': profile['kite_area']
+            }) for idx, profile in enumerate(st.session_state['plot_data'])],
+                ignore_index=True)
 
         
         if 'energy_plot_data' in st.session_state and st.session_state['energy_plot_data']:
-            combined_data = []
-            
+            frames = []
+            # Per wind speed metrics of the shared sweep result, keyed by graph type.
+            metric_columns = {
+                "Mean-max power ratio only generation": ('Mean-Max Ratio',
+                                                         lambda r, _: r.mean_power_generation / r.max_power),
+                "Max. power reel in": ('Min. Power', lambda r, _: r.min_power),
+                "Max. power reel out": ('Max. Power', lambda r, _: r.max_power),
+                "Max. speed reel out": ('Max. Omega', lambda r, ratio: 60 * Drivetrain(float(ratio)).angular_speed(
+                    r.final_reeling_speed) / (2 * np.pi)),
+                "Mean Power": ('Mean Power', lambda r, _: r.mean_power),
+                "Mean-max power ratio complete cycle": ('Mean/Max Power', lambda r, _: r.mean_power / r.max_power),
+                "Energy complete cycle": ('Energy', lambda r, _: r.energy),
+            }
             for idx, sim_data in enumerate(st.session_state['energy_plot_data']):
-                data = sim_data["data"]
+                result = sim_data["result"]
                 max_wind = sim_data["max_wind_speed"]
                 min_wind = sim_data["min_wind_speed"]
                 kite_area = sim_data["kite_area"]
-                if graph_type == "Torque-speed char.":    
-                    # Aplanar las listas de omega y power
-                    for i in range(len(data["time"])):  # Asumimos que time tiene la longitud correcta
-                        time_points = data["time"][i]
-                        omega_points = data["omega"][i]
-                        power_points = data["power"][i]
-                        torque_points = data["torque"][i]
-                        
-                        # Iterar por cada punto de tiempo
-                        for time, omega, power, torque in zip(time_points, omega_points, power_points, torque_points):
-                            combined_data.append({
-                                'Profile': idx + 1,
-                                'Time': time,
-                                'Omega': float(omega),  # Convertir a float nativo
-                                'Power': float(power),  # Convertir a float nativo
-                                'Torque': float(torque),  # Convertir a float nativo
-                                'Max Wind Speed': max_wind,
-                                'Min Wind Speed': min_wind,
-                                'Kite Area': kite_area
-                            })
-                elif graph_type == "Mean-max power ratio only generation":
-                    mean_powers_gen = [np.mean([x for x in sublist if x > 0]) if any(x > 0 for x in sublist) else np.nan for sublist in data["power"]]
-                    max_powers = [np.max(sublist) if sublist else np.nan for sublist in data["power"]]
-                    mean_max_gen_points = [mean_power_gen / max_power for mean_power_gen, max_power in zip(mean_powers_gen, max_powers)]
-                    
-                    for i in range(len(data["wind"])):
-                        wind_speed = data["wind"][i]  # Asume que es un valor único
-                        mean_max_gen = mean_max_gen_points[i]
-                        
-                        combined_data.append({
-                            'Profile': idx + 1,
-                            'Wind speed': wind_speed,
-                            'Mean-Max Ratio': mean_max_gen,
-                            'Max Wind Speed': max_wind,
-                            'Min Wind Speed': min_wind,
-                            'Kite Area': kite_area    
-                        })
-                elif graph_type == "Max. power reel in":
-                    min_powers= [np.max(np.min(sublist)) if sublist else np.nan for sublist in data["power"]]
-                    for i in range(len(data["wind"])):
-                        wind_speed = data["wind"][i]  # Asume que es un valor único
-                        min_power = min_powers[i]
-
-                        combined_data.append({
-                            'Profile': idx + 1,
-                            'Wind speed': wind_speed,
-                            'Min. Power': min_power,
-                            'Max Wind Speed': max_wind,
-                            'Min Wind Speed': min_wind,
-                            'Kite Area': kite_area    
-                        })
-                elif graph_type == "Max. power reel out":
-                    max_powers = [np.max(sublist) if sublist else np.nan for sublist in data["power"]]
-                    for i in range(len(data["wind"])):
-                        wind_speed = data["wind"][i]  # Asume que es un valor único
-                        max_power = max_powers[i]
-
-                        combined_data.append({
-                            'Profile': idx + 1,
-                            'Wind speed': wind_speed,
-                            'Max. Power': max_power,
-                            'Max Wind Speed': max_wind,
-                            'Min Wind Speed': min_wind,
-                            'Kite Area': kite_area    
-                        })
-                elif graph_type == "Max. speed reel out":
-                    max_omega_gen = [60 * sublist[-1] / (2 * np.pi) if sublist else np.nan for sublist in data["omega"]]
-                    for i in range(len(data["wind"])):
-                        wind_speed = data["wind"][i]  # Asume que es un valor único
-                        max_omega = max_omega_gen[i]
-
-                        combined_data.append({
-                            'Profile': idx + 1,
-                            'Wind speed': wind_speed,
-                            'Max. Omega': max_omega,
-                            'Max Wind Speed': max_wind,
-                            'Min Wind Speed': min_wind,
-                            'Kite Area': kite_area    
-                        })
-
-                elif graph_type == "Mean Power":
-                    mean_powers= [np.mean(sublist) if sublist else np.nan for sublist in data["power"]]
-                    for i in range(len(data["wind"])):
-                        wind_speed = data["wind"][i]  # Asume que es un valor único
-                        mean_power = mean_powers[i]
-
-                        combined_data.append({
-                            'Profile': idx + 1,
-                            'Wind speed': wind_speed,
-                            'Mean Power': mean_power,
-                            'Max Wind Speed': max_wind,
-                            'Min Wind Speed': min_wind,
-                            'Kite Area': kite_area    
-                        })
-
-                elif graph_type == "Mean-max power ratio complete cycle":
-                    mean_powers= [np.mean(sublist) if sublist else np.nan for sublist in data["power"]]
-                    max_powers = [np.max(sublist) if sublist else np.nan for sublist in data["power"]]
-                    mean_max_total=[mean_power / max_power for mean_power, max_power in zip(mean_powers, max_powers)]
-                    for i in range(len(data["wind"])):
-                        wind_speed = data["wind"][i]  # Asume que es un valor único
-                        mean_max = mean_max_total[i]
-
-                        combined_data.append({
-                            'Profile': idx + 1,
-                            'Wind speed': wind_speed,
-                            'Mean/Max Power': mean_max,
-                            'Max Wind Speed': max_wind,
-                            'Min Wind Speed': min_wind,
-                            'Kite Area': kite_area    
-                        })
-
-                elif graph_type == "Energy complete cycle":
-                    energy_all = [
-                    energy_calc(time,power) if power else np.nan
-                    for power, time in zip(data["power"], data["time"])
-                    ]   
-                    for i in range(len(data["wind"])):
-                        wind_speed = data["wind"][i]  # Asume que es un valor único
-                        energy = energy_all[i]
-
-                        combined_data.append({
-                            'Profile': idx + 1,
-                            'Wind speed': wind_speed,
-                            'Energy': energy,
-                            'Max Wind Speed': max_wind,
-                            'Min Wind Speed': min_wind,
-                            'Kite Area': kite_area    
-                        })
-
-                elif graph_type == "Torque-speed boxplot":
-                    omega = data["omega"]
-                    torque = data["torque"]
-
-                    # Convert omega a RPM y aplanar
-                    omega_rpm = [[val * 60 / (2 * np.pi) for val in sublist] for sublist in omega]
-                    torque_flat = np.array([item for sublist in torque for item in sublist])
-                    omega_rpm_flat = np.array([item for sublist in omega_rpm for item in sublist])
-
-                    # Crear bins y agrupar
-                    unique_values = np.linspace(np.min(omega_rpm_flat), np.max(omega_rpm_flat), num=20)
-                    rounded_arr = np.array([
-                        min(unique_values, key=lambda x: abs(x - val)) for val in omega_rpm_flat.ravel()
-                    ]).reshape(omega_rpm_flat.shape)
-
-                    x_dict = {}
-                    for i, val in enumerate(rounded_arr):
-                        if val not in x_dict:
-                            x_dict[val] = []
-                        x_dict[val].append(torque_flat[i])
-
-                    # Agregar los datos a combined_data
-                    for rpm_bin, torques in x_dict.items():
-                        for torque_val in torques:
-                            combined_data.append({
-                                'Profile': idx + 1,
-                                'Speed (rpm)': float(rpm_bin),
-                                'Torque (Nm)': float(torque_val),
-                                'Max Wind Speed': max_wind,
-                                'Min Wind Speed': min_wind,
-                                'Kite Area': kite_area
-                            })
-                elif graph_type == "Power-speed boxplot":
-                    omega = data["omega"]
-                    power = data["power"]
-
-                    # Convert omega a RPM y aplanar
-                    omega_rpm = [[val * 60 / (2 * np.pi) for val in sublist] for sublist in omega]
-                    power_flat = np.array([item for sublist in power for item in sublist])
-                    omega_rpm_flat = np.array([item for sublist in omega_rpm for item in sublist])
-
-                    # Crear bins y agrupar
-                    unique_values = np.linspace(np.min(omega_rpm_flat), np.max(omega_rpm_flat), num=20)
-                    rounded_arr = np.array([
-                        min(unique_values, key=lambda x: abs(x - val)) for val in omega_rpm_flat.ravel()
-                    ]).reshape(omega_rpm_flat.shape)
-
-                    x_dict = {}
-                    for i, val in enumerate(rounded_arr):
-                        if val not in x_dict:
-                            x_dict[val] = []
-                        x_dict[val].append(power_flat[i])
-
-                    # Agregar los datos a combined_data
-                    for rpm_bin, powers in x_dict.items():
-                        for power_val in powers:
-                            combined_data.append({
-                                'Profile': idx + 1,
-                                'Speed (rpm)': float(rpm_bin),
-                                'Power (W)': float(power_val),
-                                'Max Wind Speed': max_wind,
-                                'Min Wind Speed': min_wind,
-                                'Kite Area': kite_area
-                            })
+                if graph_type == "Torque-speed char." and result.points:
+                    # The time series of all wind speeds are exported column-wise.
+                    drivetrain = Drivetrain(float(sim_data["gearbox_ratio"]))
+                    frames.append(pd.DataFrame({
+                        'Profile': idx + 1,
+                        'Time': np.concatenate(result.series('time')),
+                        'Omega': drivetrain.angular_speed(np.concatenate(result.series('reeling_speed'))),
+                        'Power': np.concatenate(result.series('power_ground')),
+                        'Torque': drivetrain.torque(np.concatenate(result.series('tether_force_ground'))),
+                        'Max Wind Speed': max_wind,
+                        'Min Wind Speed': min_wind,
+                        'Kite Area': kite_area
+                    }))
+                elif graph_type in metric_columns:
+                    name, metric = metric_columns[graph_type]
+                    frames.append(pd.DataFrame({
+                        'Profile': idx + 1,
+                        'Wind speed': result.wind_speeds,
+                        name: metric(result, sim_data["gearbox_ratio"]),
+                        'Max Wind Speed': max_wind,
+                        'Min Wind Speed': min_wind,
+                        'Kite Area': kite_area
+                    }))
+                elif graph_type == "Torque-speed boxplot" and result.points:
+                    # Samples per rpm bin, as in the box plot.
+                    drivetrain = Drivetrain(float(sim_data["gearbox_ratio"]))
+                    omega_flat = drivetrain.angular_speed(np.concatenate(result.series('reeling_speed')))
+                    omega_rpm_flat = omega_flat * 60 / (2 * np.pi)
+                    torque_flat = drivetrain.torque(np.concatenate(result.series('tether_force_ground')))
+                    rpm_bins, torque_per_bin, _ = bin_nearest(omega_rpm_flat, torque_flat)
+                    frames.append(pd.DataFrame({
+                        'Profile': idx + 1,
+                        'Speed (rpm)': np.repeat(rpm_bins, [len(b) for b in torque_per_bin]),
+                        'Torque (Nm)': np.concatenate(torque_per_bin),
+                        'Max Wind Speed': max_wind,
+                        'Min Wind Speed': min_wind,
+                        'Kite Area': kite_area
+                    }))
+                elif graph_type == "Power-speed boxplot" and result.points:
+                    # Samples per rpm bin, as in the box plot.
+                    drivetrain = Drivetrain(float(sim_data["gearbox_ratio"]))
+                    omega_flat = drivetrain.angular_speed(np.concatenate(result.series('reeling_speed')))
+                    omega_rpm_flat = omega_flat * 60 / (2 * np.pi)
+                    power_flat = np.concatenate(result.series('power_ground'))
+                    rpm_bins, power_per_bin, _ = bin_nearest(omega_rpm_flat, power_flat)
+                    frames.append(pd.DataFrame({
+                        'Profile': idx + 1,
+                        'Speed (rpm)': np.repeat(rpm_bins, [len(b) for b in power_per_bin]),
+                        'Power (W)': np.concatenate(power_per_bin),
+                        'Max Wind Speed': max_wind,
+                        'Min Wind Speed': min_wind,
+                        'Kite Area': kite_area
+                    }))
 
+            combined_data = pd.concat(frames, ignore_index=True) if frames else []
 
             # Crear DataFrame y exportar
-            if combined_data:
+            if len(combined_data):
                 df = pd.DataFrame(combined_data)
                 csv = df.to_csv(index=False)
                 st.download_button(
@@ -1419,137 +1306,9 @@ class KiteApp:
         st.session_state['plot_data'] = []
         st.session_state['energy_plot_data'] = []
 
-def awes_cycle_linear(wind_speed, kite_area, gearbox_ratio,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props):
-    data = {
-        "reeling_speed": [],
-        "tether_force": [],
-        "time": [],
-        "wind": [],
-        "power": [],
-        "torque": [],
-        "omega": [],
-        "mean_power": []
-    }
-
-    env_state = LogProfile()
-    env_state.set_reference_height(h_ref)
-    env_state.set_reference_wind_speed(wind_speed)
-    env_state.set_reference_roughness_length(h_0)
-    env_state.set_altitude_ground(altitude)
-    max_wind_speed_1 = wind_speed * np.log(altitude + rmax * np.sin(tether_angle) / h_0) / np.log(h_ref / h_0)
-
-    cycle_settings = {
-        'cycle': {
-            'tether_length_start_retraction': rmax,
-            'tether_length_end_retraction': rmin,
-            'include_transition_energy': False,
-            'elevation_angle_traction': 26.6 * np.pi / 180.,
-            'traction_phase': TractionPhase,
-        },
-        'retraction': {
-            'control': ('tether_force_ground', 900),
-            'time_step': 0.04,
-        },
-        'transition': {
-            'control': ('tether_force_ground', 900),
-            'time_step': 0.04,
-        },
-        'traction': {
-            'control': ('max_power_reeling_factor', 3069),
-            'time_step': 0.04,
-            'azimuth_angle': 10.6 * np.pi / 180.,
-            'course_angle': 96.4 * np.pi / 180.,
-            'time_step': 0.04,
-        },
-    }
-    cycle = Cycle(cycle_settings)
-
-    try:
-        error, time, average, traction, retraction = cycle.run_simulation(sys_props, env_state, print_summary=False)
-
-        steady_states = cycle.steady_states
-        times = cycle.time
-        reeling_speeds = [state.reeling_speed for state in steady_states]
-        tether_force_ground = [state.tether_force_ground for state in steady_states]
-        power_ground = [state.power_ground for state in steady_states]
-
-        force_arr = np.array(tether_force_ground)
-        reel_arr  = np.array(reeling_speeds)
-        torques   = force_arr * drum_radius / gearbox_ratio
-        omegas    = reel_arr   * gearbox_ratio   / drum_radius
-
-
-
-
-        data["reeling_speed"] = reeling_speeds
-        data["tether_force"] = tether_force_ground
-        data["time"] = times
-        data["wind"] = wind_speed
-        data["power"] = power_ground
-        data["torque"] = torques
-        data["omega"] = omegas
-        mean_power = sum(power_ground) / len(power_ground)
-
-        data["mean_power"].append(mean_power)
-
-        fig1 = go.Figure()
-        fig1.add_trace(
-            go.Scatter(x=data["time"], y=data["reeling_speed"], mode='lines', name=f'Wind speed: {wind_speed} m/s. Kite area: {kite_area}'))
-        fig1.update_layout(
-            title='Reeling Speed vs Time',
-            xaxis_title='Time (s)',
-            yaxis_title='Reeling Speed (m/s)',
-            width=1000,
-            height=400,
-        )
-
-        fig2 = go.Figure()
-        fig2.add_trace(
-            go.Scatter(x=data["time"], y=data["tether_force"], mode='lines', name=f'Wind speed: {wind_speed} m/s. Kite area: {kite_area}'))
-        fig2.update_layout(
-            title='Tether Force vs Time',
-            xaxis_title='Time (s)',
-            yaxis_title='Tether Force (N)',
-            width=1000,
-            height=400,
-        )
-
-        fig3 = go.Figure()
-        fig3.add_trace(go.Scatter(x=data["time"], y=data["power"], mode='lines', name=f'Wind speed: {wind_speed} m/s. Kite area: {kite_area}'))
-        fig3.update_layout(
-            title='Power vs Time',
-            xaxis_title='Time (s)',
-            yaxis_title='Power (W)',
-            width=1000,
-            height=400,
-        )
-
-        return fig1, fig2, fig3, data
-
-    except Exception as e:
-        st.error(f"An error occurred: {e}")
-        return None, None, None, None
-
-def awes_cycle_rotational(wind_speed, kite_area, gearbox_ratio,wind_step,drum_radius,h_ref,altitude,h_0,rmax,rmin,tether_angle,sys_props):
-    data = {
-        "reeling_speed": [],
-        "tether_force": [],
-        "time": [],
-        "wind": [],
-        "power": [],
-        "torque": [],
-        "omega": [],
-        "mean_power": []
-    }
-
-    env_state = LogProfile()
-    env_state.set_reference_height(h_ref)
-    env_state.set_reference_wind_speed(wind_speed)
-    env_state.set_reference_roughness_length(h_0)
-    env_state.set_altitude_ground(altitude)
-    max_wind_speed_1 = wind_speed * np.log(altitude + rmax * np.sin(tether_angle) / h_0) / np.log(h_ref / h_0)
-
-    cycle_settings = {
+def profile_cycle_settings(rmax, rmin, time_step_tolerance=None):
+    # Cycle settings of the single-cycle analyses, the time step is the smallest time step of adaptive time stepping.
+    settings = {
         'cycle': {
             'tether_length_start_retraction': rmax,
             'tether_length_end_retraction': rmin,
@@ -1567,212 +1326,26 @@ def awes_cycle_rotational(wind_speed, kite_area, gearbox_ratio,wind_step,drum_ra
         },
         'traction': {
             'control': ('max_power_reeling_factor', 3069),
-            'time_step': 0.04,
             'azimuth_angle': 10.6 * np.pi / 180.,
             'course_angle': 96.4 * np.pi / 180.,
             'time_step': 0.04,
         },
     }
-    cycle = Cycle(cycle_settings)
-
-    try:
-        error, time, average, traction, retraction = cycle.run_simulation(sys_props, env_state, print_summary=False)
-
-        steady_states = cycle.steady_states
-        times = cycle.time
-        reeling_speeds = [state.reeling_speed for state in steady_states]
-        tether_force_ground = [state.tether_force_ground for state in steady_states]
-        power_ground = [state.power_ground for state in steady_states]
-        torques = [force * drum_radius / gearbox_ratio for force in tether_force_ground]
-        omegas = [(speed / drum_radius) * gearbox_ratio for speed in reeling_speeds]
-        # Calculate omega_rpm using list comprehension
-        omega_rpm = [val * 60 / (2 * np.pi) for val in data["omega"]]
-
-        data["reeling_speed"] = reeling_speeds
-        data["tether_force"] = tether_force_ground
-        data["time"] = times
-        data["wind"] = wind_speed
-        data["power"] = power_ground
-        data["torque"] = torques
-        data["omega"] = omegas
-        mean_power = sum(power_ground) / len(power_ground)
-
-        data["mean_power"].append(mean_power)
-
-        fig1 = go.Figure()
-        fig1.add_trace(
-            go.Scatter(x=data["time"], y=data["reeling_speed"], mode='lines', name=f'Wind speed: {wind_speed} m/s. Kite area: {kite_area}'))
-        fig1.update_layout(
-            title='Reeling Speed vs Time',
-            xaxis_title='Time (s)',
-            yaxis_title='Reeling Speed (m/s)',
-            width=1000,
-            height=400,
-        )
-
-        fig2 = go.Figure()
-        fig2.add_trace(
-            go.Scatter(x=data["time"], y=data["tether_force"], mode='lines', name=f'Wind speed: {wind_speed} m/s. Kite area: {kite_area}'))
-        fig2.update_layout(
-            title='Tether Force vs Time',
-            xaxis_title='Time (s)',
-            yaxis_title='Tether Force (N)',
-            width=1000,
-            height=400,
-        )
-
-        fig3 = go.Figure()
-        fig3.add_trace(go.Scatter(x=data["time"], y=data["power"], mode='lines', name=f'Wind speed: {wind_speed} m/s. Kite area: {kite_area}'))
-        fig3.update_layout(
-            title='Power vs Time',
-            xaxis_title='Time (s)',
-            yaxis_title='Power (W)',
-            width=1000,
-            height=400,
-        )
-
-        return fig1, fig2, fig3, data
-
-    except Exception as e:
-        st.error(f"An error occurred: {e}")
-        return None, None, None, None
-
-
-def energy_calc(times, powers):
-
-    diffs = np.diff(times)
-    powered_values = powers[:-1] * diffs
-    result = np.sum(powered_values)
-    return result
-def sweep_data(kite_area, gearbox_ratio, min_wind_speed, max_wind_speed):
-    data = {
-        "reeling_speed": [],
-        "tether_force": [],
-        "time": [],
-        "wind": [],
-        "power": [],
-        "torque": [],
-        "omega": [],
-        "mean_power": [],
-        "retraction_power": []  
+    for phase in ('retraction', 'transition', 'traction'):
+        settings[phase]['time_step_tolerance'] = time_step_tolerance
+    return settings
+
+
+def profile_data(cycle):
+    # Only the simulated columns are kept in the session, the rotational variables and the figures are derived when
+    # rendered.
+    return {
+        "time": cycle.time,
+        "reeling_speed": cycle.columns['reeling_speed'],
+        "tether_force": cycle.columns['tether_force_ground'],
+        "power": cycle.columns['power_ground'],
     }
-    gearbox_ratio=float(gearbox_ratio)
-    kite_area=float(kite_area)
-    wind_step = 20
-    drum_radius = 0.2  # radius of the drum
-
-    h_ref = 10  # Reference height
-    altitude = 1450  # Sta. María de la Alameda
-    h_0 = 0.073  # Roughness length Vortex data
-
-    m_p_area = (13.9 - 3.7) / (19 - 5)  # y = mx+n / Area to Projected Area based on Ozone Edge specs
-    n_p_area = 13.9 - m_p_area * 19
-
-    m_weight = (4.7 - 2.2) / (19 - 5)  # y = mx+n / Weight from area based on Ozone Edge specs
-    n_weight = 4.7 - m_weight * 19
-
-    sys_props = {
-        'kite_projected_area': kite_area * m_p_area + n_p_area,  # kite_area,  # [m^2]
-        'kite_mass': kite_area * m_weight + n_weight + 0.5,  # estimated weight + electronics  [kg]
-        'tether_density': 724.,  # [kg/m^3]
-        'tether_diameter': 0.002,  # [m]
-        'kite_lift_coefficient_powered': 0.69,  # [-]
-        'kite_drag_coefficient_powered': 0.69 / 3.6,  # [-]
-        'kite_lift_coefficient_depowered': .17,  # [-]
-        'kite_drag_coefficient_depowered': .17 / 3.5,  # [-]
-        'tether_drag_coefficient': 2 * 1.1,  # [-]
-        'reeling_speed_min_limit': 0.,  # [m/s]
-        'reeling_speed_max_limit': 10.,  # [m/s]
-        'tether_force_min_limit': 500.,  # [N]
-        'tether_force_max_limit': 50000.,  # [N]
-    }
-    sys_props = SystemProperties(sys_props)
-
-    rmax = 200
-    rmin = 100
-    tether_angle = 26.6 * np.pi / 180.
-
-
-    for current_wind_speed in np.linspace(float(min_wind_speed), float(max_wind_speed), wind_step, True): #por algún motivo no los reconocía como float
-        # Configure simulation and kite parameters
-        env_state = LogProfile()
-        env_state.set_reference_height(h_ref)
-        env_state.set_reference_wind_speed(current_wind_speed)
-        env_state.set_reference_roughness_length(h_0)
-        env_state.set_altitude_ground(altitude)
-        max_wind_speed_1 = current_wind_speed * np.log(altitude + rmax * np.sin(tether_angle) / h_0) / np.log(h_ref / h_0)
-
-        cycle_settings = {
-            'cycle': {
-                'tether_length_start_retraction': rmax,
-                'tether_length_end_retraction': rmin,
-                'include_transition_energy': False,
-                'elevation_angle_traction': 26.6 * np.pi / 180.,
-                'traction_phase': TractionPhase,
-            },
-            'retraction': {
-                'control': ('tether_force_ground', 900),
-                'time_step': 0.01 * (rmax - rmin) / max_wind_speed_1,
-            },
-            'transition': {
-                'control': ('tether_force_ground', 900),
-                'time_step': 0.01 * (rmax - rmin) / max_wind_speed_1,
-            },
-            'traction': {
-                'control': ('max_power_reeling_factor', 3069),
-                'time_step': 0.01 * (rmax - rmin) / 7.3,
-                'azimuth_angle': 10.6 * np.pi / 180.,
-                'course_angle': 96.4 * np.pi / 180.,
-                'time_step': 0.01 * (rmax - rmin) / max_wind_speed_1,
-            },
-        }
-        cycle = Cycle(cycle_settings)
-
-        try:
-            error, time, average, traction, retraction = cycle.run_simulation(sys_props, env_state, print_summary=False)
-
-            # Extract data_5 and store it in the dictionary
-            steady_states = cycle.steady_states
-            times = cycle.time
-            reeling_speeds = [state.reeling_speed for state in steady_states]
-            tether_force_ground = [state.tether_force_ground for state in steady_states]
-            power_ground = [state.power_ground for state in steady_states]
-            torques = [force * drum_radius / gearbox_ratio for force in tether_force_ground]
-            omegas = [(speed / drum_radius) * gearbox_ratio for speed in reeling_speeds]
-
-            data["reeling_speed"].append(reeling_speeds)
-            data["tether_force"].append(tether_force_ground)
-            data["time"].append(times)
-            data["wind"].append(current_wind_speed)
-            data["power"].append(power_ground)
-            data["torque"].append(torques)
-            data["omega"].append(omegas)
-            # Calculate the mean power and add it to the dictionary
-            mean_power = sum(power_ground) / len(power_ground)
-            data["mean_power"].append(mean_power)
-
-            # --- Extract retraction phase power values ---
-            # Try to get the retraction phase power values from the 'retraction' object if available
-            retraction_power_list = []
-            if retraction is not None:
-                # Try to get power at ground for each time step in the retraction phase
-                try:
-                    if hasattr(retraction, 'steady_states'):
-                        retraction_power_list = [getattr(s, 'power_ground', None) for s in retraction.steady_states]
-                        # Remove None values if any
-                        retraction_power_list = [p for p in retraction_power_list if p is not None]
-                except Exception:
-                    retraction_power_list = []
-            # Fallback: if not available, just use negative power values from the full cycle
-            if not retraction_power_list:
-                retraction_power_list = [p for p in power_ground if p < 0]
-            data["retraction_power"].append(retraction_power_list)
-
-        except Exception as e:
-            # Optionally print or log e for debugging
-            pass
 
-    return data
 
 if __name__ == "__main__":
     app = KiteApp()
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""Vectorized metrics of sweep results. The time series of the wind speeds of a sweep differ in length and are
+evaluated as a padded 2-D array with a mask of the valid samples, such that each metric is a single masked NumPy
+reduction over all wind speeds. The samples of the box plots are grouped with sorting-based binning."""
+import numpy as np
+
+
+def pad(series, fill=np.nan):
+    """Stack time series of different lengths into a 2-D array.
+
+    Args:
+        series (list): 1-D array per row.
+        fill (float, optional): Value of the padding.
+
+    Returns:
+        tuple: Padded values, shape (n_rows, max_length), and mask of the valid samples.
+
+    """
+    lengths = np.array([len(s) for s in series], dtype=int)
+    n_columns = lengths.max() if len(lengths) else 0
+    valid = np.arange(n_columns) < lengths[:, np.newaxis]
+    values = np.full(valid.shape, fill, dtype=float)
+    if len(lengths):
+        values[valid] = np.concatenate([np.asarray(s, dtype=float) for s in series])
+    return values, valid
+
+
+def compress(values, mask):
+    """Move the masked samples of each row to the front, keeping their order.
+
+    Args:
+        values (ndarray): Padded values, shape (n_rows, n_columns).
+        mask (ndarray): Samples to keep.
+
+    Returns:
+        tuple: Rearranged values and mask, of which the kept samples form the leading columns.
+
+    """
+    order = np.argsort(~mask, axis=1, kind='stable')
+    return np.take_along_axis(values, order, axis=1), np.take_along_axis(mask, order, axis=1)
+
+
+def energy_rectangle(time, power, valid):
+    """Energy per row with the (left) rectangle rule.
+
+    Args:
+        time (ndarray): Padded time points [s].
+        power (ndarray): Padded power [W].
+        valid (ndarray): Mask of the valid samples.
+
+    Returns:
+        ndarray: Energy per row [J].
+
+    """
+    pairs = valid[:, 1:]
+    return np.sum(np.where(pairs, power[:, :-1] * np.diff(time, axis=1), 0.), axis=1)
+
+
+def energy_trapezoid(time, power, valid):
+    """Energy per row with the trapezoidal rule.
+
+    Args:
+        time (ndarray): Padded time points [s].
+        power (ndarray): Padded power [W].
+        valid (ndarray): Mask of the valid samples.
+
+    Returns:
+        ndarray: Energy per row [J].
+
+    """
+    pairs = valid[:, 1:]
+    return np.sum(np.where(pairs, .5 * (power[:, :-1] + power[:, 1:]) * np.diff(time, axis=1), 0.), axis=1)
+
+
+def last_valid(values, valid):
+    """Last valid sample per row, NaN for empty rows."""
+    lengths = valid.sum(axis=1)
+    last = np.take_along_axis(values, np.maximum(lengths - 1, 0)[:, np.newaxis], axis=1)[:, 0]
+    return np.where(lengths > 0, last, np.nan)
+
+
+def sweep_metrics(time, power, reeling_speed):
+    """Metrics of the time series of a sweep, per wind speed.
+
+    Args:
+        time (list): Time points per wind speed [s].
+        power (list): Power at the ground per wind speed [W].
+        reeling_speed (list): Reeling speed per wind speed [m/s].
+
+    Returns:
+        dict: Per wind speed, the maximum, minimum, and sample mean of the power and the sample mean of the positive
+            power [W]; the cycle energy and the energy of the positive power samples, both with the rectangle and
+            trapezoidal rule [J]; and the final reeling speed [m/s]. NaN if undefined.
+
+    """
+    t, _ = pad(time)
+    p, valid = pad(power)
+    v, _ = pad(reeling_speed)
+    n_samples = valid.sum(axis=1)
+    generating = valid & (p > 0)
+    n_generating = generating.sum(axis=1)
+
+    # The generation energy integrates the positive power samples as if they were consecutive.
+    t_gen, _ = compress(t, generating)
+    p_gen, generating_compressed = compress(p, generating)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'max_power': np.where(n_samples > 0, np.max(np.where(valid, p, -np.inf), axis=1), np.nan),
+            'min_power': np.where(n_samples > 0, np.min(np.where(valid, p, np.inf), axis=1), np.nan),
+            'mean_power': np.sum(np.where(valid, p, 0.), axis=1) / n_samples,
+            'mean_power_generation': np.where(n_generating > 0, np.sum(np.where(generating, p, 0.), axis=1) /
+                                              n_generating, np.nan),
+            'energy': energy_rectangle(t, p, valid),
+            'energy_trapezoid': energy_trapezoid(t, p, valid),
+            'energy_generation': energy_rectangle(t_gen, p_gen, generating_compressed),
+            'energy_generation_trapezoid': energy_trapezoid(t_gen, p_gen, generating_compressed),
+            'final_reeling_speed': last_valid(v, valid),
+        }
+
+
+def bin_nearest(x, y, n_bins=20):
+    """Group samples by the nearest of evenly spaced bin centres spanning the range of `x`. Samples halfway between
+    two centres belong to the lower bin.
+
+    Args:
+        x (array_like): Values that determine the bins, e.g. rotational speeds.
+        y (array_like): Values to group, same length as `x`.
+        n_bins (int, optional): Number of bin centres.
+
+    Returns:
+        tuple: Centres of the non-empty bins, `y` values per non-empty bin as arrays in sample order, and the first
+            quartile, median, and third quartile per non-empty bin, shape (n_non_empty, 3).
+
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if not len(x):
+        return np.empty(0), [], np.empty((0, 3))
+    centres = np.linspace(np.min(x), np.max(x), num=n_bins)
+    bins = np.searchsorted((centres[:-1] + centres[1:]) / 2., x, side='left')
+
+    order = np.argsort(bins, kind='stable')
+    counts = np.bincount(bins, minlength=n_bins)
+    groups = np.split(y[order], np.cumsum(counts)[:-1])
+    non_empty = np.flatnonzero(counts)
+    groups = [groups[i] for i in non_empty]
+    quartiles = np.array([np.percentile(g, [25, 50, 75]) for g in groups])
+    return centres[non_empty], groups, quartiles
+
+
+def bin_rounded(x, y):
+    """Group samples by the nearest integer of `x`, e.g. wind speeds binned per m/s. Samples halfway between two
+    integers belong to the even one, as with `round`.
+
+    Args:
+        x (array_like): Values that determine the bins.
+        y (array_like): Values to group, same length as `x`.
+
+    Returns:
+        tuple: Integers of the non-empty bins in ascending order, and `y` values per bin as arrays in sample order.
+
+    """
+    bins = np.rint(np.asarray(x, dtype=float)).astype(int)
+    y = np.asarray(y, dtype=float)
+    order = np.argsort(bins, kind='stable')
+    non_empty, starts = np.unique(bins[order], return_index=True)
+    return non_empty, np.split(y[order], starts[1:]) if len(non_empty) else []
@@ -7,13 +7,32 @@ et al. The model is implemented in such a way that it can be used for numerical
     https://arxiv.org/abs/1705.04133
 
 """
+import functools
+import math
 import numpy as np
-import matplotlib.pyplot as plt
-from copy import copy
-import pandas as pd
-from app.utils import zip_el, plot_traces
+from collections.abc import Sequence
+from app.utils import plot_traces
 
-np.seterr(all='raise')
+
+def floating_point_errors(policy):
+    """Decorator evaluating a method of the model with a NumPy floating point error policy, see `np.errstate`. The
+    policy only applies to the calling thread for the duration of the call, such that importing the model does not
+    change the floating point behaviour of the rest of the process.
+
+    Args:
+        policy (str): Treatment of all floating point errors, e.g. 'raise' or 'ignore'.
+
+    Returns:
+        callable: Decorator of the method.
+
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with np.errstate(all=policy):
+                return method(*args, **kwargs)
+        return wrapper
+    return decorator
 
 
 class OperationalLimitViolation(Exception):
@@ -184,6 +203,7 @@ class LogProfile(EnvAtmosphericPressure):
 
     def plot_wind_profile(self):
         """Plot the wind speed versus the height above ground."""
+        import matplotlib.pyplot as plt
         heights = [50., 75., 100., 150., 200., 300., 400., 500.]
         wind_speeds = [self.calculate_wind(h) for h in heights]
         plt.plot(wind_speeds, heights)
@@ -233,6 +253,7 @@ class NormalisedWindTable1D(EnvAtmosphericPressure):
 
     def plot_wind_profile(self, label=None):
         """Plot the wind speed versus the height above ground."""
+        import matplotlib.pyplot as plt
         wind_speeds = np.array(self.normalised_wind_speeds) * self.wind_speed_ref
         plt.plot(wind_speeds, self.heights, label=label)
         plt.xlabel('Wind speed [m s$^{-1}$]')
@@ -277,6 +298,7 @@ class WindTable2D(EnvAtmosphericPressure):
 
     def plot_wind_profile(self):
         """Plot the wind speed versus the height above ground."""
+        import matplotlib.pyplot as plt
         plt.plot(self.wind_speed_x_table, self.height_table, label="x-component")
         plt.plot(self.wind_speed_y_table, self.height_table, label="y-component")
         plt.xlabel('Wind speed [m/s]')
@@ -549,6 +571,8 @@ class KitePosition:
         elevation_angle (float or None): Angle of point particle w.r.t. GRF's x,y-plane [rad] (= pi/2 - polar angle).
 
     """
+    __slots__ = ('straight_tether_length', 'azimuth_angle', 'elevation_angle')
+
     def __init__(self, straight_tether_length=None, azimuth_angle=None, elevation_angle=None):
         """
         Args:
@@ -575,6 +599,8 @@ class KiteKinematics(KitePosition):
         z (float): Up-position in ground reference frame [m].
 
     """
+    __slots__ = ('course_angle', 'x', 'y', 'z')
+
     def __init__(self, straight_tether_length, azimuth_angle, elevation_angle, course_angle):
         """
         Args:
@@ -603,6 +629,78 @@ class KiteKinematics(KitePosition):
         self.y = np.cos(self.elevation_angle)*np.sin(self.azimuth_angle)*self.straight_tether_length
         self.z = np.sin(self.elevation_angle)*self.straight_tether_length
 
+    def copy(self):
+        """Create a copy without re-evaluating the cartesian coordinates.
+
+        Returns:
+            `KiteKinematics`: Copy of the object.
+
+        """
+        kin = self.__class__.__new__(self.__class__)
+        kin.straight_tether_length = self.straight_tether_length
+        kin.azimuth_angle = self.azimuth_angle
+        kin.elevation_angle = self.elevation_angle
+        kin.course_angle = self.course_angle
+        kin.x = self.x
+        kin.y = self.y
+        kin.z = self.z
+        return kin
+
+
+class KinematicRatioRootFinder:
+    """Safeguarded secant iteration for the kinematic ratio that yields a zero lift-to-drag residual, i.e. the
+    calculated minus the actual lift-to-drag ratio. The residual increases with the kinematic ratio, which is used for
+    bracketing the root. Steps leaving the bracket are replaced by bisection steps. As long as the root is not
+    bracketed, secant steps that change the kinematic ratio by more than a factor 2 are replaced by the fixed-point
+    step.
+
+    Attributes:
+        kappa_last (float): Kinematic ratio of the previous evaluation [-].
+        residual_last (float): Lift-to-drag residual of the previous evaluation [-].
+        kappa_fixed_point_last (float): Fixed-point update of the previous evaluation [-].
+        kappa_low (float): Largest kinematic ratio with a negative residual [-].
+        kappa_high (float): Smallest kinematic ratio with a positive residual [-].
+        max_iterations (int): Number of steps after which the secant method is considered to stagnate.
+
+    """
+    def __init__(self, max_iterations=50):
+        self.kappa_last = None
+        self.residual_last = None
+        self.kappa_fixed_point_last = None
+        self.kappa_low = None
+        self.kappa_high = None
+        self.max_iterations = max_iterations
+
+    def next(self, kappa, residual, kappa_fixed_point):
+        """Determine the next kinematic ratio to evaluate.
+
+        Args:
+            kappa (float): Evaluated kinematic ratio [-].
+            residual (float): Lift-to-drag residual of the evaluated kinematic ratio [-].
+            kappa_fixed_point (float): Kinematic ratio following from the fixed-point update [-].
+
+        Returns:
+            float: Next kinematic ratio [-].
+
+        """
+        if residual < 0. and (self.kappa_low is None or kappa > self.kappa_low):
+            self.kappa_low = kappa
+        elif residual > 0. and (self.kappa_high is None or kappa < self.kappa_high):
+            self.kappa_high = kappa
+
+        kappa_next = kappa_fixed_point
+        if self.kappa_last is not None and residual != self.residual_last:
+            with np.errstate(all='ignore'):
+                kappa_next = kappa - residual*(kappa - self.kappa_last)/(residual - self.residual_last)
+        self.kappa_last, self.residual_last, self.kappa_fixed_point_last = kappa, residual, kappa_fixed_point
+
+        if self.kappa_low is not None and self.kappa_high is not None:
+            if not self.kappa_low < kappa_next < self.kappa_high:
+                kappa_next = .5*(self.kappa_low + self.kappa_high)
+        elif not .5*kappa <= kappa_next <= 2.*kappa:
+            kappa_next = kappa_fixed_point
+        return kappa_next
+
 
 class SteadyState:
     """Given the system properties, control settings, and wind velocity and kinematics of the kite; a kinematic ratio
@@ -640,6 +738,14 @@ class SteadyState:
         max_iterations (int): Maximum number of iterations before stopping the iterative procedure.
         enable_steady_state_errors (bool): Raising the exception if True.
         convergence_tolerance (float): Metric declaring convergence: normalized lift-to-drag error [-].
+        warm_start (bool): Specifies whether a phase seeds the iterative procedures with the solution of the previous
+            time point.
+        solver (str): Update rule of the kinematic ratio iteration: 'fixed_point' or 'secant'. The latter treats the
+            lift-to-drag error as root problem in the kinematic ratio and takes safeguarded secant steps, falling back
+            to bisection when the root is bracketed or to a fixed-point step otherwise.
+        kinematic_ratio_start (float): Initial guess for the kinematic ratio [-], the massless solution is used if
+            None.
+        angle_of_attack_start (float): Initial guess for the angle of attack [rad], 15 degrees is used if None.
         tether_force_max_limit_violated (bool): Flag indicating if the maximum tether force limit is violated at
             the kite.
         tether_force_min_limit_violated (bool): Flag indicating if the minimum tether force limit is violated at
@@ -647,6 +753,15 @@ class SteadyState:
         (to be removed) tether_force_limit_violation (float): Tether force minimum/maximum limit violation [N] at the kite.
 
     """
+    __slots__ = ('control_settings', 'reeling_factor', 'kinematic_ratio', 'tangential_speed_factor', 'wind_speed',
+                 'apparent_wind_speed', 'heading', 'inflow_angle', 'angle_of_attack', 'lift_to_drag',
+                 'aerodynamic_force', 'tether_force_kite', 'tether_force_ground', 'power_ground', 'kite_speed',
+                 'kite_tangential_speed', 'reeling_speed', 'elevation_rate', 'azimuth_rate', 'lift_to_drag_error',
+                 'n_iterations', 'n_iterations_aoa', 'converged', 'error_message', 'error_code',
+                 'force_n_iterations', 'max_iterations', 'enable_steady_state_errors', 'convergence_tolerance',
+                 'warm_start', 'solver', 'kinematic_ratio_start', 'angle_of_attack_start',
+                 'tether_force_max_limit_violated', 'tether_force_min_limit_violated', 'tether_force_limit_violation')
+
     def __init__(self, iterative_procedure_config={}):
         """
         Args:
@@ -695,6 +810,14 @@ class SteadyState:
         self.max_iterations = iterative_procedure_config.get('max_iterations', 2500)
         self.enable_steady_state_errors = iterative_procedure_config.get('enable_steady_state_errors', True)
         self.convergence_tolerance = iterative_procedure_config.get('convergence_tolerance', 1e-6)
+        self.warm_start = iterative_procedure_config.get('warm_start', False)
+        self.solver = iterative_procedure_config.get('solver', 'fixed_point')
+        if self.solver not in ('fixed_point', 'secant'):
+            raise ValueError("Invalid solver.")
+
+        # Initial guesses for the iterative procedures.
+        self.kinematic_ratio_start = None
+        self.angle_of_attack_start = None
 
         # Monitoring parameters for tether force limit violation.
         self.tether_force_max_limit_violated = False
@@ -721,8 +844,10 @@ class SteadyState:
             if self.enable_steady_state_errors:
                 raise SteadyStateError(error_message, error_code)
 
+    @floating_point_errors('ignore')
     def find_state(self, system_properties, environment_state, basic_kinematics, print_details=False):
-        """Iterative procedure for finding the kinematic ratio yielding the steady state of the kite.
+        """Iterative procedure for finding the kinematic ratio yielding the steady state of the kite. Floating point
+        errors are ignored, infeasible states are detected from the non-finite intermediate results instead.
 
         Args:
             system_properties (`SysPropsFixedAeroCoeffs` or child): Collection of system properties.
@@ -766,9 +891,8 @@ class SteadyState:
             f_tether_kite = self.control_settings[1]  # Force controlled at kite.
 
             f_tether_theta = .5 * np.sin(theta) * m_tether * g
-            try:
-                f_tether_r = -np.sqrt(f_tether_kite**2 - f_tether_theta**2)
-            except ValueError:
+            f_tether_r = -np.sqrt(f_tether_kite**2 - f_tether_theta**2)
+            if not math.isfinite(f_tether_r):
                 self.process_error("Tether force setpoint is too small.", 1, print_details)
                 f_tether_r = 0
 
@@ -779,9 +903,8 @@ class SteadyState:
         elif self.control_settings[0] == 'tether_force_ground':
             f_tether_ground = self.control_settings[1]  # Force controlled at ground.
             f_tether_theta = .5 * np.sin(theta) * m_tether * g
-            try:
-                f_tether_r_ground = np.sqrt(f_tether_ground**2 - f_tether_theta**2)
-            except FloatingPointError:
+            f_tether_r_ground = np.sqrt(f_tether_ground**2 - f_tether_theta**2)
+            if not math.isfinite(f_tether_r_ground):
                 f_tether_r_ground = 0.
             f_tether_r = -(f_tether_r_ground + np.cos(theta) * m_tether * g)
             f_tether_vector = np.array([f_tether_r, f_tether_theta, 0])
@@ -811,11 +934,15 @@ class SteadyState:
         # Iterative procedure to determine the angle of attack.
         if system_properties.__class__.__name__ == "SysPropsAerodynamicCurves":
             update_aero_coefficients = True
-            alpha = 15*np.pi/180.  # Initial assumption for angle of attack.
+            if self.angle_of_attack_start is None:
+                alpha = 15*np.pi/180.  # Initial assumption for angle of attack.
+            else:
+                alpha = self.angle_of_attack_start
             system_properties.calculate_aerodynamic_properties(alpha)
         else:
             update_aero_coefficients = False
 
+        kappa_start = self.kinematic_ratio_start
         self.n_iterations_aoa = 0
         # fraction_d_alpha = 1.  #
         while True:
@@ -824,8 +951,12 @@ class SteadyState:
             lift_to_drag = system_properties.lift_to_drag
 
             # Parameters used for loop condition.
-            kappa = lift_to_drag  # Initial assumption for kinematic ratio (massless solution).
+            if kappa_start is None:
+                kappa = lift_to_drag  # Initial assumption for kinematic ratio (massless solution).
+            else:
+                kappa = kappa_start
             self.n_iterations = 0  # Counter for number of iterations.
+            root_finder = KinematicRatioRootFinder() if self.solver == 'secant' else None
 
             # Iterative procedure to determine true kinematic ratio.
             while True:
@@ -836,9 +967,8 @@ class SteadyState:
                         rf = (1/3)*np.sin(theta)*np.cos(phi)
                     f_aero = c_r*(1+kappa**2)*(np.sin(theta)*np.cos(phi)-rf)**2*q*s  # Magnitude of aerodynamic force.
 
-                    try:
-                        f_aero_r = np.sqrt(np.maximum(0.0, f_aero**2 - f_aero_theta**2))  # Radial aerodynamic force.
-                    except (ValueError, FloatingPointError):
+                    f_aero_r = np.sqrt(np.maximum(0.0, f_aero**2 - f_aero_theta**2))  # Radial aerodynamic force.
+                    if not math.isfinite(f_aero_r):
                         error_message = "No feasible solution found for radial aerodynamic force " \
                                         "after {} iterations - aerodynamic force is too small to keep " \
                                         "the kite in the air.".format(self.n_iterations)
@@ -848,9 +978,8 @@ class SteadyState:
                     f_aero_vector = np.array([f_aero_r, f_aero_theta, 0.])
 
                 # Updating tangential velocity factor.
-                try:
-                    lambda_ = a + np.sqrt(np.maximum(0.0, a**2+b**2-1+kappa**2*(b-rf)**2))
-                except (ValueError, FloatingPointError):
+                lambda_ = a + np.sqrt(np.maximum(0.0, a**2+b**2-1+kappa**2*(b-rf)**2))
+                if not math.isfinite(lambda_):
                     error_message = "No feasible solution found for tangential velocity factor " \
                                     "after {} iterations.".format(self.n_iterations)
                     self.process_error(error_message, 4, print_details)
@@ -869,10 +998,19 @@ class SteadyState:
                 else:
                     # Evaluate the convergence of the calculated to the actual lift-to-drag ratio.
                     drag = np.dot(f_aero_vector, v_app_vector)/v_app
-                    try:
-                        lift_to_drag_calc = np.sqrt(np.maximum(0.0, (f_aero/drag)**2-1))
-                        kappa *= np.sqrt(np.maximum(0.0, lift_to_drag/lift_to_drag_calc))
-                    except (ValueError, FloatingPointError):
+                    lift_to_drag_calc = np.sqrt(np.maximum(0.0, (f_aero/drag)**2-1))
+                    kappa_fixed_point = kappa*np.sqrt(np.maximum(0.0, lift_to_drag/lift_to_drag_calc))
+                    if math.isfinite(lift_to_drag_calc) and math.isfinite(kappa_fixed_point):
+                        if root_finder is None:
+                            kappa = kappa_fixed_point
+                        else:
+                            kappa = root_finder.next(kappa, lift_to_drag_calc - lift_to_drag, kappa_fixed_point)
+                    else:
+                        if root_finder is not None and root_finder.kappa_fixed_point_last is not None:
+                            # The kinematic ratio proposed by the root-finder is infeasible: continue with the
+                            # fixed-point method from the last feasible evaluation.
+                            kappa, root_finder = root_finder.kappa_fixed_point_last, None
+                            continue
                         error_message = "No feasible solution for found for calculated lift-to-drag " \
                                         "after {} iterations.".format(self.n_iterations)
                         self.process_error(error_message, 5, print_details)
@@ -889,6 +1027,8 @@ class SteadyState:
 
                 # Check loop conditions.
                 self.n_iterations += 1
+                if root_finder is not None and self.n_iterations == root_finder.max_iterations:
+                    root_finder = None  # Fall back on the fixed-point method if the root-finder stagnates.
 
                 if self.force_n_iterations is not None and self.n_iterations == self.force_n_iterations:
                     break
@@ -902,9 +1042,8 @@ class SteadyState:
                     break
 
             # Determine inflow angle with respect to tangential plane.
-            try:
-                inflow_angle = np.arcsin(v_app_vector[0]/v_app)  # Assuming wing is parallel to the unit sphere.
-            except FloatingPointError:
+            inflow_angle = np.arcsin(v_app_vector[0]/v_app)  # Assuming wing is parallel to the unit sphere.
+            if not math.isfinite(inflow_angle):
                 inflow_angle = 0.
 
             self.n_iterations_aoa += 1
@@ -922,6 +1061,8 @@ class SteadyState:
                     # fraction_d_alpha -= .01
                     alpha = alpha + d_alpha*.95  #*fraction_d_alpha
                     system_properties.calculate_aerodynamic_properties(alpha)
+                    if kappa_start is not None and kappa is not None:
+                        kappa_start = kappa  # Continue from the previous angle of attack iteration.
             else:
                 break
 
@@ -963,14 +1104,10 @@ class SteadyState:
         # Kite velocity in spherical coordinates, see eq. 2.58-2.60 AWE book.
         self.kite_speed = np.sqrt(reeling_speed**2 + (lambda_*v_wind)**2)
         self.reeling_speed = reeling_speed
-        try:
-            self.elevation_rate = - v_wind * lambda_ / r * np.cos(chi)
-        except (ZeroDivisionError, FloatingPointError):
-            self.elevation_rate = 0.
-        try:
-            self.azimuth_rate = v_wind * lambda_ / r * np.sin(chi) / np.sin(theta)
-        except (ZeroDivisionError, FloatingPointError):
-            self.azimuth_rate = 0.
+        elevation_rate = - v_wind * lambda_ / np.float64(r) * np.cos(chi)
+        azimuth_rate = v_wind * lambda_ / np.float64(r) * np.sin(chi) / np.sin(theta)
+        self.elevation_rate = elevation_rate if math.isfinite(elevation_rate) else 0.
+        self.azimuth_rate = azimuth_rate if math.isfinite(azimuth_rate) else 0.
 
         # Update monitoring parameters for tether force violations.
         if 'tether_force' not in self.control_settings[0]:
@@ -986,14 +1123,633 @@ class SteadyState:
                 # self.tether_force_limit_violation = min_force - self.tether_force_ground
 
 
+class SteadyStateBatch:
+    """Vectorized counterpart of `SteadyState`: finds the steady states for arrays of kinematics and environment
+    conditions at once. The iterative procedure is identical to that of `SteadyState` for the system properties with
+    binary aerodynamic characteristics, but is evaluated as masked array operations on the elements that did not yet
+    converge. Errors do not interrupt the procedure, instead they are recorded per element.
+
+    Attributes:
+        control_settings (tuple): Tuple containing the controlled parameter(s) and the setpoint(s). The controlled
+            parameter is either a single string or an array of strings with the same options as `SteadyState`, the
+            setpoint is either a scalar or an array.
+        shape (tuple): Shape of the evaluated arrays.
+        converged (ndarray): Flags indicating if the convergence criteria is met.
+        error_code (ndarray): Error codes, -1 if no error has occurred. The codes are identical to those of
+            `SteadyState`.
+        n_iterations (ndarray): Number of iterations used in iterative procedure.
+        force_n_iterations (int): Force the iterative procedure to use a desired number of iterations.
+        max_iterations (int): Maximum number of iterations before stopping the iterative procedure.
+        enable_steady_state_errors (bool): Raising an exception for the first erroneous element if True.
+        convergence_tolerance (float): Metric declaring convergence: normalized lift-to-drag error [-].
+        warm_start (bool): Specifies whether `CycleBatch` seeds the iterative procedure with the solution of the
+            previous time point.
+        solver (str): Update rule of the kinematic ratio iteration, only 'fixed_point' is supported.
+        kinematic_ratio_start (ndarray): Initial guesses for the kinematic ratio [-], the massless solution is used
+            for NaN elements or if None.
+
+    Furthermore, the calculated quantities of `SteadyState` are available as arrays under the same attribute names,
+    e.g.: `reeling_speed`, `tether_force_ground`, and `power_ground`.
+
+    """
+    CONTROL_PARAMETERS = ('tether_force_kite', 'tether_force_ground', 'reeling_factor', 'reeling_speed',
+                          'max_power_reeling_factor')
+    ERROR_MESSAGES = {
+        1: "Tether force setpoint is too small.",
+        2: "Reeling factor is not feasible.",
+        3: "No feasible solution found for radial aerodynamic force.",
+        4: "No feasible solution found for tangential velocity factor.",
+        5: "No feasible solution found for calculated lift-to-drag.",
+        6: "Unrealistic kappa or maximum of iterations reached before convergence.",
+        7: "Unrealistic apparent wind speed or elevation angle.",
+        8: "Solution converged to an unrealistic lambda.",
+    }
+
+    def __init__(self, iterative_procedure_config={}):
+        """
+        Args:
+            iterative_procedure_config (dict): Iterative procedure settings collected in a dictionary.
+
+        """
+        # Control settings: control parameter(s) and setpoint value(s).
+        self.control_settings = ('tether_force_ground', None)
+        self.shape = None
+
+        # Calculated operational parameters.
+        self.reeling_factor = None
+        self.kinematic_ratio = None
+        self.tangential_speed_factor = None
+
+        # Flow conditions at the kite.
+        self.wind_speed = None
+        self.apparent_wind_speed = None
+        self.heading = None
+        self.inflow_angle = None
+        self.angle_of_attack = None
+        self.lift_to_drag = None
+
+        # Calculated forces and power.
+        self.aerodynamic_force = None
+        self.tether_force_kite = None
+        self.tether_force_ground = None
+        self.power_ground = None
+
+        # Calculated velocity of the kite.
+        self.kite_speed = None
+        self.kite_tangential_speed = None
+        self.reeling_speed = None
+        self.elevation_rate = None
+        self.azimuth_rate = None
+
+        # Iterative procedure state.
+        self.lift_to_drag_error = None
+        self.n_iterations = None
+        self.n_iterations_aoa = None
+        self.converged = None
+        self.error_code = None
+
+        # Iterative procedure settings.
+        self.force_n_iterations = iterative_procedure_config.get('force_n_iterations', None)
+        self.max_iterations = iterative_procedure_config.get('max_iterations', 2500)
+        self.enable_steady_state_errors = iterative_procedure_config.get('enable_steady_state_errors', False)
+        self.convergence_tolerance = iterative_procedure_config.get('convergence_tolerance', 1e-6)
+        self.warm_start = iterative_procedure_config.get('warm_start', False)
+        self.solver = iterative_procedure_config.get('solver', 'fixed_point')
+        if self.solver != 'fixed_point':
+            raise ValueError("The batch solver only supports the fixed-point method.")
+
+        # Initial guesses for the iterative procedure.
+        self.kinematic_ratio_start = None
+
+        # Monitoring parameters for tether force limit violation.
+        self.tether_force_max_limit_violated = None
+        self.tether_force_min_limit_violated = None
+
+    @staticmethod
+    def system_property_arrays(system_properties, tether_length, kite_powered=True):
+        """Evaluate the system properties required for finding the steady state for an array of tether lengths, without
+        updating the system properties object(s).
+
+        Args:
+            system_properties (`SysPropsFixedAeroCoeffs` or child, or list): Collection of system properties, or a
+                sequence of such collections - one per element.
+            tether_length (ndarray): Airborne tether lengths [m].
+            kite_powered (bool or ndarray, optional): Use powered aerodynamic characteristics of the kite if True.
+
+        Returns:
+            dict: Kite projected area, kite mass, tether mass, aerodynamic force coefficient, lift-to-drag ratio, and
+                tether force limit arrays - limits are NaN if not specified.
+
+        """
+        if isinstance(system_properties, (list, tuple)):
+            def attr(name):
+                return np.array([getattr(sp, name) for sp in system_properties], dtype=float)
+        else:
+            def attr(name):
+                return np.asarray(getattr(system_properties, name), dtype=float)
+        sp0 = system_properties[0] if isinstance(system_properties, (list, tuple)) else system_properties
+        if isinstance(sp0, SysPropsAeroCurves):
+            raise ValueError("Aerodynamic curves are not supported by the batch solver.")
+
+        d = attr('tether_diameter')
+        s = attr('kite_projected_area')
+        tether_mass = attr('tether_density') * 0.25 * np.pi * d ** 2 * tether_length
+
+        if hasattr(sp0, 'kite_lift_coefficient_powered'):
+            c_l = np.where(kite_powered, attr('kite_lift_coefficient_powered'),
+                           attr('kite_lift_coefficient_depowered'))
+            c_d = np.where(kite_powered, attr('kite_drag_coefficient_powered'),
+                           attr('kite_drag_coefficient_depowered')) + .25*d*tether_length/s*attr('tether_drag_coefficient')
+            aerodynamic_force_coefficient = np.sqrt(c_l**2 + c_d**2)
+            lift_to_drag = c_l/c_d
+        else:
+            aerodynamic_force_coefficient = attr('aerodynamic_force_coefficient')
+            lift_to_drag = attr('lift_to_drag')
+
+        return {
+            'kite_projected_area': s,
+            'kite_mass': attr('kite_mass'),
+            'tether_mass': tether_mass,
+            'aerodynamic_force_coefficient': aerodynamic_force_coefficient,
+            'lift_to_drag': lift_to_drag,
+            'tether_force_min_limit': attr('tether_force_min_limit') if hasattr(sp0, 'tether_force_min_limit')
+            else np.nan,
+            'tether_force_max_limit': attr('tether_force_max_limit') if hasattr(sp0, 'tether_force_max_limit')
+            else np.nan,
+        }
+
+    def find_state(self, system_properties, tether_length, elevation_angle, azimuth_angle, course_angle, wind_speed,
+                   air_density, kite_powered=True, downwind_direction=0.):
+        """Masked iterative procedure for finding the kinematic ratios yielding the steady states of the kite. All array
+        arguments are broadcast against each other.
+
+        Args:
+            system_properties (`SysPropsFixedAeroCoeffs` or child, or list): Collection of system properties, or a
+                sequence of such collections - one per element.
+            tether_length (ndarray): Airborne tether lengths [m].
+            elevation_angle (ndarray): Elevation angles [rad].
+            azimuth_angle (ndarray): Azimuth angles w.r.t. GRF's x-axis [rad].
+            course_angle (ndarray): Course angles [rad].
+            wind_speed (ndarray): Wind speeds at the kite [m/s].
+            air_density (ndarray): Air densities at the kite [kg/m^3].
+            kite_powered (bool or ndarray, optional): Use powered aerodynamic characteristics of the kite if True.
+            downwind_direction (float or ndarray, optional): Downwind directions w.r.t. GRF's x-axis [rad].
+
+        Raises:
+            SteadyStateError: If steady state errors are enabled and an error occurred for any of the elements.
+
+        """
+        arrays = [np.asarray(x, dtype=float) for x in (tether_length, elevation_angle, azimuth_angle, course_angle,
+                                                        wind_speed, air_density, kite_powered, downwind_direction)]
+        self.shape = np.broadcast_shapes(*[x.shape for x in arrays])
+        n = int(np.prod(self.shape))
+        r, elevation_angle, azimuth_angle, chi, v_wind, rho, kite_powered, downwind_direction = [
+            x.reshape(-1) if x.shape == self.shape else np.broadcast_to(x, self.shape).reshape(-1) for x in arrays]
+        g = Environment.GRAVITATIONAL_ACCELERATION
+
+        with np.errstate(all='ignore'):
+            self._solve(system_properties, n, g, r, elevation_angle, azimuth_angle, chi, v_wind, rho,
+                        kite_powered.astype(bool), downwind_direction)
+
+        if self.enable_steady_state_errors and np.any(self.error_code != -1):
+            code = int(self.error_code.reshape(-1)[np.argmax(self.error_code.reshape(-1) != -1)])
+            raise SteadyStateError(self.ERROR_MESSAGES[code], code)
+
+    def _solve(self, system_properties, n, g, r, elevation_angle, azimuth_angle, chi, v_wind, rho, kite_powered,
+               downwind_direction):
+        """Array implementation of `find_state`, evaluated with floating point errors ignored."""
+        props = self.system_property_arrays(system_properties, r, kite_powered)
+        s, m, m_tether, c_r = [props[k] for k in ('kite_projected_area', 'kite_mass', 'tether_mass',
+                                                  'aerodynamic_force_coefficient')]
+        lift_to_drag = props['lift_to_drag']
+        if np.shape(lift_to_drag) != (n,):
+            lift_to_drag = np.broadcast_to(lift_to_drag, (n,))
+
+        # Controlled parameter and setpoint per element.
+        parameter, setpoint = self.control_settings
+        if isinstance(parameter, str):
+            if parameter not in self.CONTROL_PARAMETERS:
+                raise ValueError("Invalid control setting.")
+            mode = np.full(n, self.CONTROL_PARAMETERS.index(parameter))
+        else:
+            parameter = np.broadcast_to(np.asarray(parameter), self.shape).reshape(-1)
+            mode = np.full(n, -1)
+            for i, p in enumerate(self.CONTROL_PARAMETERS):
+                mode[parameter == p] = i
+            if np.any(mode == -1):
+                raise ValueError("Invalid control setting.")
+        setpoint = np.asarray(np.nan if setpoint is None else setpoint, dtype=float)
+        if setpoint.shape != (n,):
+            setpoint = np.broadcast_to(setpoint, self.shape).reshape(-1)
+        force_controlled = mode <= 1
+
+        # Position of point particle in wind reference frame.
+        phi = azimuth_angle - downwind_direction
+        theta = np.pi / 2 - elevation_angle
+        sin_theta, cos_theta = np.sin(theta), np.cos(theta)
+        sin_phi, cos_phi = np.sin(phi), np.cos(phi)
+        sin_chi, cos_chi = np.sin(chi), np.cos(chi)
+
+        q = .5*rho*v_wind**2
+        g_r, g_theta = -cos_theta*g, sin_theta*g
+
+        a = cos_theta * cos_phi * cos_chi - sin_phi * sin_chi
+        b = sin_theta * cos_phi
+
+        error_code = np.full(n, -1)
+
+        def flag(where, code):
+            # Only the first error that occurs for an element is recorded, `where` is a mask or index array.
+            if where.dtype == bool:
+                if not np.count_nonzero(where):
+                    return
+                where = np.flatnonzero(where)
+            if not where.size:
+                return
+            error_code[where[error_code[where] == -1]] = code
+
+        # Pre-iteration calculations: implications of operational setpoints on invariant forces.
+        f_tether_theta = .5 * sin_theta * m_tether * g
+        radicand = setpoint**2 - f_tether_theta**2
+        flag((mode == 0) & (radicand < 0.), 1)
+        f_tether_r_ground = np.sqrt(np.maximum(radicand, 0.))
+        f_tether_r = np.where(mode == 0, -f_tether_r_ground, -(f_tether_r_ground + cos_theta * m_tether * g))
+
+        f_aero_r = -f_tether_r - m * g_r
+        f_aero_theta = np.where(force_controlled, -f_tether_theta - m * g_theta, -(.5*m_tether + m)*g*sin_theta)
+        f_aero = np.where(force_controlled, np.hypot(f_aero_r, f_aero_theta), np.nan)
+
+        rf = np.where(mode == 2, setpoint, np.where(mode == 3, setpoint/v_wind, np.where(mode == 4, b/3, np.nan)))
+        infeasible = ~force_controlled & (b < rf)
+        flag(infeasible & (sin_theta < 0.), 7)
+        flag(infeasible, 2)
+
+        # Iterative procedure to determine true kinematic ratio. The iterations are evaluated on compacted arrays of
+        # the unconverged elements, which are only re-gathered when elements drop out.
+        if self.kinematic_ratio_start is None:
+            kappa = lift_to_drag.copy()
+        else:
+            kappa_start = np.broadcast_to(np.asarray(self.kinematic_ratio_start, dtype=float), self.shape).reshape(-1)
+            kappa = np.where(np.isnan(kappa_start), lift_to_drag, kappa_start)
+        lambda_ = np.zeros(n)
+        v_app = np.zeros(n)
+        v_app_vector = np.zeros((3, n))
+        lift_to_drag_error = np.full(n, np.inf)
+        n_iterations = np.zeros(n, dtype=int)
+        converged = np.zeros(n, dtype=bool)
+
+        # All elements that are still iterating share the same iteration count, only the failed ones lag one behind.
+        idx = np.arange(n)
+        k = kappa
+        n_iteration = 0
+        error_previous = lift_to_drag_error.copy()
+        w = {
+            'b': b, 'q_s_c_r': q*s*c_r, 'v': v_wind, 'fc': force_controlled, 'f_aero': f_aero, 'rf': rf,
+            'f_aero_r': f_aero_r, 'f_aero_theta': f_aero_theta, 'a': a, 'a_b_1': a**2+b**2-1,
+            'v_app_1': cos_theta*cos_phi, 'cos_chi': cos_chi, 'v_app_2': -sin_phi, 'sin_chi': sin_chi,
+            'lift_to_drag': lift_to_drag,
+        }
+
+        while idx.size:
+            # The quantities that do not depend on the kinematic ratio are only updated after elements dropped out.
+            # Both control branches are only evaluated if the unconverged elements are mixed.
+            if n_iteration == 0 or n_done:
+                fc = w['fc']
+                n_fc = np.count_nonzero(fc)
+                any_fc, all_fc = n_fc > 0, n_fc == idx.size
+                f_aero_theta_sq = w['f_aero_theta']**2
+                if not any_fc:
+                    rf_i = w['rf']
+                    b_rf = w['b'] - rf_i
+                    b_rf_sq = b_rf**2
+                    v_app_r = b_rf * w['v']
+
+            one_plus_k_sq = 1 + k**2
+            if any_fc:
+                if all_fc:
+                    rf_i = w['b'] - np.sqrt(w['f_aero'] / (w['q_s_c_r']*one_plus_k_sq))
+                else:
+                    rf_i = np.where(fc, w['b'] - np.sqrt(w['f_aero'] / (w['q_s_c_r']*one_plus_k_sq)), w['rf'])
+                b_rf = w['b'] - rf_i
+                b_rf_sq = b_rf**2
+                v_app_r = b_rf * w['v']
+            if all_fc:
+                f_aero_i, f_aero_r_i = w['f_aero'], w['f_aero_r']
+            else:
+                f_aero_i = w['q_s_c_r']*one_plus_k_sq*b_rf_sq
+                f_aero_r_i = np.sqrt(np.maximum(0.0, f_aero_i**2 - f_aero_theta_sq))
+                if any_fc:
+                    f_aero_i = np.where(fc, w['f_aero'], f_aero_i)
+                    f_aero_r_i = np.where(fc, w['f_aero_r'], f_aero_r_i)
+
+            lambda_i = w['a'] + np.sqrt(np.maximum(0.0, w['a_b_1']+(one_plus_k_sq-1)*b_rf_sq))
+
+            v_app_i = v_app_r * np.sqrt(one_plus_k_sq)
+            v_app_theta = (w['v_app_1'] - lambda_i * w['cos_chi']) * w['v']
+
+            # Evaluate the convergence of the calculated to the actual lift-to-drag ratio.
+            drag = (f_aero_r_i*v_app_r + w['f_aero_theta']*v_app_theta)/v_app_i
+            lift_to_drag_calc = np.sqrt(np.maximum(0.0, (f_aero_i/drag)**2-1))
+            kappa_new = k*np.sqrt(np.maximum(0.0, w['lift_to_drag']/lift_to_drag_calc))
+
+            # The individual failure causes are only determined if the combined check fails, a non-positive
+            # calculated lift-to-drag ratio always yields an invalid kinematic ratio.
+            any_failed = np.count_nonzero((v_app_i >= 1e-6) & (kappa_new >= 1e-6) & (kappa_new < np.inf)) < idx.size
+            if any_failed:
+                valid_v_app = v_app_i >= 1e-6
+                feasible = (lift_to_drag_calc > 0.) & (lift_to_drag_calc < np.inf) & (kappa_new < np.inf)
+                k_new = np.where(valid_v_app, kappa_new, k)
+                flag(idx[~valid_v_app], 7)
+                flag(idx[valid_v_app & ~feasible], 5)
+                flag(idx[~(k_new >= 1e-6)], 6)
+                failed = error_code[idx] != -1
+                k_new = np.where(failed, np.nan, k_new)
+            else:
+                k_new = kappa_new
+
+            lift_to_drag_error_i = w['lift_to_drag']-lift_to_drag_calc
+
+            # Check loop conditions.
+            n_iteration += 1
+            if self.force_n_iterations is not None and n_iteration == self.force_n_iterations:
+                newly_converged = np.zeros(idx.size, dtype=bool)
+                done = ~newly_converged
+            else:
+                newly_converged = np.abs(lift_to_drag_error_i)/w['lift_to_drag'] < self.convergence_tolerance
+                if any_failed:
+                    newly_converged &= ~failed
+                    done = failed | newly_converged
+                else:
+                    done = newly_converged
+                if self.max_iterations is not None and n_iteration == self.max_iterations:
+                    flag(idx[~done], 6)
+                    done = np.ones(idx.size, dtype=bool)
+            k = k_new
+            n_done = np.count_nonzero(done)
+            if not n_done:
+                error_previous = lift_to_drag_error_i
+                continue
+
+            # Store the state of the latest iteration of the elements dropping out, failed elements keep the error and
+            # iteration count of the preceding iteration.
+            j = idx[done]
+            kappa[j], rf[j], f_aero[j], f_aero_r[j], lambda_[j] = k[done], rf_i[done], f_aero_i[done], \
+                f_aero_r_i[done], lambda_i[done]
+            v_app[j], v_app_vector[0, j], v_app_vector[1, j] = v_app_i[done], v_app_r[done], v_app_theta[done]
+            v_app_vector[2, j] = (w['v_app_2'][done] - lambda_i[done] * w['sin_chi'][done]) * w['v'][done]
+            if any_failed:
+                lift_to_drag_error[j] = np.where(failed, error_previous, lift_to_drag_error_i)[done]
+                n_iterations[j] = n_iteration - failed[done]
+            else:
+                lift_to_drag_error[j] = lift_to_drag_error_i[done]
+                n_iterations[j] = n_iteration
+            converged[idx[newly_converged]] = True
+
+            keep = ~done
+            idx, k = idx[keep], k[keep]
+            error_previous = lift_to_drag_error_i[keep]
+            w = {key: val[keep] for key, val in w.items()}
+
+        # Determine inflow angle with respect to tangential plane.
+        inflow_angle = np.arcsin(v_app_vector[0]/v_app)
+        inflow_angle[~np.isfinite(inflow_angle)] = 0.
+
+        flag(lambda_ < 0., 8)
+
+        # Forces from the free body diagram of tether, note that the tether forces as experienced by the kite switch
+        # sign.
+        f_tether_vector_r = f_aero_r + m*g_r
+        f_tether_vector_theta = f_aero_theta + m*g_theta
+        f_tether = np.hypot(f_tether_vector_r, f_tether_vector_theta)
+
+        f_tether_r_ground = -(f_tether_vector_r - cos_theta*m_tether*g)
+        f_tether_ground = np.sqrt(f_tether_r_ground**2 + f_tether_vector_theta**2)
+
+        # Calculating mechanical power of system.
+        reeling_speed = v_wind*rf
+
+        # Kite velocity in spherical coordinates, see eq. 2.58-2.60 AWE book.
+        elevation_rate = - v_wind * lambda_ / r * cos_chi
+        elevation_rate[~np.isfinite(elevation_rate)] = 0.
+        azimuth_rate = v_wind * lambda_ / r * sin_chi / sin_theta
+        azimuth_rate[~np.isfinite(azimuth_rate)] = 0.
+
+        # Update monitoring parameters for tether force violations.
+        max_violated = ~force_controlled & (f_tether_ground > props['tether_force_max_limit'])
+        min_violated = ~force_controlled & ~max_violated & (f_tether_ground < props['tether_force_min_limit'])
+
+        def out(x):
+            return x.reshape(self.shape)
+
+        self.reeling_factor = out(rf)
+        self.kinematic_ratio = out(kappa)
+        self.tangential_speed_factor = out(lambda_)
+        self.kite_tangential_speed = out(lambda_ * v_wind)
+        self.wind_speed = out(v_wind)
+        self.apparent_wind_speed = out(v_app)
+        self.heading = out(np.arctan2(v_app_vector[2], v_app_vector[1]))
+        self.inflow_angle = out(inflow_angle)
+        self.lift_to_drag = out(np.array(lift_to_drag))
+        self.aerodynamic_force = out(f_aero)
+        self.tether_force_kite = out(f_tether)
+        self.tether_force_ground = out(f_tether_ground)
+        self.power_ground = out(f_tether_ground*reeling_speed)
+        self.kite_speed = out(np.sqrt(reeling_speed**2 + (lambda_*v_wind)**2))
+        self.reeling_speed = out(reeling_speed)
+        self.elevation_rate = out(elevation_rate)
+        self.azimuth_rate = out(azimuth_rate)
+        self.lift_to_drag_error = out(lift_to_drag_error)
+        self.n_iterations = out(n_iterations)
+        self.n_iterations_aoa = out(np.ones(n, dtype=int))
+        self.converged = out(converged)
+        self.error_code = out(error_code)
+        self.tether_force_max_limit_violated = out(max_violated)
+        self.tether_force_min_limit_violated = out(min_violated)
+
+
+class TimeSeriesColumns:
+    """Columnar storage of the time points, kite kinematics, and steady states of a time series. Each field is stored in
+    a preallocated NumPy array, of which the capacity is doubled when it is full. `KiteKinematics` and `SteadyState`
+    objects are only created on demand, see `TimeSeriesView`.
+
+    Attributes:
+        n_points (int): Number of stored time points.
+
+    """
+    KINEMATICS_FIELDS = ('straight_tether_length', 'azimuth_angle', 'elevation_angle', 'course_angle', 'x', 'y', 'z')
+    STEADY_STATE_FIELDS = ('control_settings', 'reeling_factor', 'kinematic_ratio', 'tangential_speed_factor',
+                           'wind_speed', 'apparent_wind_speed', 'heading', 'inflow_angle', 'angle_of_attack',
+                           'lift_to_drag', 'aerodynamic_force', 'tether_force_kite', 'tether_force_ground',
+                           'power_ground', 'kite_speed', 'kite_tangential_speed', 'reeling_speed', 'elevation_rate',
+                           'azimuth_rate', 'lift_to_drag_error', 'n_iterations', 'n_iterations_aoa', 'converged',
+                           'error_message', 'error_code', 'tether_force_max_limit_violated',
+                           'tether_force_min_limit_violated')
+    FIELDS = ('time',) + KINEMATICS_FIELDS + STEADY_STATE_FIELDS
+    DTYPES = {
+        'n_iterations': int,
+        'error_code': int,
+        'converged': bool,
+        'tether_force_max_limit_violated': bool,
+        'tether_force_min_limit_violated': bool,
+        'control_settings': object,
+        'error_message': object,
+    }
+
+    def __init__(self, capacity=256):
+        """
+        Args:
+            capacity (int, optional): Number of time points for which the arrays are preallocated.
+
+        """
+        self.n_points = 0
+        self._arrays = {f: np.empty(capacity, dtype=self.DTYPES.get(f, float)) for f in self.FIELDS}
+
+    def __len__(self):
+        return self.n_points
+
+    def __getitem__(self, field):
+        """Time series of a field as array (view) of the stored time points."""
+        return self._arrays[field][:self.n_points]
+
+    def _reserve(self, n_points):
+        capacity = len(self._arrays['time'])
+        if n_points > capacity:
+            capacity = max(n_points, 2*capacity)
+            for f, arr in self._arrays.items():
+                new_arr = np.empty(capacity, dtype=arr.dtype)
+                new_arr[:self.n_points] = arr[:self.n_points]
+                self._arrays[f] = new_arr
+
+    def append(self, time, kinematics, steady_state):
+        """Add a time point.
+
+        Args:
+            time (float): Point in time [s].
+            kinematics (`KiteKinematics`): Kinematics of the time point.
+            steady_state (`SteadyState`): Steady state of the time point.
+
+        """
+        self._reserve(self.n_points + 1)
+        i = self.n_points
+        arrays = self._arrays
+        arrays['time'][i] = time
+        for f in self.KINEMATICS_FIELDS:
+            arrays[f][i] = getattr(kinematics, f)
+        for f in self.STEADY_STATE_FIELDS:
+            val = getattr(steady_state, f)
+            if val is None and f in ('n_iterations', 'error_code'):
+                val = -1
+            arrays[f][i] = val
+        self.n_points += 1
+
+    @classmethod
+    def concatenate(cls, sequence, time_offsets=None):
+        """Concatenate time series.
+
+        Args:
+            sequence (list): `TimeSeriesColumns` objects to concatenate.
+            time_offsets (list, optional): Offsets added to the time points of the individual time series [s].
+
+        Returns:
+            `TimeSeriesColumns`: Concatenated time series.
+
+        """
+        if time_offsets is None:
+            time_offsets = [0.]*len(sequence)
+        combined = cls(max(1, sum(len(s) for s in sequence)))
+        for f in cls.FIELDS:
+            combined._arrays[f] = np.concatenate([s[f] + dt if f == 'time' and dt else s[f]
+                                                  for s, dt in zip(sequence, time_offsets)])
+        combined.n_points = len(combined._arrays['time'])
+        return combined
+
+    def get(self, field, i):
+        """Value of a field at a time point as found in the objects, i.e. None for missing values which are stored as
+        NaN or -1.
+
+        Args:
+            field (str): Name of the field.
+            i (int): Index of the time point.
+
+        Returns:
+            Value of the field.
+
+        """
+        arr = self[field]
+        val = arr[i]
+        if (arr.dtype == float and np.isnan(val)) or (field == 'n_iterations' and val == -1):
+            return None
+        return val
+
+    def kinematics(self, i):
+        """Create the `KiteKinematics` object of a time point.
+
+        Args:
+            i (int): Index of the time point.
+
+        Returns:
+            `KiteKinematics`: Kinematics of the time point.
+
+        """
+        kin = KiteKinematics.__new__(KiteKinematics)
+        for f in self.KINEMATICS_FIELDS:
+            setattr(kin, f, self.get(f, i))
+        return kin
+
+    def steady_state(self, i):
+        """Create the `SteadyState` object of a time point.
+
+        Args:
+            i (int): Index of the time point.
+
+        Returns:
+            `SteadyState`: Steady state of the time point.
+
+        """
+        ss = SteadyState()
+        for f in self.STEADY_STATE_FIELDS:
+            setattr(ss, f, self.get(f, i))
+        return ss
+
+
+class TimeSeriesView(Sequence):
+    """Read-only sequence of objects of which the attributes are stored in `TimeSeriesColumns`, providing backward
+    compatibility with the former result lists. The objects are created when accessed.
+
+    Attributes:
+        columns (`TimeSeriesColumns`): Underlying storage of the time series.
+
+    """
+    def __init__(self, columns, make_object):
+        """
+        Args:
+            columns (`TimeSeriesColumns`): Value for `columns` attribute.
+            make_object (callable): Function creating the object for an index.
+
+        """
+        self.columns = columns
+        self._make_object = make_object
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __getitem__(self, i):
+        n = len(self.columns)
+        if isinstance(i, slice):
+            return [self._make_object(j) for j in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("Time series index out of range.")
+        return self._make_object(i)
+
+
 class TimeSeries:
     """A solution to the quasi-steady motion simulation of the kite. The distance covered by the point particle is
     solved as a transition through steady states using the finite difference method.
 
     Attributes:
-        time (list): Points in time for which the states are solved.
-        kinematics (list): Time series of `KiteKinematics` objects.
-        steady_states (list): Time series of `SteadyState` objects.
+        columns (`TimeSeriesColumns`): Columnar storage of the time points, kinematics, and steady states.
         system_properties (`SystemProperties`): Collection of system properties.
         environment_state (`Environment` or child): Specification of environment.
         steady_state_config (dict): Iterative procedure settings for finding the steady state.
@@ -1003,10 +1759,8 @@ class TimeSeries:
 
     """
     def __init__(self):
-        # Result lists with time and states.
-        self.time = []
-        self.kinematics = []
-        self.steady_states = []
+        # Results with time and states.
+        self.columns = TimeSeriesColumns()
         self.n_time_points = None
 
         # Side conditions.
@@ -1019,6 +1773,21 @@ class TimeSeries:
         self.average_power = None
         self.duration = None
 
+    @property
+    def time(self):
+        """ndarray: Points in time for which the states are solved."""
+        return self.columns['time']
+
+    @property
+    def kinematics(self):
+        """`TimeSeriesView`: Time series of `KiteKinematics` objects."""
+        return TimeSeriesView(self.columns, self.columns.kinematics)
+
+    @property
+    def steady_states(self):
+        """`TimeSeriesView`: Time series of `SteadyState` objects."""
+        return TimeSeriesView(self.columns, self.columns.steady_state)
+
     def time_plot(self, plot_parameters, y_labels=None, y_scaling=None, plot_markers=None, fig_num=None):
         """Generic plotting method for making a time plot of `KiteKinematics` and `SteadyState` attributes.
 
@@ -1043,41 +1812,38 @@ class TimeSeries:
                 points if True.
 
         """
+        import matplotlib.pyplot as plt
         if fig_num != -1:
             plt.figure(fig_num)
         ax = plt.gca()
         # Plot x vs. z of trajectory.
-        x_traj = [kp.x for kp in self.kinematics]
-        z_traj = [kp.z for kp in self.kinematics]
+        x_traj = self.columns['x']
+        z_traj = self.columns['z']
         plt.plot(x_traj, z_traj, **plot_kwargs)
 
         markers_plotted = False
         if steady_state_markers:
             # Plot all points for which the steady state did not converge.
-            x_not_converged = [x for x, ss in zip_el(x_traj, self.steady_states) if not ss.converged]
-            if x_not_converged:
-                z_not_converged = [z for z, ss in zip_el(z_traj, self.steady_states) if not ss.converged]
-                plt.plot(x_not_converged, z_not_converged, 'kx', label='not converged')
+            not_converged = ~self.columns['converged']
+            if np.any(not_converged):
+                plt.plot(x_traj[not_converged], z_traj[not_converged], 'kx', label='not converged')
                 markers_plotted = True
 
             # Plot all points for which the steady state error occurred.
-            x_ss_error = [x for x, ss in zip_el(x_traj, self.steady_states) if ss.error_message is not None]
-            if x_ss_error:
-                z_ss_error = [z for z, ss in zip_el(z_traj, self.steady_states) if ss.error_message is not None]
-                plt.plot(x_ss_error, z_ss_error, 'rs', label='ss error', markerfacecolor='None')
-                ss_error_code = [ss.error_code for ss in self.steady_states if ss.error_code is not None]
-                for x, z, ec in zip(x_ss_error, z_ss_error, ss_error_code):
+            ss_error = np.array([msg is not None for msg in self.columns['error_message']], dtype=bool)
+            if np.any(ss_error):
+                plt.plot(x_traj[ss_error], z_traj[ss_error], 'rs', label='ss error', markerfacecolor='None')
+                for x, z, ec in zip(x_traj[ss_error], z_traj[ss_error], self.columns['error_code'][ss_error]):
                     plt.plot(x+5, z, marker='${}$'.format(ec), mec='k')  #, alpha=1, ms=7)
                 markers_plotted = True
 
             # Plot all points for which the force limits were violated.
-            x_max_limit = [x for x, ss in zip_el(x_traj, self.steady_states) if ss.tether_force_max_limit_violated]
-            z_max_limit = [z for z, ss in zip_el(z_traj, self.steady_states) if ss.tether_force_max_limit_violated]
-            plt.plot(x_max_limit, z_max_limit, 'ro', label='max force violated', markerfacecolor='None', markersize=10)
-            x_min_limit = [x for x, ss in zip_el(x_traj, self.steady_states) if ss.tether_force_min_limit_violated]
-            z_min_limit = [z for z, ss in zip_el(z_traj, self.steady_states) if ss.tether_force_min_limit_violated]
-            plt.plot(x_min_limit, z_min_limit, 'go', label='min force violated', markerfacecolor='None')
-            if x_max_limit or x_min_limit:
+            max_limit = self.columns['tether_force_max_limit_violated']
+            plt.plot(x_traj[max_limit], z_traj[max_limit], 'ro', label='max force violated', markerfacecolor='None',
+                     markersize=10)
+            min_limit = self.columns['tether_force_min_limit_violated']
+            plt.plot(x_traj[min_limit], z_traj[min_limit], 'go', label='min force violated', markerfacecolor='None')
+            if np.any(max_limit) or np.any(min_limit):
                 markers_plotted = True
 
         plt.xlabel('x [m]')
@@ -1103,6 +1869,7 @@ class TimeSeries:
                 the given integer.
 
         """
+        import matplotlib.pyplot as plt
         from mpl_toolkits.mplot3d import axes3d
         from mpl_toolkits.mplot3d.art3d import Line3DCollection
         from matplotlib.colors import ListedColormap
@@ -1110,12 +1877,11 @@ class TimeSeries:
         fig = plt.figure(fig_num)
         ax = fig.gca(projection='3d')
 
+        x_traj, y_traj, z_traj = self.columns['x'], self.columns['y'], self.columns['z']
         if plot_point_type is not None:
-            point_types = getattr(self, 'phase_id', np.zeros(self.n_time_points))
-            x_traj, y_traj, z_traj = zip(*[(kp.x, kp.y, kp.z) for kp, pt in
-                                           zip(self.kinematics, point_types) if pt == plot_point_type])
-        else:
-            x_traj, y_traj, z_traj = zip(*[(kp.x, kp.y, kp.z) for kp in self.kinematics])
+            point_types = np.asarray(getattr(self, 'phase_id', np.zeros(len(self.columns))))
+            selected = point_types == plot_point_type
+            x_traj, y_traj, z_traj = x_traj[selected], y_traj[selected], z_traj[selected]
 
         if gradient_color is not None:
             vals = gradient_color[1]
@@ -1190,7 +1956,13 @@ class Phase(TimeSeries):
 
     Attributes:
         time_step (float): Step between consecutive time points for which the kite's motion is solved, last time step
-            may deviate [s].
+            may deviate [s]. Updated every time point when adaptive time stepping is enabled.
+        time_step_tolerance (float): Relative error of the kite displacement per time step that is allowed by the
+            adaptive time stepping, a fixed time step is used if None [-]. The error is estimated for each step, steps
+            exceeding the tolerance are repeated with a smaller time step, see `adaptive_time_step`. The resulting
+            relative errors of the energy and duration of the phase approximately equal the tolerance.
+        time_step_min (float): Initial and smallest time step of the adaptive time stepping [s].
+        time_step_max (float): Largest time step of the adaptive time stepping [s].
         control_settings (tuple): Tuple containing the controlled parameter and the setpoint. The controlled parameter
             should be either: 'tether_force_ground', 'tether_force_kite', 'reeling_factor', or 'reeling_speed'.
         impose_operational_limits (bool): Specifies whether to automatically switch the control settings when they lead
@@ -1206,6 +1978,7 @@ class Phase(TimeSeries):
         max_reeling_speed (float): Maximum speed that has occurred in the phase [m/s].
         min_tether_force (float): Minimum tether force at ground that has occurred in the phase [N].
         max_tether_force (float): Maximum tether force at ground that has occurred in the phase [N].
+        n_iterations (int): Total number of iterations used for finding the steady states in the phase.
         enable_limit_violation_error (bool): Flag specifying whether to raise an error when the reeling
             speed or tether force limit is violated.
         max_time_points (int): Number of time points for which the simulation is terminated.
@@ -1227,6 +2000,9 @@ class Phase(TimeSeries):
         super().__init__()
         # Simulation setting.
         self.time_step = phase_settings.get('time_step', 1.)
+        self.time_step_tolerance = phase_settings.get('time_step_tolerance', None)
+        self.time_step_min = phase_settings.get('time_step_min', self.time_step)
+        self.time_step_max = phase_settings.get('time_step_max', 25.*self.time_step_min)
 
         # Control settings.
         self.control_settings = phase_settings['control']
@@ -1245,6 +2021,7 @@ class Phase(TimeSeries):
         self.max_reeling_speed = -np.inf
         self.min_tether_force = np.inf  # Forces at ground station.
         self.max_tether_force = 0
+        self.n_iterations = 0
 
         # Monitoring settings.
         self.enable_limit_violation_error = True
@@ -1258,8 +2035,10 @@ class Phase(TimeSeries):
         self.path_length_effective = None
         self.reeling_tether_length = None
 
+    @floating_point_errors('ignore')
     def run_simulation(self, system_properties, environment_state, steady_state_config={}, timer_start=0.):
-        """Solve quasi-steady motion using finite-difference method.
+        """Solve quasi-steady motion using finite-difference method. Floating point errors are ignored, non-finite
+        kinematics and environment states are detected instead.
 
         Args:
             system_properties (`SystemProperties`): Collection of system properties.
@@ -1268,9 +2047,10 @@ class Phase(TimeSeries):
             timer_start (float, optional): Start point for time trace [s].
 
         """
-        # Empty the result lists.
-        self.time, self.kinematics, self.steady_states, self.n_time_points = [], [], [], 0
+        # Empty the results.
+        self.columns, self.n_time_points = TimeSeriesColumns(), 0
         self.min_reeling_speed, self.max_reeling_speed = np.inf, -np.inf
+        self.n_iterations = 0
 
         self.system_properties = system_properties
         self.environment_state = environment_state
@@ -1278,40 +2058,58 @@ class Phase(TimeSeries):
 
         # Add first time point, kite kinematics, and steady state to corresponding result lists.
         self.timer = timer_start
-        environment_state.calculate(self.kinematics_start.z)
+        self.calculate_environment(self.kinematics_start)
         if self.follow_wind:
             self.kinematics_start.azimuth_angle += environment_state.downwind_direction
             self.kinematics_start.update()
-        steady_state_start = self.determine_new_steady_state(self.kinematics_start)
-        self.time.append(self.timer)
-        self.kinematics.append(self.kinematics_start)
-        self.steady_states.append(steady_state_start)
+        new_kinematics = self.kinematics_start
+        new_steady_state = self.determine_new_steady_state(new_kinematics)
+        self.columns.append(self.timer, new_kinematics, new_steady_state)
 
         # Monitor stopping criteria in case of infinite loop.
+        adaptive = self.time_step_tolerance is not None
+        if adaptive:
+            self.time_step = self.time_step_min
         end_phase = False
         while not end_phase:
-            end_phase, new_kinematics = self.determine_new_kinematics(self.kinematics[-1], self.steady_states[-1])
-            environment_state.calculate(new_kinematics.z)
+            last_timer, last_kinematics, last_steady_state = self.timer, new_kinematics, new_steady_state
+            end_phase, new_kinematics = self.determine_new_kinematics(last_kinematics, last_steady_state)
+            if not (math.isfinite(self.timer) and math.isfinite(new_kinematics.straight_tether_length) and
+                    math.isfinite(new_kinematics.elevation_angle)):
+                raise PhaseError("Kinematics of the new time point are not finite.")
+            self.calculate_environment(new_kinematics)
             if self.follow_wind:
                 new_kinematics.azimuth_angle += environment_state.downwind_direction
                 new_kinematics.update()
-
-            # Add new time, kinematics, and steady state to corresponding result lists.
             new_steady_state = self.determine_new_steady_state(new_kinematics)
-            self.time.append(self.timer)
-            self.kinematics.append(new_kinematics)
-            self.steady_states.append(new_steady_state)
+
+            if adaptive:
+                # Repeat the step from the last time point if its error exceeds the tolerance.
+                accept, self.time_step = self.adaptive_time_step(
+                    self.time_step, (last_steady_state.reeling_speed, new_steady_state.reeling_speed),
+                    (last_steady_state.elevation_rate, new_steady_state.elevation_rate),
+                    last_kinematics.straight_tether_length, self.time_step_tolerance, self.time_step_min,
+                    self.time_step_max)
+                self.time_step = float(self.time_step)
+                if not accept:
+                    self.timer, end_phase = last_timer, False
+                    new_kinematics, new_steady_state = last_kinematics, last_steady_state
+                    continue
+
+            # Add new time, kinematics, and steady state to the results.
+            self.columns.append(self.timer, new_kinematics, new_steady_state)
 
             self.n_time_points += 1
 
             if self.max_time_points is not None and self.n_time_points == self.max_time_points:
+                end_criteria = {a: getattr(self.position_end, a) for a in KitePosition.__slots__}
                 error_message = "Maximum of {} iterations reached in phase for {} setpoint: {} and " \
                                 "end criteria: {}.".format(self.max_time_points, self.control_settings[0],
-                                                           self.control_settings[1], self.position_end.__dict__)
+                                                           self.control_settings[1], end_criteria)
                 raise PhaseError(error_message, 1)
 
         # Processing resulting steady states to determine the phase performance.
-        self.energy = np.trapz([ss.power_ground for ss in self.steady_states], self.time)
+        self.energy = np.trapz(self.columns['power_ground'], self.time)
         self.duration = self.timer - timer_start
         if self.duration > 0:
             self.average_power = self.energy / self.duration
@@ -1322,24 +2120,67 @@ class Phase(TimeSeries):
         # print("Energy for comparison: ", simple_integration([s.power_ground for s in self.steady_states][:-1], self.time[:-1]))
         # print("{:.1f} seconds passed to reach, {:.0f}J energy produced.".format(self.timer-timer_start, self.energy))
 
+    def calculate_environment(self, kinematics):
+        """Evaluate the environment state at the height of the kite.
+
+        Args:
+            kinematics (`KiteKinematics`): Kinematics object of current time point.
+
+        Raises:
+            OperationalLimitViolation: If the height is invalid or yields a non-finite wind speed or air density.
+
+        """
+        env_state = self.environment_state
+        env_state.calculate(kinematics.z)
+        if not (math.isfinite(env_state.wind_speed) and math.isfinite(env_state.air_density)):
+            raise OperationalLimitViolation("Invalid height is given: {:.1f}.".format(kinematics.z))
+
+    @staticmethod
+    def adaptive_time_step(time_step, reeling_speed, elevation_rate, tether_length, tolerance, time_step_min,
+                           time_step_max):
+        """Estimate the error of the last time step and select the next time step. The error of the explicit update of
+        the kite position is estimated per step as its difference with the trapezoidal update, which uses the steady
+        state of the new time point that is evaluated anyway: half the change of the kite velocity times the time step.
+        The step is accepted if this error relative to the displacement is within the tolerance, or if the step does
+        not exceed the smallest time step. The next time step, or the time step with which a rejected step is repeated,
+        is scaled with the ratio of the tolerance and the error - at most doubling. As the error grows with the change
+        of the velocity, the steps shrink near switches of the control setting. Accepts scalars or arrays.
+
+        Args:
+            time_step (float or ndarray): Last time step [s], the step that ends the phase may be shorter.
+            reeling_speed (tuple): Reeling speeds at the start and end of the last time step [m/s].
+            elevation_rate (tuple): Elevation rates at the start and end of the last time step [rad/s].
+            tether_length (float or ndarray): Tether length at the start of the last time step [m].
+            tolerance (float or ndarray): Allowed error of the displacement relative to the displacement [-].
+            time_step_min (float or ndarray): Smallest time step [s].
+            time_step_max (float or ndarray): Largest time step [s].
+
+        Returns:
+            bool or ndarray: Flag(s) indicating whether the last time step is accepted.
+            float or ndarray: Next time step, or time step for repeating the last step [s].
+
+        """
+        speed = np.hypot(reeling_speed[0], tether_length*elevation_rate[0])
+        d_speed = np.hypot(reeling_speed[1] - reeling_speed[0], tether_length*(elevation_rate[1] - elevation_rate[0]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            error = np.where(d_speed > 0., .5*d_speed/speed, 0.)
+            scale = .9*tolerance/error
+        accept = (error <= tolerance) | (time_step <= time_step_min)
+        return accept, np.clip(np.fmin(scale, 2.)*time_step, time_step_min, time_step_max)
+
     def calc_operational_properties(self):
         """Calculate the operational properties of the phase."""
         # Calculate time averages.
-        self.average_reeling_factor = np.trapz([ss.reeling_factor for ss in self.steady_states],
-                                               self.time) / self.duration
-        self.average_reeling_speed = np.trapz([ss.reeling_speed for ss in self.steady_states],
-                                              self.time) / self.duration
-        self.average_tether_force_ground = np.trapz([ss.tether_force_ground for ss in self.steady_states],
-                                                    self.time) / self.duration
+        columns = self.columns
+        self.average_reeling_factor = np.trapz(columns['reeling_factor'], self.time) / self.duration
+        self.average_reeling_speed = np.trapz(columns['reeling_speed'], self.time) / self.duration
+        self.average_tether_force_ground = np.trapz(columns['tether_force_ground'], self.time) / self.duration
 
         # Calculate the length properties of the path covered by the kite.
-        self.path_length = 0
-        for kp0, kp1 in zip(self.kinematics[:-1], self.kinematics[1:]):
-            self.path_length += np.sqrt((kp1.x - kp0.x)**2 + (kp1.y - kp0.y)**2 + (kp1.z - kp0.z)**2)
-
-        kp0, kp1 = self.kinematics[0], self.kinematics[-1]
-        self.path_length_effective = np.sqrt((kp1.x - kp0.x)**2 + (kp1.y - kp0.y)**2 + (kp1.z - kp0.z)**2)
-        self.reeling_tether_length = kp1.straight_tether_length - kp0.straight_tether_length
+        x, y, z = columns['x'], columns['y'], columns['z']
+        self.path_length = np.sum(np.sqrt(np.diff(x)**2 + np.diff(y)**2 + np.diff(z)**2))
+        self.path_length_effective = np.sqrt((x[-1] - x[0])**2 + (y[-1] - y[0])**2 + (z[-1] - z[0])**2)
+        self.reeling_tether_length = columns['straight_tether_length'][-1] - columns['straight_tether_length'][0]
 
     def determine_new_kinematics(self, last_kinematics, last_steady_state):
         """Determine new kinematics based on kinematics and steady state of previous time point. Moreover, evaluate if
@@ -1356,6 +2197,25 @@ class Phase(TimeSeries):
         """
         pass
 
+    def seed_steady_state(self, steady_state):
+        """Seed the iterative procedures of a new steady state with the converged solutions of the previous time points,
+        if warm starting is enabled in the steady state configuration.
+
+        Args:
+            steady_state (`SteadyState`): Steady state of current time point that is yet to be solved.
+
+        """
+        columns = self.columns
+        if not steady_state.warm_start or not len(columns):
+            return
+        converged, kinematic_ratio = columns['converged'], columns['kinematic_ratio']
+        if converged[-1]:
+            steady_state.kinematic_ratio_start = kinematic_ratio[-1]
+            steady_state.angle_of_attack_start = columns.get('angle_of_attack', -1)
+            if len(columns) > 1 and converged[-2]:
+                # Linear extrapolation of the kinematic ratio of the two previous time points.
+                steady_state.kinematic_ratio_start = 2*kinematic_ratio[-1] - kinematic_ratio[-2]
+
     def determine_new_steady_state(self, kinematics):
         """Determine new steady state based on new kinematics and updated system properties and environment state.
 
@@ -1374,6 +2234,7 @@ class Phase(TimeSeries):
         # Instantiate new steady state using the primary control setting.
         new_state = SteadyState(self.steady_state_config)
         new_state.control_settings = self.control_settings[:2]
+        self.seed_steady_state(new_state)
 
         # Find steady state.
         temporary_suppress_steady_state_errors = False
@@ -1382,6 +2243,7 @@ class Phase(TimeSeries):
                 temporary_suppress_steady_state_errors = True
                 new_state.enable_steady_state_errors = False
         new_state.find_state(sys_props, env_state, kinematics)
+        self.n_iterations += new_state.n_iterations or 0
         if temporary_suppress_steady_state_errors:
             new_state.enable_steady_state_errors = True
 
@@ -1403,10 +2265,12 @@ class Phase(TimeSeries):
                 if max_force is not None and new_state.tether_force_ground > max_force:
                     new_state.control_settings = ('tether_force_ground', max_force)
                     new_state.find_state(sys_props, env_state, kinematics)
+                    self.n_iterations += new_state.n_iterations or 0
                 elif (min_force is not None and new_state.tether_force_ground < min_force) or \
                         (self.__class__.__name__ == "RetractionPhase" and new_state.error_code == 7):
                     new_state.control_settings = ('tether_force_ground', min_force)
                     new_state.find_state(sys_props, env_state, kinematics)
+                    self.n_iterations += new_state.n_iterations or 0
                 elif new_state.error_message is not None and temporary_suppress_steady_state_errors:
                     raise SteadyStateError(new_state.error_message, new_state.error_code)
             #TODO: find way to improve lower check
@@ -1427,7 +2291,9 @@ class Phase(TimeSeries):
                 if setpoint_speed is not None:
                     new_state = SteadyState(self.steady_state_config)
                     new_state.control_settings = ('reeling_speed', setpoint_speed)
+                    self.seed_steady_state(new_state)
                     new_state.find_state(sys_props, env_state, kinematics)
+                    self.n_iterations += new_state.n_iterations or 0
                 elif new_state.error_message is not None and temporary_suppress_steady_state_errors:
                     raise SteadyStateError(new_state.error_message, new_state.error_code)
 
@@ -1524,7 +2390,7 @@ class RetractionPhase(Phase):
             `KiteKinematics`: Kinematic state of the kite for the new time point.
 
         """
-        kin = copy(last_kinematics)
+        kin = last_kinematics.copy()
 
         # Determine the difference in tether length and elevation angle for regular time step.
         if not self.fix_tether_length:
@@ -1597,7 +2463,7 @@ class RetractionPhaseElevationStop(RetractionPhase):
             `KiteKinematics`: Kinematic state of the kite for the new time point.
 
         """
-        kin = copy(last_kinematics)
+        kin = last_kinematics.copy()
 
         # Determine the difference in tether length and elevation angle for regular time step.
         if not self.fix_tether_length:
@@ -1683,7 +2549,7 @@ class TransitionPhase(Phase):
             `KiteKinematics`: Kinematic state of the kite for the new time point.
 
         """
-        kin = copy(last_kinematics)
+        kin = last_kinematics.copy()
 
         # Determine the difference in tether length and elevation angle for regular time step.
         d_tether_length = last_steady_state.reeling_speed*self.time_step
@@ -1826,7 +2692,7 @@ class TractionPhase(Phase):
             `KiteKinematics`: Kinematic state of the kite for the new time point.
 
         """
-        kin = copy(last_kinematics)
+        kin = last_kinematics.copy()
 
         # Determine the difference in tether length for regular time step.
         d_tether_length = last_steady_state.reeling_speed * self.time_step
@@ -1868,6 +2734,7 @@ class TractionPhaseHybrid(TractionPhase):
         # State of kite along the cross-wind pattern.
         self.n_crosswind_patterns = 0.
 
+    @floating_point_errors('ignore')
     def run_simulation(self, system_properties, environment_state, steady_state_config={}, timer_start=0., n_patterns=6):
         # TODO: check what n_patterns needs to be
         super().run_simulation(system_properties, environment_state, steady_state_config, timer_start)
@@ -1879,7 +2746,7 @@ class TractionPhaseHybrid(TractionPhase):
         for le in tether_lengths:
             elev = self.elevation_angle.calculate(le)
             kin = KiteKinematics(le, self.azimuth_angle, elev, self.course_angle)
-            environment_state.calculate(kin.z)
+            self.calculate_environment(kin)
             rs = self.determine_new_steady_state(kin).reeling_speed
             pattern_settings = {
                 'tether_length': le,
@@ -1897,6 +2764,8 @@ class TractionPhaseHybrid(TractionPhase):
         avg_pattern_duration = np.mean(pattern_durations)
         phase_duration_aim = (self.tether_length_end - self.tether_length_start_aim)/np.mean(reeling_speeds)
         self.n_crosswind_patterns = phase_duration_aim/avg_pattern_duration
+        if not math.isfinite(self.n_crosswind_patterns):
+            raise PhaseError("Number of crosswind patterns is not finite.")
 
 
 class LissajousPattern:
@@ -1938,6 +2807,7 @@ class LissajousPattern:
 class LookupPattern:
     #TODO: check if different order filtering smoothens the results
     def __init__(self):
+        import pandas as pd
         self.lookup_table = pd.read_csv('flight_data/realistic_pattern.csv', sep=";")
         scale_factor = 1.
         self.lookup_table['azimuth'] = scale_factor * self.lookup_table['azimuth']
@@ -2003,7 +2873,7 @@ class TractionPhasePattern(Phase):
             `KiteKinematics`: Kinematic state of the kite for the new time point.
 
         """
-        kin = copy(last_kinematics)
+        kin = last_kinematics.copy()
 
         # Determine the difference in tether length for regular time step.
         d_tether_length = last_steady_state.reeling_speed * self.time_step
@@ -2054,10 +2924,8 @@ class EvaluatePattern(Phase):  # Determine performance along cross wind pattern
         self.tether_length = settings['tether_length']
         self.elevation_angle_ref = settings['elevation_angle_ref']
 
-        # Result lists with time and states.
-        self.kinematics = None
-        self.steady_states = None
-        self.time = None
+        # Results with time and states.
+        self.columns = TimeSeriesColumns()
         self.s = None
 
         # Side conditions.
@@ -2077,14 +2945,16 @@ class EvaluatePattern(Phase):  # Determine performance along cross wind pattern
         self.max_reeling_speed = -np.inf
         self.min_tether_force = np.inf  # Forces at ground station.
         self.max_tether_force = -np.inf
+        self.n_iterations = 0
 
         # Monitoring settings.
         self.enable_limit_violation_error = True
         self.pattern = LissajousPattern()
 
     def calc_performance_along_pattern(self, system_properties, environment_state, n_points=100, steady_state_config={}, print_details=False):
-        self.time, self.kinematics, self.steady_states = [0.], [], []
+        self.columns = TimeSeriesColumns(n_points)
         self.min_reeling_speed, self.max_reeling_speed = np.inf, -np.inf
+        self.n_iterations = 0
         self.s = np.linspace(0, 1, n_points)
         ds = self.s[1]
 
@@ -2095,19 +2965,19 @@ class EvaluatePattern(Phase):  # Determine performance along cross wind pattern
         pattern_length = self.pattern.curve_length_unit_sphere * self.tether_length
         cos_phi, cos_beta, cos_chi = [], [], []
         valid_pattern = True
+        next_time = 0.
         for s in self.s:
             beta, phi, chi = self.pattern.get_properties_along_curve(s)[:3]
 
             kin = KiteKinematics(self.tether_length, phi, self.elevation_angle_ref + beta, chi)
-            self.kinematics.append(kin)
 
-            # Add first time point, kite kinematics, and steady state to corresponding result lists.
+            # Add time point, kite kinematics, and steady state to the results.
             environment_state.calculate(kin.z)
             if self.follow_wind:
                 kin.azimuth_angle += environment_state.downwind_direction
                 kin.update()
             ss = self.determine_new_steady_state(kin)
-            self.steady_states.append(ss)
+            self.columns.append(next_time, kin, ss)
 
             cos_phi.append(np.cos(kin.azimuth_angle))
             cos_beta.append(np.cos(kin.elevation_angle))
@@ -2121,8 +2991,6 @@ class EvaluatePattern(Phase):  # Determine performance along cross wind pattern
                     valid_pattern = False
                 next_time = self.time[-1] + dt
 
-                self.time.append(next_time)
-
         # if valid_pattern:
         pattern_duration = self.time[-1]
         # else:
@@ -2138,7 +3006,7 @@ class EvaluatePattern(Phase):  # Determine performance along cross wind pattern
                     i_end = n_points
                 else:
                     i_end += n_points//4
-                course_angles = [kin.course_angle for kin in self.kinematics[i_start:i_end]]
+                course_angles = self.columns['course_angle'][i_start:i_end]
                 time_window = self.time[i_start:i_end]
                 if i <= 1:
                     course_angles = course_angles[::-1]
@@ -2169,9 +3037,9 @@ class EvaluatePattern(Phase):  # Determine performance along cross wind pattern
         plot_traces(x[0], data_sources, source_labels, plot_parameters, y_labels, y_scaling, x_label=x[1])
 
     def plot_pattern(self):
+        import matplotlib.pyplot as plt
         plt.figure()
-        plt.plot([kin.azimuth_angle*180./np.pi for kin in self.kinematics],
-                 [kin.elevation_angle*180./np.pi for kin in self.kinematics])
+        plt.plot(self.columns['azimuth_angle']*180./np.pi, self.columns['elevation_angle']*180./np.pi)
         kin = self.kinematics[5]
         plt.plot([kin.azimuth_angle*180./np.pi], [kin.elevation_angle*180./np.pi], 's')
 
@@ -2181,6 +3049,11 @@ class Cycle(TimeSeries):
     cycle. Inherits from `TimeSeries`. The retraction phase is simulated first and the traction phase last. The results
     are however manipulated such that the cycle starts with the traction phase.
 
+    With adaptive time stepping, the tolerances of the phases hold the relative errors of the phase energies and
+    durations. The energy of the cycle is the difference of the much larger energies of the traction and retraction
+    phase at low wind speeds, such that its relative error may exceed the tolerance by the ratio of the sum of the
+    absolute phase energies and the cycle energy.
+
     Attributes:
         tether_length_start_retraction (float): Tether length [m] at the start of the retraction phase.
         tether_length_end_retraction (float): Tether length [m] at the end of the retraction phase.
@@ -2190,6 +3063,7 @@ class Cycle(TimeSeries):
         traction_phase (`TractionPhase`): Traction phase simulation object.
         follow_wind (bool): Specifies whether kite is 'aligned' with the wind. Controlled azimuth angle is expressed
             w.r.t. wind reference frame if True, or ground reference frame if False.
+        phase_id (ndarray): Phase of each time point: 0 for retraction, 1 for transition, and 2 for traction.
 
     """
     def __init__(self, settings=None, impose_operational_limits=True):
@@ -2236,7 +3110,9 @@ class Cycle(TimeSeries):
 
         self.duty_cycle = None
         self.pumping_efficiency = None
+        self.phase_id = np.zeros(0, dtype=int)
 
+    @floating_point_errors('ignore')
     def run_simulation(self, system_properties, environment_state, steady_state_config={},
                        enable_limit_violation_error=False, print_summary=False):
         """Consecutively run the simulations of the 3 phases.
@@ -2275,7 +3151,7 @@ class Cycle(TimeSeries):
 
         try:
             retr.run_simulation(system_properties, env_retr, steady_state_config, 0.)
-            last_straight_tether_length = retr.kinematics[-1].straight_tether_length
+            last_straight_tether_length = retr.columns['straight_tether_length'][-1]
         except PhaseError as e:
             if e.code not in [1, 3]:  # Simulation does not seem to reach end criteria.
                 raise
@@ -2283,7 +3159,7 @@ class Cycle(TimeSeries):
             last_straight_tether_length = self.tether_length_end_retraction
             retr.duration = 100.
             error_in_phase = "retraction"
-        last_kinematics = retr.kinematics[-1]
+        last_elevation_angle = retr.columns['elevation_angle'][-1]
         last_time = retr.time[-1]
 
         # Second, run the transition phase.
@@ -2293,7 +3169,7 @@ class Cycle(TimeSeries):
 
         # Set start and stop conditions of transition phase.
         trans.tether_length_start = last_straight_tether_length
-        trans.elevation_angle_start = last_kinematics.elevation_angle
+        trans.elevation_angle_start = last_elevation_angle
         trans.elevation_angle_end = self.elevation_angle_traction
         trans.finalize_start_and_end_kite_obj()
 
@@ -2302,7 +3178,6 @@ class Cycle(TimeSeries):
         else:
             timer_start = last_time
         trans.run_simulation(system_properties, env_trans, steady_state_config, timer_start)
-        last_kinematics = trans.kinematics[-1]
         last_time = trans.time[-1]
         # trans.average_power = 0
         # trans.energy = 0
@@ -2318,7 +3193,7 @@ class Cycle(TimeSeries):
             trac.tether_length_start_aim = self.tether_length_end_retraction
         trac.elevation_angle = TractionConstantElevation(self.elevation_angle_traction)
         if self.tether_length_start_traction is None:
-            trac.tether_length_start = last_kinematics.straight_tether_length
+            trac.tether_length_start = trans.columns['straight_tether_length'][-1]
         else:
             trac.tether_length_start = self.tether_length_start_traction
         trac.tether_length_end = self.tether_length_start_retraction
@@ -2336,13 +3211,12 @@ class Cycle(TimeSeries):
 
         # Resulting time series
         if reorder:
-            self.time = trans.time + trac.time + [t + last_time for t in retr.time]
-            self.kinematics = trans.kinematics + trac.kinematics + retr.kinematics
-            self.steady_states = trans.steady_states + trac.steady_states + retr.steady_states
+            self.columns = TimeSeriesColumns.concatenate([trans.columns, trac.columns, retr.columns],
+                                                         [0., 0., last_time])
+            self.phase_id = np.repeat([1, 2, 0], [len(trans.columns), len(trac.columns), len(retr.columns)])
         else:
-            self.time = retr.time + trans.time + trac.time
-            self.kinematics = retr.kinematics + trans.kinematics + trac.kinematics
-            self.steady_states = retr.steady_states + trans.steady_states + trac.steady_states
+            self.columns = TimeSeriesColumns.concatenate([retr.columns, trans.columns, trac.columns])
+            self.phase_id = np.repeat([0, 1, 2], [len(retr.columns), len(trans.columns), len(trac.columns)])
         self.energy = trac.energy + retr.energy
         if self.include_transition_energy:
             self.energy += trans.energy
@@ -2355,12 +3229,12 @@ class Cycle(TimeSeries):
             print("Retraction power: {:.1f}W".format(retr.average_power))
             print("Transition power: {:.1f}W".format(trans.average_power))
             print("Traction power: {:.1f}W".format(trac.average_power))
+            print("Steady state iterations: {} (retraction: {}, transition: {}, traction: {})".format(
+                retr.n_iterations + trans.n_iterations + trac.n_iterations, retr.n_iterations, trans.n_iterations,
+                trac.n_iterations))
 
         self.duty_cycle = trac.duration/self.duration
-        try:
-            self.pumping_efficiency = self.energy/trac.energy
-        except FloatingPointError:
-            self.pumping_efficiency = 0.
+        self.pumping_efficiency = self.energy/trac.energy if trac.energy != 0. else 0.
 
         return error_in_phase, self.time[-1], self.average_power, trac.average_power, retr.average_power
 
@@ -2371,6 +3245,7 @@ class Cycle(TimeSeries):
             fig_num (int, optional): Number of figure used for the plot, if None a new figure is created.
 
         """
+        import matplotlib.pyplot as plt
         if fig_num is None:
             plt.figure()
         fig_num = plt.gcf().number
@@ -2380,26 +3255,513 @@ class Cycle(TimeSeries):
         self.traction_phase.trajectory_plot3d(fig_num=fig_num, animation=False, plot_kwargs=plot_kwargs)
 
     def get_maxforce(self):
-        force = 0.
-        for state in self.traction_phase.steady_states:
-            if state.tether_force_ground > force:
-                force = state.tether_force_ground
-        return force
+        return np.nanmax(self.traction_phase.columns['tether_force_ground'], initial=0.)
 
     def get_max_reeling_speeds(self):
-        traction_reeling_speed = 0.
-        for state in self.traction_phase.steady_states:
-            if state.reeling_speed > traction_reeling_speed:
-                traction_reeling_speed = state.reeling_speed
-            
-        retraction_reeling_speed = 0.
-        for state in self.retraction_phase.steady_states:
-            if state.reeling_speed < retraction_reeling_speed:
-                retraction_reeling_speed = state.reeling_speed
-
+        traction_reeling_speed = np.nanmax(self.traction_phase.columns['reeling_speed'], initial=0.)
+        retraction_reeling_speed = np.nanmin(self.retraction_phase.columns['reeling_speed'], initial=0.)
         return traction_reeling_speed, -retraction_reeling_speed
 
+class CycleBatch(Cycle):
+    """Batch counterpart of `Cycle`: simulates the pumping cycles of a collection of members, e.g. different wind
+    speeds, sites, or kites, simultaneously. The members advance through the phases independently, while the steady
+    states of all members are solved together per time point using `SteadyStateBatch`. Only the idealized
+    `RetractionPhase`, `TransitionPhase`, and `TractionPhase` trajectories are supported. Inherits from `Cycle`, of which
+    the settings and phase objects are used for configuring the simulation.
+
+    Attributes:
+        n_members (int): Number of simulated members.
+        results (list): Per member, a dictionary with the time series of the `RESULT_FIELDS` as arrays, or None if the
+            simulation of the member failed.
+        errors (list): Per member, the exception that made its simulation fail or None.
+        error_in_phase (list): Per member, the phase for which the simulation does not seem to reach end criteria:
+            'retraction', 'traction', or None.
+        energy (ndarray): Energy produced during the cycles [J].
+        duration (ndarray): Durations of the cycles [s].
+        average_power (ndarray): Time averages of the produced power [W].
+        duty_cycle (ndarray): Ratios of the traction phase and cycle durations [-].
+        pumping_efficiency (ndarray): Ratios of the cycle and traction phase energies [-].
+        phase_energy (dict): Energy [J] per member for each of the phases.
+        phase_duration (dict): Duration [s] per member for each of the phases.
+        phase_average_power (dict): Average power [W] per member for each of the phases.
+        n_iterations (ndarray): Total number of iterations used for finding the steady states of the members.
+
+    """
+    PHASES = ('retraction', 'transition', 'traction')
+    KINEMATICS_FIELDS = ('straight_tether_length', 'azimuth_angle', 'elevation_angle', 'course_angle', 'x', 'y', 'z')
+    STEADY_STATE_FIELDS = ('reeling_factor', 'kinematic_ratio', 'tangential_speed_factor', 'wind_speed',
+                           'apparent_wind_speed', 'heading', 'inflow_angle', 'lift_to_drag', 'aerodynamic_force',
+                           'tether_force_kite', 'tether_force_ground', 'power_ground', 'kite_speed',
+                           'kite_tangential_speed', 'reeling_speed', 'elevation_rate', 'azimuth_rate',
+                           'lift_to_drag_error', 'n_iterations', 'converged', 'error_code',
+                           'tether_force_max_limit_violated', 'tether_force_min_limit_violated')
+    RESULT_FIELDS = ('time', 'phase_id') + KINEMATICS_FIELDS + STEADY_STATE_FIELDS
+
+    def __init__(self, settings=None, impose_operational_limits=True):
+        """
+        Args:
+            settings (dict, optional): Cycle settings, see `Cycle`. The time steps of the phases can be given per
+                member.
+            impose_operational_limits (bool, optional): Setting `impose_operational_limits` attribute of retraction and
+                traction phase.
+
+        """
+        super().__init__(settings, impose_operational_limits)
+        if self.traction_phase.__class__ is not TractionPhase:
+            raise ValueError("Only the TractionPhase is supported for batch simulation.")
+        if self.follow_wind:
+            raise ValueError("Following the wind is not supported for batch simulation.")
+
+        self.n_members = None
+        self.results = None
+        self.errors = None
+        self.error_in_phase = None
+        self.phase_energy = None
+        self.phase_duration = None
+        self.phase_average_power = None
+        self.n_iterations = None
+
+        # Simulation state.
+        self._system_properties = None
+        self._environment_states = None
+        self._log_profile_arrays = None
+        self._steady_state_config = None
+        self._raise_steady_state_errors = True
+        self._records = None
+
+    @property
+    def time(self):
+        """list: Per member, the time points [s] or None if the simulation of the member failed."""
+        if self.results is None:
+            return None
+        return [None if res is None else res['time'] for res in self.results]
+
+    @floating_point_errors('ignore')
+    def run_simulation(self, system_properties, environment_states, steady_state_config={},
+                       enable_limit_violation_error=False, print_summary=False):
+        """Run the 3 phases for all members. A member of which the simulation fails does not affect the others: the
+        exception is stored in `errors` instead of being raised.
+
+        Args:
+            system_properties (`SystemProperties` or list): Collection of system properties, or a sequence of such
+                collections - one per member.
+            environment_states (list): Specification of environment per member, e.g. `LogProfile` objects with
+                different reference wind speeds.
+            steady_state_config (dict, optional): Iterative procedure settings for finding the steady state.
+            enable_limit_violation_error (bool, optional): Flag specifying whether to raise an error when the reeling
+                speed or tether force limit is violated in retraction and traction phase.
+            print_summary (bool, optional): Print cycle performance summaries to screen if True.
+
+        Returns:
+            list: Per member, the output of `Cycle.run_simulation` or None if the simulation of the member failed.
+
+        """
+        n = len(environment_states)
+        self.n_members = n
+        self._system_properties = system_properties
+        self._environment_states = environment_states
+        self._steady_state_config = dict(steady_state_config)
+        self._raise_steady_state_errors = self._steady_state_config.get('enable_steady_state_errors', True)
+        self._steady_state_config['enable_steady_state_errors'] = False
+
+        # The environments are evaluated as arrays if all members use a logarithmic wind profile.
+        if all(env.__class__ is LogProfile for env in environment_states):
+            self._log_profile_arrays = {key: np.array([getattr(env, key) for env in environment_states], dtype=float)
+                                        for key in ('wind_speed_ref', 'h_ref', 'h_0', 'altitude_ground', 'rho_0',
+                                                    'h_p')}
+        else:
+            self._log_profile_arrays = None
+
+        self.retraction_phase.enable_limit_violation_error = enable_limit_violation_error
+        self.transition_phase.enable_limit_violation_error = False
+        self.traction_phase.enable_limit_violation_error = enable_limit_violation_error
+
+        self._run_phases()
+
+        # Resulting time series.
+        self._collect_results()
+        self.energy = self.phase_energy['traction'] + self.phase_energy['retraction']
+        if self.include_transition_energy:
+            self.energy = self.energy + self.phase_energy['transition']
+        self.duration = np.array([res['time'][-1] if res is not None else np.nan for res in self.results])
+        self.average_power = self.energy / self.duration
+        self.duty_cycle = self.phase_duration['traction'] / self.duration
+        self.pumping_efficiency = np.where(self.phase_energy['traction'] != 0.,
+                                           self.energy / self.phase_energy['traction'], 0.)
+
+        outputs = []
+        for i in range(n):
+            if self.results[i] is None:
+                outputs.append(None)
+                continue
+            outputs.append((self.error_in_phase[i], self.duration[i], self.average_power[i],
+                            self.phase_average_power['traction'][i], self.phase_average_power['retraction'][i]))
+            if print_summary:
+                print("Member {}: {:.1f} seconds in which {:.0f}J energy produced, mean cycle power: {:.1f}W, {} steady "
+                      "state iterations.".format(i, self.duration[i], self.energy[i], self.average_power[i],
+                                                 self.n_iterations[i]))
+        return outputs
+
+    def _fail(self, members, exception_class, message, codes=None):
+        """Mark members as failed with the exception that `Cycle.run_simulation` would have raised."""
+        for j, i in enumerate(members):
+            if self.errors[i] is None:
+                if codes is None:
+                    self.errors[i] = exception_class(message, 0)
+                else:
+                    code = int(codes[j])
+                    self.errors[i] = exception_class(SteadyStateBatch.ERROR_MESSAGES.get(code, message), code)
+
+    def _system_properties_subset(self, idx):
+        if isinstance(self._system_properties, (list, tuple)):
+            return [self._system_properties[i] for i in idx]
+        return self._system_properties
+
+    def _reeling_speed_limits(self, idx):
+        names = ('reeling_speed_min_limit', 'reeling_speed_max_limit')
+        if isinstance(self._system_properties, (list, tuple)):
+            return tuple(np.array([getattr(self._system_properties[i], name) for i in idx], dtype=float)
+                         for name in names)
+        return tuple(np.full(len(idx), float(getattr(self._system_properties, name))) for name in names)
+
+    def _calculate_environments(self, idx, heights):
+        """Evaluate the wind speed and air density at the given heights for a subset of the members.
+
+        Returns:
+            tuple: Wind speed and air density arrays, and a mask of invalid heights: negative or yielding a non-finite
+                wind speed or air density.
+
+        """
+        invalid = ~(heights >= 0.)
+        if self._log_profile_arrays is not None:
+            env = {key: val[idx] for key, val in self._log_profile_arrays.items()}
+            wind_speed = np.where(heights == 0., 0., env['wind_speed_ref'] * np.log(heights / env['h_0']) /
+                                  np.log(env['h_ref'] / env['h_0']))
+            air_density = env['rho_0']*np.exp(-(heights + env['altitude_ground'])/env['h_p'])
+            return wind_speed, air_density, invalid | ~(np.isfinite(wind_speed) & np.isfinite(air_density))
+
+        wind_speed, air_density = np.zeros(len(idx)), np.zeros(len(idx))
+        for j, (i, h) in enumerate(zip(idx, heights)):
+            env = self._environment_states[i]
+            try:
+                env.calculate(h)
+            except OperationalLimitViolation:
+                invalid[j] = True
+                continue
+            wind_speed[j], air_density[j] = env.wind_speed, env.air_density
+        return wind_speed, air_density, invalid | ~(np.isfinite(wind_speed) & np.isfinite(air_density))
+
+    def _solve_steady_states(self, idx, kin, kite_powered, control_parameter, setpoint):
+        sys_props = self._system_properties_subset(idx)
+        wind_speed, air_density = kin['wind_speed'], kin['air_density']
+        if np.all(control_parameter == control_parameter[0]):
+            control_parameter = control_parameter[0]
+        state = SteadyStateBatch(self._steady_state_config)
+        state.control_settings = (control_parameter, setpoint)
+        state.kinematic_ratio_start = kin.get('kinematic_ratio_start', None)
+        state.find_state(sys_props, kin['straight_tether_length'], kin['elevation_angle'], kin['azimuth_angle'],
+                         kin['course_angle'], wind_speed, air_density, kite_powered)
+        self.n_iterations[idx] += state.n_iterations
+        return {f: getattr(state, f) for f in self.STEADY_STATE_FIELDS}
+
+    def _determine_new_steady_states(self, idx, phase_ids, kin):
+        """Vectorized counterpart of `Phase.determine_new_steady_state`, including the switching of the control setting
+        when operational limits are imposed. Members for which `Phase.determine_new_steady_state` raises an error are
+        marked as failed.
+
+        Args:
+            idx (ndarray): Indices of the members.
+            phase_ids (ndarray): Index of the current phase of the members.
+            kin (dict): Kinematics arrays of the members.
+
+        Returns:
+            dict: Steady state arrays of `STEADY_STATE_FIELDS` and the used control setting: 'control_mode' is 0 for
+                the primary setting, and 1-4 after switching to the maximum force, minimum force, maximum speed, or
+                minimum speed limit, respectively.
+            ndarray: Mask indicating failed members.
+
+        """
+        phases = (self.retraction_phase, self.transition_phase, self.traction_phase)
+        r = kin['straight_tether_length']
+        is_retraction, is_transition = phase_ids == 0, phase_ids == 1
+        control_parameter = np.array([p.control_settings[0] for p in phases])[phase_ids]
+        setpoint = np.array([np.nan if p.control_settings[1] is None else p.control_settings[1]
+                             for p in phases], dtype=float)[phase_ids]
+        kite_powered = np.array([p.kite_powered for p in phases])[phase_ids]
+        impose = np.array([p.impose_operational_limits for p in phases])[phase_ids]
+        speed_controlled = np.array(['tether_force' not in p.control_settings[0] for p in phases])[phase_ids]
+
+        kin['wind_speed'], kin['air_density'], failed = self._calculate_environments(idx, kin['z'])
+        self._fail(idx[failed], OperationalLimitViolation, "Invalid height is given.")
+        ss = self._solve_steady_states(idx, kin, kite_powered, control_parameter, setpoint)
+        error_code = ss['error_code']
+
+        # Operational limits.
+        props = SteadyStateBatch.system_property_arrays(self._system_properties_subset(idx), r)
+        min_force = np.broadcast_to(props['tether_force_min_limit'], r.shape).copy()
+        max_force = np.broadcast_to(props['tether_force_max_limit'], r.shape).copy()
+        for i, p in enumerate(phases):
+            if 'tether_force' not in p.control_settings[0] and len(p.control_settings) == 4:
+                min_force[phase_ids == i] = np.nan if p.control_settings[2] is None else p.control_settings[2]
+                max_force[phase_ids == i] = np.nan if p.control_settings[3] is None else p.control_settings[3]
+        min_speed, max_speed = self._reeling_speed_limits(idx)
+
+        # When operational limits are imposed, evaluate if the primary control setting yield limit violations.
+        force = ss['tether_force_ground']
+        too_high_force = impose & speed_controlled & (force > max_force)
+        too_low_force = impose & speed_controlled & ~too_high_force & ((force < min_force) |
+                                                                       (is_retraction & (error_code == 7)))
+        speed = np.abs(ss['reeling_speed'])
+        speed_limited = impose & ~speed_controlled & ~is_transition
+        too_high_speed = speed_limited & (speed > max_speed)
+        too_low_speed = speed_limited & ~too_high_speed & (speed < min_speed)
+        force_switch = too_high_force | too_low_force
+        switch = force_switch | too_high_speed | too_low_speed
+        control_mode = np.select([too_high_force, too_low_force, too_high_speed, too_low_speed], [1, 2, 3, 4], 0)
+
+        if self._raise_steady_state_errors:
+            raise_error = ~switch & (error_code != -1) & ~(impose & ~speed_controlled & is_transition) & ~failed
+            self._fail(idx[raise_error], SteadyStateError, None, error_code[raise_error])
+            failed |= raise_error
+
+        if np.any(switch):
+            switched_setpoint = np.where(too_high_force, max_force, np.where(
+                too_low_force, min_force, np.where(is_retraction, -1., 1.)*np.where(too_high_speed, max_speed,
+                                                                                     min_speed)))
+            switched_parameter = np.where(force_switch, 'tether_force_ground', 'reeling_speed')
+            sub_kin = {key: val[switch] for key, val in kin.items()}
+            ss_switched = self._solve_steady_states(idx[switch], sub_kin, kite_powered[switch],
+                                                    switched_parameter[switch], switched_setpoint[switch])
+            for f in self.STEADY_STATE_FIELDS:
+                ss[f] = ss[f].copy()
+                if 'limit_violated' in f:
+                    # The scalar procedure reuses the steady state object when switching to force control, such that
+                    # the limit violation flags of the first evaluation are preserved.
+                    ss[f][switch & ~force_switch] = ss_switched[f][~force_switch[switch]]
+                else:
+                    ss[f][switch] = ss_switched[f]
+            if self._raise_steady_state_errors:
+                raise_error = switch & (ss['error_code'] != -1) & ~failed
+                self._fail(idx[raise_error], SteadyStateError, None, ss['error_code'][raise_error])
+                failed |= raise_error
+
+        # Check for limit violations.
+        check_limits = np.array([p.enable_limit_violation_error for p in phases])[phase_ids]
+        if np.any(check_limits):
+            speed, force = np.abs(ss['reeling_speed']), ss['tether_force_ground']
+            violation = (speed > max_speed + 1e-3) | (speed < min_speed - 1e-3) | (force > max_force + 1e-3) | \
+                (force < min_force - 1e-3)
+            violation &= check_limits & ~failed
+            self._fail(idx[violation], OperationalLimitViolation, "Operational limit is violated.")
+            failed |= violation
+
+        ss['control_mode'] = control_mode
+        return ss, failed
+
+    def _run_phases(self):
+        """Counterpart of running `Phase.run_simulation` consecutively for the retraction, transition, and traction
+        phase as done in `Cycle.run_simulation`. Each loop iteration adds a time point for all unfinished members,
+        which either start a new phase or advance in their current phase."""
+        n = self.n_members
+        self.errors = [None]*n
+        self.error_in_phase = [None]*n
+        self._records = []
+        self.phase_energy = {p: np.full(n, np.nan) for p in self.PHASES}
+        self.phase_duration = {p: np.full(n, np.nan) for p in self.PHASES}
+        self.phase_average_power = {p: np.full(n, np.nan) for p in self.PHASES}
+        self.n_iterations = np.zeros(n, dtype=int)
+
+        phases = (self.retraction_phase, self.transition_phase, self.traction_phase)
+        time_step = np.array([np.broadcast_to(np.asarray(p.time_step_min if p.time_step_tolerance is not None else
+                                                         p.time_step, dtype=float), (n,)) for p in phases])
+        time_step_max = np.array([np.broadcast_to(np.asarray(p.time_step_max, dtype=float), (n,)) for p in phases])
+        time_step_tolerance = np.array([np.broadcast_to(np.asarray(np.nan if p.time_step_tolerance is None else
+                                                                   p.time_step_tolerance, dtype=float), (n,))
+                                        for p in phases])
+        azimuth_angle = np.array([RetractionPhase.AZIMUTH_ANGLE, TransitionPhase.AZIMUTH_ANGLE,
+                                  self.traction_phase.azimuth_angle])
+        course_angle = np.array([RetractionPhase.COURSE_ANGLE, TransitionPhase.COURSE_ANGLE,
+                                 self.traction_phase.course_angle])
+        # Phase ending criteria: tether length, elevation angle, and tether length, respectively.
+        phase_end = np.array([self.tether_length_end_retraction, self.elevation_angle_traction,
+                              self.tether_length_start_retraction], dtype=float)
+
+        # State of the members.
+        phase_id = np.zeros(n, dtype=int)  # Equals 3 for completed cycles.
+        starting = np.ones(n, dtype=bool)
+        timer = np.zeros(n)
+        tether_length = np.full(n, float(self.tether_length_start_retraction))
+        elevation_angle = np.full(n, float(self.elevation_angle_traction))
+        timer_start, energy, n_time_points = np.zeros(n), np.zeros(n), np.zeros(n, dtype=int)
+        last_time, last_power = np.zeros(n), np.zeros(n)
+        last_tether_length, last_elevation_angle = np.zeros(n), np.zeros(n)
+        last_reeling_speed, last_elevation_rate = np.zeros(n), np.zeros(n)
+        next_time_step = np.zeros(n)  # Time step of the next time point with adaptive time stepping.
+        last_kinematic_ratio, previous_kinematic_ratio = np.full(n, np.nan), np.full(n, np.nan)
+        warm_start = self._steady_state_config.get('warm_start', False)
+
+        def finish_phase(members, phase_error=None):
+            for i in members:
+                name = self.PHASES[phase_id[i]]
+                if phase_error is None:
+                    duration = timer[i] - timer_start[i]
+                    self.phase_energy[name][i] = energy[i]
+                    self.phase_duration[name][i] = duration
+                    self.phase_average_power[name][i] = energy[i] / duration if duration > 0 else 0
+                elif name == 'retraction' and phase_error in [1, 3]:
+                    self.phase_energy[name][i] = -1e8
+                    self.phase_duration[name][i] = 100.
+                    tether_length[i] = self.tether_length_end_retraction
+                    self.error_in_phase[i] = name
+                elif name == 'traction' and phase_error in [1, 2]:
+                    self.phase_energy[name][i] = -1e2
+                    self.phase_duration[name][i] = 1.
+                    self.error_in_phase[i] = name
+                elif phase_error == 1:
+                    self._fail([i], PhaseError, "Maximum of time points reached in {} phase.".format(name))
+                else:
+                    self._fail([i], PhaseError, "Reeling speed too low.")
+            phase_id[members] += 1
+            starting[members] = True
+
+        while True:
+            active = np.flatnonzero((phase_id < 3) & np.array([e is None for e in self.errors]))
+            if not active.size:
+                break
+
+            # Determine the kinematics for the new time point and evaluate the phase ending criteria of the members
+            # proceeding in their phase.
+            proceeding = active[~starting[active]]
+            ph = phase_id[proceeding]
+            is_retraction, is_transition, is_traction = ph == 0, ph == 1, ph == 2
+            r, el = tether_length[proceeding], elevation_angle[proceeding]
+            reeling_speed, elevation_rate = last_reeling_speed[proceeding], last_elevation_rate[proceeding]
+            dt = np.where(np.isnan(time_step_tolerance[ph, proceeding]), time_step[ph, proceeding],
+                          next_time_step[proceeding])
+            d_tether_length, d_elevation = reeling_speed*dt, elevation_rate*dt
+
+            phase_error = np.full(len(proceeding), -1)
+            phase_error[is_retraction & (d_elevation < 1e-4) & (d_tether_length > 0.)] = 3
+            phase_error[is_traction & (d_tether_length < 0.)] = 2
+            phase_error[is_traction & ~(d_tether_length < 0.) & (reeling_speed < 1e-6)] = 0
+            for code in [0, 2, 3]:
+                finish_phase(proceeding[phase_error == code], code)
+            ok = phase_error == -1
+            proceeding, ph, r, el, reeling_speed, elevation_rate, dt, d_tether_length, d_elevation, is_transition, \
+                is_traction = [x[ok] for x in (proceeding, ph, r, el, reeling_speed, elevation_rate, dt,
+                                               d_tether_length, d_elevation, is_transition, is_traction)]
+
+            position, d_position = np.where(is_transition, el, r), np.where(is_transition, d_elevation,
+                                                                             d_tether_length)
+            end = phase_end[ph]
+            end_phase = ~np.where(is_traction, position + d_position < end, position + d_position > end)
+            reduced_time_step = (end - position)/np.where(is_transition, elevation_rate, reeling_speed)
+            step = np.where(end_phase, reduced_time_step, dt)
+            timer[proceeding] += step
+            tether_length[proceeding] = np.where(end_phase & ~is_transition, r + (end - r), r + reeling_speed*step)
+            elevation_angle[proceeding] = np.where(is_traction, self.elevation_angle_traction,
+                                                   np.where(end_phase & is_transition, el + (end - el),
+                                                            el + elevation_rate*step))
+            not_finite = ~(np.isfinite(timer[proceeding]) & np.isfinite(tether_length[proceeding]) &
+                           np.isfinite(elevation_angle[proceeding]))
+            self._fail(proceeding[not_finite], PhaseError, "Kinematics of the new time point are not finite.")
+            end_phase_proceeding = np.zeros(n, dtype=bool)
+            end_phase_proceeding[proceeding] = end_phase
+
+            # Set the initial state of the members starting a phase.
+            active = np.flatnonzero((phase_id < 3) & np.array([e is None for e in self.errors]))
+            if not active.size:
+                break
+            new_phase = active[starting[active]]
+            starting_traction = new_phase[phase_id[new_phase] == 2]
+            if self.tether_length_start_traction is not None:
+                tether_length[starting_traction] = self.tether_length_start_traction
+            elevation_angle[starting_traction] = self.elevation_angle_traction
+            timer_start[new_phase], energy[new_phase], n_time_points[new_phase] = timer[new_phase], 0., 0
+            next_time_step[new_phase] = time_step[phase_id[new_phase], new_phase]
+
+            # Add new time, kinematics, and steady state.
+            ph = phase_id[active]
+            r, el = tether_length[active], elevation_angle[active]
+            az, chi = azimuth_angle[ph], course_angle[ph]
+            kin = {
+                'straight_tether_length': r, 'azimuth_angle': az, 'elevation_angle': el, 'course_angle': chi,
+                'x': np.cos(el)*np.cos(az)*r, 'y': np.cos(el)*np.sin(az)*r, 'z': np.sin(el)*r,
+            }
+            if warm_start:
+                # Seed the iterative procedure with the converged solutions of the previous time points in the phase,
+                # see `Phase.seed_steady_state`.
+                k0, k1 = previous_kinematic_ratio[active], last_kinematic_ratio[active]
+                kin['kinematic_ratio_start'] = np.where(starting[active], np.nan,
+                                                        np.where(np.isnan(k0), k1, 2*k1 - k0))
+            ss, failed = self._determine_new_steady_states(active, ph, kin)
+            ok = ~failed
+            active, ph = active[ok], ph[ok]
+            record = {'member': active, 'time': timer[active], 'phase_id': ph}
+            record.update({key: kin[key][ok] for key in self.KINEMATICS_FIELDS})
+            record.update({key: val[ok] for key, val in ss.items()})
+
+            # Repeat the steps of which the error exceeds the tolerance from the last time point, see
+            # `Phase.adaptive_time_step`.
+            proceeding = np.flatnonzero(~starting[active])
+            tolerance = time_step_tolerance[ph[proceeding], active[proceeding]]
+            adaptive = proceeding[~np.isnan(tolerance)]
+            if adaptive.size:
+                m, ph_m = active[adaptive], ph[adaptive]
+                accept, next_time_step[m] = Phase.adaptive_time_step(
+                    next_time_step[m], (last_reeling_speed[m], record['reeling_speed'][adaptive]),
+                    (last_elevation_rate[m], record['elevation_rate'][adaptive]), last_tether_length[m],
+                    time_step_tolerance[ph_m, m], time_step[ph_m, m], time_step_max[ph_m, m])
+                rejected = m[~accept]
+                if rejected.size:
+                    timer[rejected], tether_length[rejected] = last_time[rejected], last_tether_length[rejected]
+                    elevation_angle[rejected] = last_elevation_angle[rejected]
+                    end_phase_proceeding[rejected] = False
+                    keep = np.ones(len(active), dtype=bool)
+                    keep[adaptive[~accept]] = False
+                    active, ph = active[keep], ph[keep]
+                    record = {key: val[keep] for key, val in record.items()}
+            self._records.append(record)
+
+            power = record['power_ground']
+            proceeding = ~starting[active]
+            m = active[proceeding]
+            energy[m] += .5*(last_power[m] + power[proceeding])*(timer[m] - last_time[m])
+            last_time[active], last_power[active] = timer[active], power
+            last_tether_length[active], last_elevation_angle[active] = tether_length[active], elevation_angle[active]
+            last_reeling_speed[active], last_elevation_rate[active] = record['reeling_speed'], record['elevation_rate']
+            previous_kinematic_ratio[active] = np.where(starting[active], np.nan, last_kinematic_ratio[active])
+            last_kinematic_ratio[active] = np.where(record['converged'], record['kinematic_ratio'], np.nan)
+            starting[active] = False
+
+            # Evaluate the stopping criteria.
+            n_time_points[m] += 1
+            max_time_points = np.array([np.inf if p.max_time_points is None else p.max_time_points
+                                        for p in phases])[phase_id[m]]
+            max_reached = n_time_points[m] == max_time_points
+            finish_phase(m[max_reached], 1)
+            finish_phase(m[~max_reached & end_phase_proceeding[m]])
+
+    def _collect_results(self):
+        """Combine the recorded time points into a time series per member."""
+        self.results = [None]*self.n_members
+        if not self._records:
+            return
+        member = np.concatenate([rec['member'] for rec in self._records])
+        order = np.argsort(member, kind='stable')
+        counts = np.bincount(member, minlength=self.n_members)
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        columns = {f: np.concatenate([np.asarray(rec[f]) for rec in self._records])[order]
+                   for f in self.RESULT_FIELDS}
+        for i in range(self.n_members):
+            if self.errors[i] is None and counts[i] > 0:
+                self.results[i] = {f: col[bounds[i]:bounds[i+1]] for f, col in columns.items()}
+        self._records = None
+
+
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     # Expected performance summary:
     #   Total cycle: 87.4 seconds in which 51903J energy produced.
     #   Mean cycle power: 593.7W
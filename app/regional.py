@@ -0,0 +1,398 @@
+"""Regional power maps: the pumping cycle is simulated for every ERA5 grid cell within a bounding box, using the
+roughness length and ground altitude of the cell, over a range of reference wind speeds. Cells with the same quantized
+site parameters share a simulation. The sites are simulated in chunks over a pool of worker processes and each
+completed chunk is checkpointed on disk, such that an interrupted job resumes where it stopped. Run from the
+repository root with, e.g.:
+
+    python -m app.regional 39 42 -5 -2 --wind-speeds 5 12 -o regional.npz --html regional.html
+
+which writes the result archive, see `RegionalResult.load`, and a map with a mean power layer per wind speed.
+"""
+import argparse
+import concurrent.futures
+import os
+import tempfile
+
+import numpy as np
+
+from app.cache import MODEL_FINGERPRINT, content_hash, input_fields
+from app.location_utils import get_location_service
+from app.qsm import CycleBatch
+from app.sweep import kite_system_properties, site_environment, sweep_cycle_settings, sweep_time_step
+
+
+def quantize_sites(roughness, altitude, roughness_resolution=0.05, altitude_resolution=10.):
+    """Quantize the site parameters, such that cells with nearly equal parameters share a simulation. The roughness
+    length spans several orders of magnitude and is thus quantized on a logarithmic scale.
+
+    Args:
+        roughness (ndarray): Roughness lengths [m].
+        altitude (ndarray): Ground altitudes [m].
+        roughness_resolution (float, optional): Relative resolution of the roughness length [-].
+        altitude_resolution (float, optional): Resolution of the altitude [m].
+
+    Returns:
+        tuple: Quantized roughness lengths [m] and altitudes [m], NaN for missing data.
+
+    """
+    roughness = np.asarray(roughness, dtype=float)
+    altitude = np.asarray(altitude, dtype=float)
+    log_step = np.log1p(roughness_resolution)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roughness_q = np.exp(np.round(np.log(roughness) / log_step) * log_step)
+    altitude_q = np.round(altitude / altitude_resolution) * altitude_resolution
+    missing = ~(np.isfinite(roughness_q) & np.isfinite(altitude_q) & (roughness > 0.))
+    roughness_q[missing] = np.nan
+    altitude_q[missing] = np.nan
+    return roughness_q, altitude_q
+
+
+def simulate_sites(sys_props, sites, wind_speeds, h_ref, rmax, rmin, tether_angle, time_step_tolerance=None):
+    """Simulate the pumping cycle for a chunk of sites at all wind speeds as a single batch.
+
+    Args:
+        sys_props (`SystemProperties`): Collection of system properties.
+        sites (ndarray): Roughness length [m] and ground altitude [m] per site, shape (n_sites, 2).
+        wind_speeds (ndarray): Reference wind speeds [m/s].
+        h_ref (float): Reference height of the wind profile [m].
+        rmax (float): Tether length at the start of the retraction phase [m].
+        rmin (float): Tether length at the end of the retraction phase [m].
+        tether_angle (float): Elevation angle of the traction phase [rad].
+        time_step_tolerance (float, optional): Tolerance of the adaptive time stepping, fixed time steps are used if
+            None.
+
+    Returns:
+        tuple: Mean cycle power [W] and cycle energy [J] per site and wind speed, NaN for failed simulations.
+
+    """
+    h_0 = np.repeat(sites[:, 0], len(wind_speeds))
+    altitude = np.repeat(sites[:, 1], len(wind_speeds))
+    wind_speed = np.tile(wind_speeds, len(sites))
+
+    env_states = [site_environment(v, h_ref, z0, alt) for v, z0, alt in zip(wind_speed, h_0, altitude)]
+    time_steps = sweep_time_step(wind_speed, h_ref, h_0, altitude, rmax, rmin, tether_angle)
+    cycle = CycleBatch(sweep_cycle_settings(time_steps, rmax, rmin, tether_angle, time_step_tolerance))
+    cycle.run_simulation(sys_props, env_states, print_summary=False)
+
+    failed = np.array([error is not None for error in cycle.errors])
+    mean_power = np.where(failed, np.nan, cycle.average_power)
+    energy = np.where(failed, np.nan, cycle.energy)
+    shape = (len(sites), len(wind_speeds))
+    return mean_power.reshape(shape), energy.reshape(shape)
+
+
+class RegionalResult:
+    """Gridded cycle performance of a region.
+
+    Attributes:
+        latitudes (ndarray): Latitudes of the cells [deg], north to south.
+        longitudes (ndarray): Longitudes of the cells [deg], west to east, between the bounding box longitudes.
+        wind_speeds (ndarray): Reference wind speeds [m/s].
+        roughness (ndarray): Quantized roughness length per cell [m].
+        altitude (ndarray): Quantized ground altitude per cell [m].
+        mean_power (ndarray): Mean cycle power [W] per wind speed and cell, shape (n_wind_speeds, n_lats, n_lons).
+        energy (ndarray): Cycle energy [J] per wind speed and cell, shape (n_wind_speeds, n_lats, n_lons).
+        grid_spacing (ndarray): Latitude and longitude spacing of the grid [deg], None to derive it from the cell
+            coordinates.
+
+    """
+    def __init__(self, latitudes, longitudes, wind_speeds, roughness, altitude, mean_power, energy,
+                 grid_spacing=None):
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.wind_speeds = wind_speeds
+        self.roughness = roughness
+        self.altitude = altitude
+        self.mean_power = mean_power
+        self.energy = energy
+        self.grid_spacing = grid_spacing
+
+    @property
+    def bounds(self):
+        """list: South-west and north-east corners of the outer cell edges, as used by folium [deg]."""
+        if self.grid_spacing is not None:
+            half_lat, half_lon = np.asarray(self.grid_spacing, dtype=float) / 2.
+        else:
+            half_lat = abs(self.latitudes[1] - self.latitudes[0]) / 2. if len(self.latitudes) > 1 else 0.
+            half_lon = abs(self.longitudes[1] - self.longitudes[0]) / 2. if len(self.longitudes) > 1 else 0.
+        return [[float(self.latitudes.min() - half_lat), float(self.longitudes.min() - half_lon)],
+                [float(self.latitudes.max() + half_lat), float(self.longitudes.max() + half_lon)]]
+
+    def image(self, raster, cmap='viridis', vmin=None, vmax=None):
+        """Colour a raster for a `folium.raster_layers.ImageOverlay` with the `bounds` of the result. Cells without
+        data are transparent.
+
+        Args:
+            raster (ndarray): Values per cell, shape (n_lats, n_lons), e.g. `mean_power[i]`.
+            cmap (str, optional): Name of the matplotlib colormap.
+            vmin (float, optional): Value of the lowest colour, defaults to the smallest value.
+            vmax (float, optional): Value of the highest colour, defaults to the largest value.
+
+        Returns:
+            ndarray: RGBA image with the north-western cell first, shape (n_lats, n_lons, 4).
+
+        """
+        import matplotlib
+
+        vmin = np.nanmin(raster) if vmin is None else vmin
+        vmax = np.nanmax(raster) if vmax is None else vmax
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normalized = (raster - vmin) / (vmax - vmin) if vmax > vmin else np.zeros_like(raster)
+        rgba = matplotlib.colormaps[cmap](np.ma.masked_invalid(normalized))
+        rgba[~np.isfinite(raster), 3] = 0.
+        return rgba
+
+    def overlay(self, raster, name=None, opacity=.7, **kwargs):
+        """Map layer of a raster, see `image`.
+
+        Args:
+            raster (ndarray): Values per cell, shape (n_lats, n_lons).
+            name (str, optional): Name of the layer in the layer control.
+            opacity (float, optional): Opacity of the layer.
+            **kwargs: Colouring options, see `image`.
+
+        Returns:
+            `folium.raster_layers.ImageOverlay`: Layer to add to a `folium.Map`.
+
+        """
+        import folium
+
+        return folium.raster_layers.ImageOverlay(self.image(raster, **kwargs), self.bounds, name=name,
+                                                 opacity=opacity, mercator_project=True)
+
+    def power_map(self, cmap='viridis'):
+        """Map of the mean cycle power with a layer per wind speed, which share the colour scale.
+
+        Args:
+            cmap (str, optional): Name of the matplotlib colormap.
+
+        Returns:
+            `folium.Map`: Map fitted to the region.
+
+        """
+        import folium
+
+        m = folium.Map(tiles='OpenStreetMap', control_scale=True)
+        vmin, vmax = np.nanmin(self.mean_power), np.nanmax(self.mean_power)
+        for i, wind_speed in enumerate(self.wind_speeds):
+            layer = self.overlay(self.mean_power[i], "Mean power at {:.1f} m/s".format(wind_speed), cmap=cmap,
+                                 vmin=vmin, vmax=vmax)
+            layer.show = i == 0
+            layer.add_to(m)
+        folium.LayerControl().add_to(m)
+        m.fit_bounds(self.bounds)
+        return m
+
+    def save(self, path):
+        """Store the result as a NumPy archive.
+
+        Args:
+            path (str): Path of the archive.
+
+        """
+        np.savez_compressed(path, **{k: v for k, v in vars(self).items() if v is not None})
+
+    @classmethod
+    def load(cls, path):
+        """Load a result stored with `save`.
+
+        Args:
+            path (str): Path of the archive.
+
+        Returns:
+            `RegionalResult`: Stored result.
+
+        """
+        with np.load(path) as archive:
+            return cls(**{f: archive[f] for f in archive.files})
+
+
+def region_cells(location_service, lat_min, lat_max, lon_min, lon_max):
+    """Grid cells within a bounding box.
+
+    Args:
+        location_service (`LocationService`): Source of the grid and site data.
+        lat_min (float): Southern edge [deg].
+        lat_max (float): Northern edge [deg].
+        lon_min (float): Western edge [deg], the box may cross the antimeridian.
+        lon_max (float): Eastern edge [deg].
+
+    Returns:
+        tuple: Latitude indices (north to south), longitude indices (west to east), latitudes [deg], and longitudes
+            [deg] of the cells.
+
+    """
+    lats = location_service.latitudes
+    lat_idx = np.flatnonzero((lats >= lat_min) & (lats <= lat_max))
+    lat_idx = lat_idx[np.argsort(-lats[lat_idx], kind='stable')]
+
+    # Longitudes are compared as offsets east of the western edge, such that both conventions are supported.
+    offsets = (location_service.longitudes - lon_min) % 360.
+    lon_idx = np.flatnonzero(offsets <= (lon_max - lon_min) % 360. + 1e-9)
+    lon_idx = lon_idx[np.argsort(offsets[lon_idx], kind='stable')]
+    if not len(lat_idx) or not len(lon_idx):
+        raise ValueError("No grid cells within the bounding box.")
+    return lat_idx, lon_idx, lats[lat_idx], lon_min + offsets[lon_idx]
+
+
+def _write_checkpoint(path, **arrays):
+    # Write to a temporary file first, such that an interrupted job never leaves a partial checkpoint.
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_checkpoint(path, sites):
+    """Results of a checkpointed chunk, or None if not available or computed for other sites."""
+    try:
+        with np.load(path) as archive:
+            if not np.array_equal(archive['sites'], sites):
+                return None
+            return archive['mean_power'], archive['energy']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def run_regional(sys_props, location_service, bbox, wind_speeds, h_ref=10., rmax=200., rmin=100.,
+                 tether_angle=26.6*np.pi/180., checkpoint_dir=None, chunk_size=8, max_workers=None,
+                 time_step_tolerance=None, roughness_resolution=0.05, altitude_resolution=10., progress=None):
+    """Simulate the pumping cycle for all grid cells of a region.
+
+    Args:
+        sys_props (`SystemProperties`): Collection of system properties.
+        location_service (`LocationService`): Source of the grid and site data, see `location_utils`.
+        bbox (tuple): Southern, northern, western, and eastern edges of the region [deg].
+        wind_speeds (array_like): Reference wind speeds [m/s].
+        h_ref (float, optional): Reference height of the wind profile [m].
+        rmax (float, optional): Tether length at the start of the retraction phase [m].
+        rmin (float, optional): Tether length at the end of the retraction phase [m].
+        tether_angle (float, optional): Elevation angle of the traction phase [rad].
+        checkpoint_dir (str, optional): Directory for the chunk checkpoints, defaults to a directory in the temporary
+            directory.
+        chunk_size (int, optional): Number of unique sites per chunk.
+        max_workers (int, optional): Number of worker processes, defaults to the number of processors. The chunks
+            are simulated in the current process if 1.
+        time_step_tolerance (float, optional): Tolerance of the adaptive time stepping, fixed time steps are used if
+            None.
+        roughness_resolution (float, optional): Relative resolution of the roughness length [-].
+        altitude_resolution (float, optional): Resolution of the altitude [m].
+        progress (callable, optional): Called with the number of completed and total chunks.
+
+    Returns:
+        `RegionalResult`: Gridded cycle performance.
+
+    """
+    wind_speeds = np.asarray(wind_speeds, dtype=float)
+    lat_idx, lon_idx, lats, lons = region_cells(location_service, *bbox)
+    grid_lat_idx, grid_lon_idx = np.meshgrid(lat_idx, lon_idx, indexing='ij')
+    roughness = np.asarray(location_service.read_roughness(0, grid_lat_idx.ravel(), grid_lon_idx.ravel()), dtype=float)
+    altitude = np.asarray(location_service.read_altitude(grid_lat_idx.ravel(), grid_lon_idx.ravel()), dtype=float)
+    roughness, altitude = quantize_sites(roughness, altitude, roughness_resolution, altitude_resolution)
+
+    # Cells with identical quantized parameters are simulated once.
+    valid = np.isfinite(roughness)
+    sites, site_of_cell = np.unique(np.column_stack([roughness[valid], altitude[valid]]), axis=0, return_inverse=True)
+    chunks = [sites[i:i+chunk_size] for i in range(0, len(sites), chunk_size)]
+
+    if checkpoint_dir is None:
+        checkpoint_dir = os.path.join(tempfile.gettempdir(), 'awes-app-regional')
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    job_key = content_hash({
+        'model': MODEL_FINGERPRINT,
+        'system_properties': input_fields(sys_props),
+        'wind_speeds': wind_speeds,
+        'h_ref': h_ref,
+        'rmax': rmax,
+        'rmin': rmin,
+        'tether_angle': tether_angle,
+        'time_step_tolerance': time_step_tolerance,
+    })
+
+    def checkpoint_path(i):
+        return os.path.join(checkpoint_dir, '{}-{}.npz'.format(job_key[:32], content_hash({'sites': chunks[i]})[:16]))
+
+    results = {}
+    for i, chunk in enumerate(chunks):
+        result = _read_checkpoint(checkpoint_path(i), chunk)
+        if result is not None:
+            results[i] = result
+    pending = [i for i in range(len(chunks)) if i not in results]
+    if progress is not None:
+        progress(len(results), len(chunks))
+
+    args = (wind_speeds, h_ref, rmax, rmin, tether_angle, time_step_tolerance)
+    if max_workers == 1:
+        completed = ((i, simulate_sites(sys_props, chunks[i], *args)) for i in pending)
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        futures = {executor.submit(simulate_sites, sys_props, chunks[i], *args): i for i in pending}
+        completed = ((futures[f], f.result()) for f in concurrent.futures.as_completed(futures))
+    try:
+        for i, (mean_power, energy) in completed:
+            _write_checkpoint(checkpoint_path(i), sites=chunks[i], mean_power=mean_power, energy=energy)
+            results[i] = mean_power, energy
+            if progress is not None:
+                progress(len(results), len(chunks))
+    finally:
+        if executor is not None:
+            # Stop pending chunks when the job is interrupted, completed chunks are kept in the checkpoints.
+            executor.shutdown(cancel_futures=True)
+
+    n_wind = len(wind_speeds)
+    site_power = np.concatenate([results[i][0] for i in range(len(chunks))]) if chunks else np.empty((0, n_wind))
+    site_energy = np.concatenate([results[i][1] for i in range(len(chunks))]) if chunks else np.empty((0, n_wind))
+    cell_power = np.full((len(roughness), n_wind), np.nan)
+    cell_energy = np.full((len(roughness), n_wind), np.nan)
+    cell_power[valid] = site_power[site_of_cell.ravel()]
+    cell_energy[valid] = site_energy[site_of_cell.ravel()]
+
+    shape = (len(lats), len(lons))
+    return RegionalResult(lats, lons, wind_speeds, roughness.reshape(shape), altitude.reshape(shape),
+                          np.moveaxis(cell_power, 1, 0).reshape((n_wind,) + shape),
+                          np.moveaxis(cell_energy, 1, 0).reshape((n_wind,) + shape),
+                          np.array(location_service.grid_spacing))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate the pumping cycle for all grid cells of a region.")
+    parser.add_argument('lat_min', type=float, help="Southern edge of the region [deg].")
+    parser.add_argument('lat_max', type=float, help="Northern edge of the region [deg].")
+    parser.add_argument('lon_min', type=float, help="Western edge of the region [deg].")
+    parser.add_argument('lon_max', type=float, help="Eastern edge of the region [deg].")
+    parser.add_argument('--wind-speeds', type=float, nargs=2, default=(5., 12.), metavar=('MIN', 'MAX'),
+                        help="Range of the reference wind speeds [m/s].")
+    parser.add_argument('--steps', type=int, default=8, help="Number of reference wind speeds.")
+    parser.add_argument('--kite-area', type=float, default=7., help="Projected kite area [m^2].")
+    parser.add_argument('--location-data', default='data/Wind_Data.nc', help="Path of the NetCDF or site grid file.")
+    parser.add_argument('--time-step-tolerance', type=float, help="Tolerance of the adaptive time stepping, fixed "
+                                                                   "time steps are used if omitted.")
+    parser.add_argument('-o', '--output', default='regional.npz', help="Path of the result archive.")
+    parser.add_argument('--html', help="Path of the map of the mean cycle power.")
+    parser.add_argument('-j', '--workers', type=int, help="Number of worker processes, defaults to the number of "
+                                                          "processors.")
+    parser.add_argument('--checkpoint-dir', help="Directory of the chunk checkpoints.")
+    args = parser.parse_args(argv)
+
+    def progress(n_completed, n_chunks):
+        print("[{}/{}] chunks".format(n_completed, n_chunks), flush=True)
+
+    result = run_regional(kite_system_properties(args.kite_area), get_location_service(args.location_data),
+                          (args.lat_min, args.lat_max, args.lon_min, args.lon_max), np.linspace(*args.wind_speeds, args.steps),
+                          checkpoint_dir=args.checkpoint_dir, max_workers=args.workers,
+                          time_step_tolerance=args.time_step_tolerance, progress=progress)
+    result.save(args.output)
+    print("Written", args.output)
+    if args.html:
+        result.power_map().save(args.html)
+        print("Written", args.html)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""Local HTTP/JSON service of the cycle and sweep simulations, for tools that call the model without the web app. The
+simulations run in a pool of worker processes. Requests are identified by a hash of their canonical parameters:
+identical requests that arrive while the first one is being simulated share its computation, and finished results
+are kept in a bounded in-memory cache. Run from the repository root with:
+
+    python -m app.service --port 8600
+
+Endpoints:
+    POST /cycle: Single cycle, e.g. {"kite_area": 7.0, "wind_speed": 8.0, "time_series": true}.
+    POST /sweep: Wind-speed sweep, e.g. {"kite_area": 7.0, "wind_speeds": {"min": 5.0, "max": 12.0, "steps": 20}}.
+    GET /stats: Request counters of the service.
+
+Both simulation endpoints accept the site and cycle parameters of `DEFAULTS`, with the tether angle in degrees.
+
+"""
+import argparse
+import collections
+import concurrent.futures
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from app.cache import MODEL_FINGERPRINT, ResultCache, content_hash
+from app.metrics import sweep_metrics
+from app.sweep import SweepPointError, kite_system_properties, run_sweep
+
+# Defaults of the optional request parameters, as used by the web app.
+DEFAULTS = {
+    'h_ref': 10.,
+    'h_0': 0.073,
+    'altitude': 1450.,
+    'rmax': 200.,
+    'rmin': 100.,
+    'tether_angle': 26.6,
+    'time_step_tolerance': None,
+}
+
+# Time series of a cycle result, by column of `TimeSeriesColumns`.
+TIME_SERIES = {
+    'time': 'time',
+    'reeling_speed': 'reeling_speed',
+    'tether_force': 'tether_force_ground',
+    'power': 'power_ground',
+}
+
+
+class RequestError(Exception):
+    """Invalid request to the simulation service.
+
+    Attributes:
+        msg (str): Human readable string describing the exception.
+        code (int, optional): HTTP status code of the response.
+
+    """
+    def __init__(self, msg, code=400):
+        self.msg = msg
+        self.code = code
+
+
+def _jsonable(values):
+    # JSON has no NaN, undefined values are returned as null.
+    return [None if not np.isfinite(v) else float(v) for v in np.asarray(values, dtype=float)]
+
+
+def parse_request(kind, body):
+    """Validate the parameters of a request and fill in the defaults.
+
+    Args:
+        kind (str): 'cycle' or 'sweep'.
+        body (dict): Decoded JSON request body.
+
+    Returns:
+        dict: Canonical parameters.
+
+    """
+    if not isinstance(body, dict):
+        raise RequestError("Request body should be a JSON object.")
+    required = ('kite_area', 'wind_speed') if kind == 'cycle' else ('kite_area', 'wind_speeds')
+    optional = ('time_series',) if kind == 'cycle' else ()
+    unknown = set(body) - set(required) - set(optional) - set(DEFAULTS)
+    if unknown:
+        raise RequestError("Unknown parameter(s): {}.".format(", ".join(sorted(unknown))))
+    missing = [key for key in required if key not in body]
+    if missing:
+        raise RequestError("Missing parameter(s): {}.".format(", ".join(missing)))
+
+    params = {**DEFAULTS, **body}
+    try:
+        for key in ('kite_area', 'h_ref', 'h_0', 'altitude', 'rmax', 'rmin', 'tether_angle'):
+            params[key] = float(params[key])
+        if params['time_step_tolerance'] is not None:
+            params['time_step_tolerance'] = float(params['time_step_tolerance'])
+        if kind == 'cycle':
+            params['wind_speed'] = float(params['wind_speed'])
+            params['time_series'] = bool(params.get('time_series', False))
+        else:
+            spec = params['wind_speeds']
+            if isinstance(spec, dict):
+                spec = np.linspace(float(spec['min']), float(spec['max']), int(spec.get('steps', 20)))
+            params['wind_speeds'] = [float(v) for v in spec]
+    except (TypeError, ValueError, KeyError) as e:
+        raise RequestError("Invalid parameter value: {}.".format(e))
+    if kind == 'sweep' and not params['wind_speeds']:
+        raise RequestError("Parameter 'wind_speeds' should not be empty.")
+    if params['kite_area'] <= 0. or params['h_0'] <= 0. or params['rmin'] >= params['rmax']:
+        raise RequestError("Kite area and roughness length should be positive and rmin smaller than rmax.")
+    return params
+
+
+def _run_sweep(params, wind_speeds, cache_dir):
+    cache = None if cache_dir is None else ResultCache(cache_dir)
+    return run_sweep(kite_system_properties(params['kite_area']), wind_speeds, params['h_ref'], params['h_0'],
+                     params['altitude'], params['rmax'], params['rmin'], np.deg2rad(params['tether_angle']), cache,
+                     time_step_tolerance=params['time_step_tolerance'])
+
+
+def simulate_cycle_request(params, cache_dir=None):
+    """Simulate a single cycle in a worker process.
+
+    Args:
+        params (dict): Output of `parse_request`.
+        cache_dir (str, optional): Directory of a `ResultCache` shared with other runs, results are not cached on
+            disk if None.
+
+    Returns:
+        dict: Response with the energy [J], duration [s], and average power [W] of the cycle, and its time series if
+            requested, or the error of the simulation.
+
+    """
+    [(wind_speed, result)] = _run_sweep(params, [params['wind_speed']], cache_dir)
+    if isinstance(result, SweepPointError):
+        return {'wind_speed': wind_speed, 'error': str(result)}
+    response = {
+        'wind_speed': wind_speed,
+        'energy': result.energy,
+        'duration': result.duration,
+        'average_power': result.average_power,
+    }
+    if params['time_series']:
+        response['time_series'] = {name: _jsonable(result.columns[field]) for name, field in TIME_SERIES.items()}
+    return response
+
+
+def simulate_sweep_request(params, cache_dir=None):
+    """Simulate a wind-speed sweep in a worker process.
+
+    Args:
+        params (dict): Output of `parse_request`.
+        cache_dir (str, optional): Directory of a `ResultCache` shared with other runs, results are not cached on
+            disk if None.
+
+    Returns:
+        dict: Response with the wind speeds [m/s], the metrics of `sweep_metrics` per wind speed (null for failed
+            points), and the error per wind speed (null if successful).
+
+    """
+    results = _run_sweep(params, params['wind_speeds'], cache_dir)
+    failed = np.array([isinstance(res, SweepPointError) for _, res in results])
+    empty = np.empty(0)
+
+    def series(field):
+        return [empty if isinstance(res, SweepPointError) else res.columns[field] for _, res in results]
+
+    metrics = sweep_metrics(series('time'), series('power_ground'), series('reeling_speed'))
+    return {
+        'wind_speeds': [v for v, _ in results],
+        'metrics': {name: _jsonable(np.where(failed, np.nan, values)) for name, values in metrics.items()},
+        'errors': [str(res) if isinstance(res, SweepPointError) else None for _, res in results],
+    }
+
+
+SIMULATIONS = {
+    'cycle': simulate_cycle_request,
+    'sweep': simulate_sweep_request,
+}
+
+
+class SimulationService:
+    """Coalescing front of a pool of simulation workers.
+
+    Attributes:
+        cache_size (int): Maximum number of responses in the in-memory cache.
+        cache_dir (str): Directory of a `ResultCache` shared by the workers, None to not cache on disk.
+        stats (collections.Counter): Number of requests, cache hits, coalesced requests, and computations.
+
+    """
+    def __init__(self, max_workers=None, cache_size=256, cache_dir=None):
+        """
+        Args:
+            max_workers (int, optional): Number of worker processes, defaults to the number of processors.
+            cache_size (int, optional): Value for `cache_size` attribute.
+            cache_dir (str, optional): Value for `cache_dir` attribute.
+
+        """
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        self.stats = collections.Counter()
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        self._results = collections.OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def request_key(kind, params):
+        """Hash of the canonical parameters of a request.
+
+        Args:
+            kind (str): 'cycle' or 'sweep'.
+            params (dict): Output of `parse_request`.
+
+        Returns:
+            str: Hexadecimal SHA-256 hash.
+
+        """
+        return content_hash({'model': MODEL_FINGERPRINT, 'kind': kind, 'params': params})
+
+    def submit(self, kind, params):
+        """Get the response to a request: from the cache, from an identical request in flight, or by submitting the
+        simulation to the workers.
+
+        Args:
+            kind (str): 'cycle' or 'sweep'.
+            params (dict): Output of `parse_request`.
+
+        Returns:
+            `concurrent.futures.Future`: Future of the response, shared by identical requests.
+
+        """
+        key = self.request_key(kind, params)
+        with self._lock:
+            self.stats['requests'] += 1
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                future = concurrent.futures.Future()
+                future.set_result(self._results[key])
+                return future
+            if key in self._in_flight:
+                self.stats['coalesced'] += 1
+                return self._in_flight[key]
+            self.stats['computed'] += 1
+            future = self._executor.submit(SIMULATIONS[kind], params, self.cache_dir)
+            self._in_flight[key] = future
+        future.add_done_callback(lambda f: self._on_done(key, f))
+        return future
+
+    def _on_done(self, key, future):
+        with self._lock:
+            self._in_flight.pop(key, None)
+            # Failures are not cached, such that a repeated request retries the simulation.
+            if not future.cancelled() and future.exception() is None:
+                self._results[key] = future.result()
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        self._executor.shutdown(cancel_futures=True)
+
+
+class SimulationRequestHandler(BaseHTTPRequestHandler):
+    """Handler of the JSON requests of a `SimulationServer`."""
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self, code, body):
+        payload = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            with self.server.service._lock:
+                stats = dict(self.server.service.stats)
+            self._respond(200, stats)
+        else:
+            self._respond(404, {'error': "Unknown endpoint: {}.".format(self.path)})
+
+    def do_POST(self):
+        kind = self.path.strip('/')
+        try:
+            if kind not in SIMULATIONS:
+                raise RequestError("Unknown endpoint: {}.".format(self.path), 404)
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            except ValueError:
+                raise RequestError("Request body should be valid JSON.")
+            params = parse_request(kind, body)
+            future = self.server.service.submit(kind, params)
+            try:
+                response = future.result(timeout=self.server.timeout_seconds)
+            except concurrent.futures.TimeoutError:
+                raise RequestError("Simulation did not complete within {} s.".format(self.server.timeout_seconds),
+                                   504)
+        except RequestError as e:
+            self._respond(e.code, {'error': e.msg})
+        except Exception as e:
+            self._respond(500, {'error': getattr(e, 'msg', str(e))})
+        else:
+            self._respond(422 if 'error' in response else 200, response)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class SimulationServer(ThreadingHTTPServer):
+    """HTTP server of a `SimulationService`, handling each connection in its own thread.
+
+    Attributes:
+        service (`SimulationService`): Simulation service.
+        timeout_seconds (float): Maximum time a request waits for its simulation [s].
+        verbose (bool): Log every request.
+
+    """
+    daemon_threads = True
+
+    def __init__(self, address, service, timeout_seconds=300., verbose=False):
+        """
+        Args:
+            address (tuple): Host and port to listen on, port 0 selects a free port.
+            service (`SimulationService`): Value for `service` attribute.
+            timeout_seconds (float, optional): Value for `timeout_seconds` attribute.
+            verbose (bool, optional): Value for `verbose` attribute.
+
+        """
+        super().__init__(address, SimulationRequestHandler)
+        self.service = service
+        self.timeout_seconds = timeout_seconds
+        self.verbose = verbose
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the cycle and sweep simulations over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="Host to listen on.")
+    parser.add_argument('--port', type=int, default=8600, help="Port to listen on.")
+    parser.add_argument('-j', '--workers', type=int, help="Number of worker processes, defaults to the number of "
+                                                          "processors.")
+    parser.add_argument('--cache-size', type=int, default=256, help="Number of responses kept in memory.")
+    parser.add_argument('--cache-dir', help="Directory of a result cache shared with other runs.")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Log every request.")
+    args = parser.parse_args(argv)
+
+    service = SimulationService(args.workers, args.cache_size, args.cache_dir)
+    server = SimulationServer((args.host, args.port), service, verbose=args.verbose)
+    print("Serving on http://{}:{}".format(*server.server_address), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""Wind-speed sweeps of the pumping cycle, of which the wind speeds are simulated together as a `CycleBatch`."""
+from functools import cached_property
+
+import numpy as np
+
+from app.cache import CycleResult, cycle_key
+from app.metrics import sweep_metrics
+from app.qsm import CycleBatch, LogProfile, SystemProperties, TractionPhase
+
+
+class SweepPointError(Exception):
+    """Failure of the cycle simulation for a single wind speed of a sweep.
+
+    Attributes:
+        wind_speed (float): Reference wind speed of the failed point [m/s].
+        msg (str): Description of the underlying error.
+        cause (str): Class name of the underlying exception.
+
+    """
+    def __init__(self, wind_speed, msg, cause=None):
+        super().__init__(wind_speed, msg, cause)
+        self.wind_speed = wind_speed
+        self.msg = msg
+        self.cause = cause
+
+    def __str__(self):
+        return "Wind speed {:.2f} m/s: {}".format(self.wind_speed, self.msg)
+
+
+def kite_system_properties(kite_area):
+    """System properties of a kite of the given area, with the projected area and mass scaled after the Ozone Edge
+    specifications.
+
+    Args:
+        kite_area (float): Kite area [m^2].
+
+    Returns:
+        `SystemProperties`: Collection of system properties.
+
+    """
+    m_p_area = (13.9 - 3.7) / (19 - 5)  # y = mx+n / Area to Projected Area based on Ozone Edge specs
+    n_p_area = 13.9 - m_p_area * 19
+
+    m_weight = (4.7 - 2.2) / (19 - 5)  # y = mx+n / Weight from area based on Ozone Edge specs
+    n_weight = 4.7 - m_weight * 19
+
+    return SystemProperties({
+        'kite_projected_area': kite_area * m_p_area + n_p_area,  # kite_area,  # [m^2]
+        'kite_mass': kite_area * m_weight + n_weight + 0.5,  # estimated weight + electronics  [kg]
+        'tether_density': 724.,  # [kg/m^3]
+        'tether_diameter': 0.002,  # [m]
+        'kite_lift_coefficient_powered': 0.69,  # [-]
+        'kite_drag_coefficient_powered': 0.69 / 3.6,  # [-]
+        'kite_lift_coefficient_depowered': .17,  # [-]
+        'kite_drag_coefficient_depowered': .17 / 3.5,  # [-]
+        'tether_drag_coefficient': 2 * 1.1,  # [-]
+        'reeling_speed_min_limit': 0.,  # [m/s]
+        'reeling_speed_max_limit': 10.,  # [m/s]
+        'tether_force_min_limit': 500.,  # [N]
+        'tether_force_max_limit': 50000.,  # [N]
+    })
+
+
+def site_environment(wind_speed, h_ref, h_0, altitude):
+    """Logarithmic wind profile of a site.
+
+    Args:
+        wind_speed (float): Reference wind speed [m/s].
+        h_ref (float): Reference height of the wind profile [m].
+        h_0 (float): Roughness length [m].
+        altitude (float): Altitude of the ground station [m].
+
+    Returns:
+        `LogProfile`: Specification of environment.
+
+    """
+    env_state = LogProfile()
+    env_state.set_reference_height(h_ref)
+    env_state.set_reference_wind_speed(wind_speed)
+    env_state.set_reference_roughness_length(h_0)
+    env_state.set_altitude_ground(altitude)
+    return env_state
+
+
+def sweep_time_step(wind_speed, h_ref, h_0, altitude, rmax, rmin, tether_angle):
+    """Time step used for simulating a sweep point, scaled with the wind speed at the highest kite position.
+
+    Returns:
+        float or ndarray: Time step [s].
+
+    """
+    max_wind_speed_1 = wind_speed * np.log(altitude + rmax * np.sin(tether_angle) / h_0) / np.log(h_ref / h_0)
+    return 0.01 * (rmax - rmin) / max_wind_speed_1
+
+
+def sweep_cycle_settings(time_step, rmax, rmin, tether_angle, time_step_tolerance=None):
+    """Cycle settings of the sweep-based analyses.
+
+    Args:
+        time_step (float or ndarray): Time step of the phases [s], may be given per wind speed for `CycleBatch`. Used
+            as smallest time step if adaptive time stepping is enabled.
+        rmax (float): Tether length at the start of the retraction phase [m].
+        rmin (float): Tether length at the end of the retraction phase [m].
+        tether_angle (float): Elevation angle of the traction phase [rad].
+        time_step_tolerance (float, optional): Tolerance of the adaptive time stepping, see `Cycle`, fixed time steps
+            are used if None.
+
+    Returns:
+        dict: Settings for `Cycle` or `CycleBatch`.
+
+    """
+    settings = {
+        'cycle': {
+            'tether_length_start_retraction': rmax,
+            'tether_length_end_retraction': rmin,
+            'include_transition_energy': False,
+            'elevation_angle_traction': tether_angle,
+            'traction_phase': TractionPhase,
+        },
+        'retraction': {
+            'control': ('tether_force_ground', 900),
+            'time_step': time_step,
+        },
+        'transition': {
+            'control': ('tether_force_ground', 900),
+            'time_step': time_step,
+        },
+        'traction': {
+            'control': ('max_power_reeling_factor', 3069),
+            'azimuth_angle': 10.6 * np.pi / 180.,
+            'course_angle': 96.4 * np.pi / 180.,
+            'time_step': time_step,
+        },
+    }
+    for phase in ('retraction', 'transition', 'traction'):
+        settings[phase]['time_step_tolerance'] = time_step_tolerance
+    return settings
+
+
+def sweep_point_inputs(sys_props, wind_speeds, h_ref, h_0, altitude, rmax, rmin, tether_angle,
+                       time_step_tolerance=None):
+    """Inputs of the points of a sweep, see `run_sweep` for the arguments.
+
+    Returns:
+        tuple: Reference wind speeds as floats [m/s], time steps [s], environment states, and result cache keys, per
+            point.
+
+    """
+    wind_speeds = [float(v) for v in wind_speeds]
+    time_steps = sweep_time_step(np.array(wind_speeds), h_ref, h_0, altitude, rmax, rmin, tether_angle)
+    env_states = [site_environment(v, h_ref, h_0, altitude) for v in wind_speeds]
+    keys = [cycle_key(sys_props, env_state, sweep_cycle_settings(float(dt), rmax, rmin, tether_angle,
+                                                                 time_step_tolerance))
+            for env_state, dt in zip(env_states, time_steps)]
+    return wind_speeds, time_steps, env_states, keys
+
+
+def sweep_key(sys_props, wind_speeds, h_ref, h_0, altitude, rmax, rmin, tether_angle, time_step_tolerance=None):
+    """Key of a sweep, which identifies its result, see `run_sweep` for the arguments.
+
+    Returns:
+        tuple: Result cache key per point, see `sweep_point_inputs`.
+
+    """
+    return tuple(sweep_point_inputs(sys_props, wind_speeds, h_ref, h_0, altitude, rmax, rmin, tether_angle,
+                                    time_step_tolerance)[3])
+
+
+def simulate_sweep_batch(sys_props, wind_speeds, h_ref, h_0, altitude, rmax, rmin, tether_angle,
+                         time_step_tolerance=None):
+    """Simulate the pumping cycle for several reference wind speeds together as a `CycleBatch`, each with its own time
+    step, see `run_sweep` for the arguments.
+
+    Returns:
+        list: `CycleResult` or `SweepPointError` per wind speed.
+
+    """
+    wind_speeds, time_steps, env_states, _ = sweep_point_inputs(sys_props, wind_speeds, h_ref, h_0, altitude, rmax,
+                                                                rmin, tether_angle, time_step_tolerance)
+    cycle = CycleBatch(sweep_cycle_settings(time_steps, rmax, rmin, tether_angle, time_step_tolerance))
+    summaries = cycle.run_simulation(sys_props, env_states, print_summary=False)
+    results = []
+    for i, (wind_speed, error) in enumerate(zip(wind_speeds, cycle.errors)):
+        if error is None:
+            results.append(CycleResult.from_batch(cycle, i, summaries[i]))
+        else:
+            results.append(SweepPointError(wind_speed, getattr(error, 'msg', str(error)), error.__class__.__name__))
+    return results
+
+
+def run_sweep(sys_props, wind_speeds, h_ref, h_0, altitude, rmax, rmin, tether_angle, cache=None,
+              time_step_tolerance=None):
+    """Simulate the pumping cycle for a range of reference wind speeds at a site. Points of which the result is in the
+    cache are loaded, the others are simulated together as a `CycleBatch` and added to the cache. The app fans the
+    points out over worker processes with `JobRunner.submit_sweep`, which simulates chunks of the points with
+    `simulate_sweep_batch` as well, such that they share cache entries.
+
+    Args:
+        sys_props (`SystemProperties`): Collection of system properties.
+        wind_speeds (iterable): Reference wind speeds [m/s].
+        h_ref (float): Reference height of the wind profile [m].
+        h_0 (float): Roughness length [m].
+        altitude (float): Altitude of the ground station [m].
+        rmax (float): Tether length at the start of the retraction phase [m].
+        rmin (float): Tether length at the end of the retraction phase [m].
+        tether_angle (float): Elevation angle of the traction phase [rad].
+        cache (`ResultCache`, optional): Result cache, results are not cached if None.
+        time_step_tolerance (float, optional): Tolerance of the adaptive time stepping, fixed time steps are used if
+            None.
+
+    Returns:
+        list: Per wind speed, a tuple of the reference wind speed [m/s] and the `CycleResult` or `SweepPointError`.
+
+    """
+    wind_speeds, _, _, keys = sweep_point_inputs(sys_props, wind_speeds, h_ref, h_0, altitude, rmax, rmin,
+                                                 tether_angle, time_step_tolerance)
+    results = [None if cache is None else cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        points = simulate_sweep_batch(sys_props, [wind_speeds[i] for i in missing], h_ref, h_0, altitude, rmax, rmin,
+                                      tether_angle, time_step_tolerance)
+        for i, result in zip(missing, points):
+            results[i] = result
+    if cache is not None:
+        for i in missing:
+            if isinstance(results[i], CycleResult):
+                cache.put(keys[i], results[i])
+    return list(zip(wind_speeds, results))
+
+
+class SweepResult:
+    """Result of a wind-speed sweep at a site, shared by all sweep-based analyses. The metrics per wind speed are
+    derived on first access, all at once with `sweep_metrics`, and memoized.
+
+    Attributes:
+        wind_speeds (ndarray): Reference wind speeds of the successfully simulated points [m/s].
+        points (list): `CycleResult` per successfully simulated point.
+        errors (list): `SweepPointError` per failed point.
+
+    """
+    def __init__(self, results):
+        """
+        Args:
+            results (list): Output of `run_sweep`.
+
+        """
+        self.wind_speeds = np.array([v for v, res in results if not isinstance(res, SweepPointError)], dtype=float)
+        self.points = [res for _, res in results if not isinstance(res, SweepPointError)]
+        self.errors = [res for _, res in results if isinstance(res, SweepPointError)]
+
+    def series(self, field):
+        """Time series of a field per wind speed.
+
+        Args:
+            field (str): Name of the column, see `TimeSeriesColumns`.
+
+        Returns:
+            list: Array per wind speed.
+
+        """
+        return [res.columns[field] for res in self.points]
+
+    def phase_series(self, field, phase_id):
+        """Time series of a field during one of the phases per wind speed.
+
+        Args:
+            field (str): Name of the column, see `TimeSeriesColumns`.
+            phase_id (int): Phase: 0 for retraction, 1 for transition, and 2 for traction.
+
+        Returns:
+            list: Array per wind speed.
+
+        """
+        return [res.columns[field][res.columns['phase_id'] == phase_id] for res in self.points]
+
+    @cached_property
+    def metrics(self):
+        """dict: Metrics per wind speed, see `sweep_metrics`."""
+        return sweep_metrics(self.series('time'), self.series('power_ground'), self.series('reeling_speed'))
+
+    @property
+    def max_power(self):
+        """ndarray: Maximum power per wind speed [W]."""
+        return self.metrics['max_power']
+
+    @property
+    def min_power(self):
+        """ndarray: Minimum power per wind speed [W]."""
+        return self.metrics['min_power']
+
+    @property
+    def mean_power(self):
+        """ndarray: Sample mean of the power per wind speed [W]."""
+        return self.metrics['mean_power']
+
+    @property
+    def mean_power_generation(self):
+        """ndarray: Sample mean of the positive power per wind speed [W], NaN without generation."""
+        return self.metrics['mean_power_generation']
+
+    @property
+    def energy(self):
+        """ndarray: Energy of the cycle per wind speed with the rectangle rule [J]."""
+        return self.metrics['energy']
+
+    @property
+    def energy_generation(self):
+        """ndarray: Energy of the samples with positive power per wind speed with the rectangle rule [J]."""
+        return self.metrics['energy_generation']
+
+    @property
+    def final_reeling_speed(self):
+        """ndarray: Reeling speed at the end of the cycle per wind speed [m/s]."""
+        return self.metrics['final_reeling_speed']
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """Utility functions."""
 
-import matplotlib.pyplot as plt
 from numpy import all, diff, array
 
 
@@ -57,6 +56,7 @@ def plot_traces(x, data_sources, source_labels, plot_parameters, y_labels=None,
         plot_kwargs (dict, optional): Line plot keyword arguments.
 
     """
+    import matplotlib.pyplot as plt
     if y_labels is None:
         y_labels = plot_parameters
     if y_scaling is None:
@@ -86,7 +86,7 @@ def plot_traces(x, data_sources, source_labels, plot_parameters, y_labels=None,
                     y = array(y)*f
                 ax.plot(x, y, label=s_lbl, **plot_kwargs)
                 if plot_markers:
-                    marker_vals = [y[x.index(t)] for t in plot_markers]
+                    marker_vals = [y[list(x).index(t)] for t in plot_markers]
                     ax.plot(plot_markers, marker_vals, 's', markerfacecolor='None')
         ax.set_ylabel(y_lbl)
         ax.grid(True)
@@ -0,0 +1,65 @@
+"""Benchmark of the cold-start import time of the simulation engine, as paid by every worker process and CLI run. Each
+module is imported in a fresh interpreter and the plotting and data frame libraries that it loads are listed, which
+should be none for the engine modules. Run from the repository root with:
+
+    python -m benchmarks.import_time
+
+The exit status is 1 if an engine module loads one of `HEAVY_MODULES`.
+
+"""
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+# Modules of the simulation engine, which should only need NumPy.
+ENGINE_MODULES = ('app.qsm', 'app.cache', 'app.sweep', 'app.metrics', 'app.drivetrain', 'app.regional', 'app.jobs',
+                  'app.cli', 'app.service')
+# Libraries that are only needed for plotting, the web app, or the flight pattern lookup table.
+HEAVY_MODULES = ('matplotlib', 'pandas', 'plotly', 'streamlit')
+
+MEASURE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+dt = time.perf_counter() - t0
+print(json.dumps([dt, sorted(m for m in {heavy!r} if m in sys.modules)]))
+"""
+
+
+def import_time(module, repeat=5):
+    """Import a module in fresh interpreters.
+
+    Args:
+        module (str): Name of the module.
+        repeat (int, optional): Number of interpreters.
+
+    Returns:
+        tuple: Import times [s] and the heavy modules that are loaded by the import.
+
+    """
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', MEASURE.format(module=module, heavy=HEAVY_MODULES)],
+                                check=True, capture_output=True, text=True).stdout
+        dt, loaded = json.loads(output.splitlines()[-1])
+        times.append(dt)
+    return np.array(times), loaded
+
+
+def main():
+    baseline, _ = import_time('numpy')
+    print("Import time [ms] (min / median), numpy alone: {:.1f} / {:.1f}".format(
+        baseline.min()*1e3, np.median(baseline)*1e3))
+    failed = False
+    for module in ENGINE_MODULES:
+        times, loaded = import_time(module)
+        failed |= bool(loaded)
+        print("  {:<16} {:7.1f} / {:7.1f}  {}".format(module, times.min()*1e3, np.median(times)*1e3,
+                                                      "loads " + ", ".join(loaded) if loaded else ""))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Load test of the simulation service of `app.service`: concurrent clients send cycle requests, drawn from a limited
+number of distinct wind speeds such that identical requests are coalesced or served from the cache, and the throughput
+and latency percentiles are reported. Run from the repository root with:
+
+    python -m benchmarks.load_test
+
+which starts a local instance, or against a running instance with:
+
+    python -m benchmarks.load_test --url http://127.0.0.1:8600
+
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+from app.service import SimulationServer, SimulationService
+
+
+def post(url, body, timeout=600.):
+    """Send a JSON request.
+
+    Returns:
+        tuple: HTTP status code and decoded response.
+
+    """
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b'{}')
+
+
+def run_clients(url, n_clients, n_requests, wind_speeds, kite_area=7.):
+    """Let each client send its requests one after the other.
+
+    Returns:
+        tuple: Latency per request [s], number of failed requests, and wall time [s].
+
+    """
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+    rng = np.random.default_rng(0)
+    schedule = rng.choice(wind_speeds, size=(n_clients, n_requests))
+
+    def client(i):
+        for wind_speed in schedule[i]:
+            t0 = time.perf_counter()
+            try:
+                status, _ = post(url + '/cycle', {'kite_area': kite_area, 'wind_speed': float(wind_speed)})
+            except OSError:
+                status = None
+            dt = time.perf_counter() - t0
+            with lock:
+                latencies.append(dt)
+                if status != 200:
+                    failures.append(status)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(n_clients)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies), len(failures), time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the simulation service.")
+    parser.add_argument('--url', help="URL of a running instance, a local instance is started if omitted.")
+    parser.add_argument('-c', '--clients', type=int, default=16, help="Number of concurrent clients.")
+    parser.add_argument('-n', '--requests', type=int, default=10, help="Number of requests per client.")
+    parser.add_argument('-d', '--distinct', type=int, default=8, help="Number of distinct wind speeds.")
+    parser.add_argument('-j', '--workers', type=int, help="Number of worker processes of the local instance.")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        service = SimulationService(args.workers)
+        server = SimulationServer(('127.0.0.1', 0), service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = "http://{}:{}".format(*server.server_address)
+
+    wind_speeds = np.round(np.linspace(5., 12., args.distinct), 2)
+    try:
+        latencies, n_failed, wall_time = run_clients(url, args.clients, args.requests, wind_speeds)
+        with urllib.request.urlopen(url + '/stats') as response:
+            stats = json.loads(response.read())
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            server.service.shutdown()
+
+    print("{} clients x {} requests, {} distinct wind speeds, {} failed.".format(
+        args.clients, args.requests, args.distinct, n_failed))
+    print("Throughput: {:.1f} requests/s over {:.1f} s.".format(len(latencies) / wall_time, wall_time))
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    print("Latency [ms]: p50 {:.1f}, p90 {:.1f}, p99 {:.1f}, max {:.1f}.".format(
+        p50*1e3, p90*1e3, p99*1e3, latencies.max()*1e3))
+    print("Service: {}.".format(", ".join("{} {}".format(k, v) for k, v in sorted(stats.items()))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Microbenchmark of the per-time-step overhead of the `KiteKinematics` and `SteadyState` records, evaluated on the
+reference cycle of `app.qsm`. Run from the repository root with:
+
+    python -m benchmarks.record_overhead
+
+"""
+import timeit
+
+from app.qsm import Cycle, Environment, KiteKinematics, SteadyState, SystemProperties, TractionPhase
+
+
+def reference_cycle():
+    """Reference cycle of the `app.qsm` module.
+
+    Returns:
+        tuple: `Cycle` object, system properties, and environment state.
+
+    """
+    env_state = Environment(wind_speed=10, air_density=1.225)
+    sys_props = SystemProperties({
+        'kite_projected_area': 18,
+        'kite_mass': 20,
+        'tether_density': 724,
+        'tether_diameter': 0.004,
+        'tether_force_min_limit': 1200,
+    })
+    settings = {
+        'cycle': {
+            'traction_phase': TractionPhase,
+        },
+        'retraction': {
+            'control': ('tether_force_ground', 1200),
+        },
+        'transition': {
+            'control': ('reeling_speed', 0.),
+            'time_step': .05,
+        },
+        'traction': {
+            'control': ('reeling_speed', 3000),
+            'time_step': .05,
+        },
+    }
+    return Cycle(settings), sys_props, env_state
+
+
+def time_per_call(stmt, number=20000, repeat=5):
+    """Best time per call of a statement [s]."""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def main():
+    kin = KiteKinematics(200., .1, .4, 1.5)
+    ss = SteadyState()
+    fields = ('reeling_factor', 'kinematic_ratio', 'tangential_speed_factor', 'wind_speed', 'apparent_wind_speed',
+              'heading', 'inflow_angle', 'angle_of_attack', 'lift_to_drag', 'aerodynamic_force', 'tether_force_kite',
+              'tether_force_ground', 'power_ground', 'kite_speed', 'kite_tangential_speed', 'reeling_speed',
+              'elevation_rate', 'azimuth_rate', 'lift_to_drag_error', 'n_iterations', 'converged')
+
+    def set_attributes():
+        for f in fields:
+            setattr(ss, f, 1.)
+
+    def get_attributes():
+        for f in fields:
+            getattr(ss, f)
+
+    print("Per record [us]:")
+    print("  KiteKinematics copy:       {:.3f}".format(time_per_call(kin.copy)*1e6))
+    print("  KiteKinematics creation:   {:.3f}".format(time_per_call(lambda: KiteKinematics(200., .1, .4, 1.5))*1e6))
+    print("  SteadyState creation:      {:.3f}".format(time_per_call(SteadyState)*1e6))
+    print("  SteadyState set {} attrs:  {:.3f}".format(len(fields), time_per_call(set_attributes)*1e6))
+    print("  SteadyState get {} attrs:  {:.3f}".format(len(fields), time_per_call(get_attributes)*1e6))
+
+    def run_cycle():
+        cycle, sys_props, env_state = reference_cycle()
+        cycle.run_simulation(sys_props, env_state)
+        return len(cycle.time)
+
+    n_time_points = run_cycle()
+    t = min(timeit.repeat(run_cycle, number=1, repeat=5))
+    print("Reference cycle: {} time points, {:.1f} ms in total, {:.1f} us per time step.".format(
+        n_time_points, t*1e3, t/n_time_points*1e6))
+
+
+if __name__ == "__main__":
+    main()
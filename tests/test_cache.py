@@ -0,0 +1,43 @@
+"""Behaviour of the on-disk result cache."""
+import os
+
+import numpy as np
+
+from app.cache import CycleResult, ResultCache
+
+
+def cycle_result(n):
+    return CycleResult((None, 1., 2.), 10.*n, 2.*n, 5., {'time': np.arange(float(n)), 'power': np.ones(n)})
+
+
+def test_hit_and_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.get('a') is None
+
+    cache.put('a', cycle_result(3))
+    result = cache.get('a')
+    assert result.energy == 30. and result.duration == 6. and result.summary == (None, 1., 2.)
+    np.testing.assert_array_equal(result.time, np.arange(3.))
+
+
+def test_corrupt_entry_is_removed(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    with open(os.path.join(str(tmp_path), 'a' + ResultCache.SUFFIX), 'wb') as f:
+        f.write(b'not an archive')
+    assert cache.get('a') is None
+    assert not os.listdir(str(tmp_path))
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    for i, key in enumerate('abc'):
+        cache.put(key, cycle_result(100))
+        os.utime(os.path.join(str(tmp_path), key + ResultCache.SUFFIX), (1000.*(i + 1), 1000.*(i + 1)))
+    # Loading 'a' marks it as recently used, such that 'b' is the least recently used entry.
+    assert cache.get('a') is not None
+
+    sizes = [os.path.getsize(os.path.join(str(tmp_path), key + ResultCache.SUFFIX)) for key in 'abc']
+    cache.max_bytes = sum(sizes) - 1
+    cache.evict()
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
@@ -0,0 +1,57 @@
+"""Behaviour of the headless parameter study runner."""
+import csv
+import json
+
+import numpy as np
+import pytest
+
+import app.cli
+from app.cli import grid_points, load_study, point_key, run_study
+
+
+def write_study(tmp_path, **entries):
+    study = {
+        'kite_areas': [7.],
+        'wind_speeds': {'min': 7., 'max': 9., 'steps': 2},
+        'gearbox_ratios': [4.26, 6.],
+        'time_step_tolerance': 1e-2,
+        'sites': [
+            {'name': 'a', 'h_0': 0.073, 'altitude': 1450.},
+            {'name': 'b', 'h_0': 0.1, 'altitude': 500., 'wind_speeds': [6., 10., 12.]},
+        ],
+    }
+    study.update(entries)
+    path = tmp_path / 'study.json'
+    path.write_text(json.dumps(study))
+    return str(path)
+
+
+def test_wind_speeds_per_site(tmp_path):
+    study = load_study(write_study(tmp_path))
+    points = grid_points(study)
+
+    assert [p['wind_speeds'] for p in points] == [[7., 9.], [6., 10., 12.]]
+    assert point_key(study, points[0]) != point_key(study, {**points[0], 'wind_speeds': [7., 10.]})
+
+    with pytest.raises(ValueError):
+        load_study(write_study(tmp_path, wind_speeds=None))
+
+
+def test_resume_from_result_files(tmp_path, monkeypatch):
+    study = load_study(write_study(tmp_path))
+    output_dir = str(tmp_path / 'results')
+    progress = []
+    summary_path = run_study(study, output_dir, max_workers=1, progress=lambda *p: progress.append(p[1:]))
+
+    with open(summary_path) as f:
+        rows = list(csv.DictReader(f))
+    # A row per gearbox ratio and wind speed of each site.
+    assert len(rows) == 2*2 + 2*3
+    assert all(not row['error'] and np.isfinite(float(row['mean_power'])) for row in rows)
+    assert progress == [(1, 2), (2, 2)]
+
+    def fail(*args):
+        raise AssertionError("Completed grid points should not be simulated again.")
+    monkeypatch.setattr(app.cli, 'simulate_point', fail)
+    with open(run_study(study, output_dir, max_workers=1)) as f:
+        assert list(csv.DictReader(f)) == rows
@@ -0,0 +1,39 @@
+"""Behaviour of the decimation of time series."""
+import numpy as np
+import pytest
+
+pytest.importorskip('plotly')
+
+from app.decimation import decimate, lttb_indices, minmax_indices  # noqa: E402
+
+
+def series(n=5000):
+    x = np.linspace(0., 100., n)
+    return x, np.sin(x) + 0.01*x
+
+
+def test_lttb_keeps_endpoints():
+    x, y = series()
+    idx = lttb_indices(x, y, 100)
+
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_minmax_keeps_extremes_and_endpoints():
+    x, y = series()
+    idx = minmax_indices(x, y, 50)
+
+    assert len(idx) <= 2*50 + 2
+    assert {0, len(x) - 1, int(np.argmin(y)), int(np.argmax(y))} <= set(idx.tolist())
+
+
+@pytest.mark.parametrize('method', ['minmax', 'lttb'])
+def test_decimate_bounds_points(method):
+    x, y = series()
+    xd, yd = decimate(x, y, 500, method)
+
+    assert len(xd) <= 500
+    assert yd.min() == y.min() and yd.max() == y.max()
+    assert xd[0] == x[0] and xd[-1] == x[-1]
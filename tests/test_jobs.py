@@ -0,0 +1,56 @@
+"""Behaviour of the background simulation jobs of the app."""
+import numpy as np
+
+from app.cache import ResultCache
+from app.jobs import JobRunner, SweepResultStore
+from app.sweep import kite_system_properties, run_sweep, sweep_key
+
+SWEEP = (kite_system_properties(7.), [7., 9.], 10., 0.073, 1450., 200., 100., 26.6*np.pi/180., 1e-2)
+
+
+class CompletedJob:
+    def __init__(self, key):
+        self.key = key
+
+    def sweep_result(self):
+        return object()
+
+
+def test_store_keeps_least_recently_used_results():
+    store = SweepResultStore(max_size=2)
+    assert store.get('a') is None
+
+    result = store.add(CompletedJob('a'))
+    assert store.add(CompletedJob('a')) is result and store.get('a') is result
+    store.add(CompletedJob('b'))
+    store.get('a')
+    store.add(CompletedJob('c'))
+    assert store.get('b') is None
+    assert store.get('a') is result and store.get('c') is not None
+
+
+def test_cached_sweep_completes_at_submission(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    reference = run_sweep(*SWEEP[:-1], cache, time_step_tolerance=SWEEP[-1])
+    runner = JobRunner(cache)
+    job = runner.submit_sweep(*SWEEP)
+
+    assert job.done and job.status == 'done'
+    assert job.key == sweep_key(*SWEEP)
+    assert [r.energy for _, r in job.completed()] == [r.energy for _, r in reference]
+
+
+def test_sweep_job_matches_run_sweep(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    runner = JobRunner(cache, max_workers=1)
+    try:
+        job = runner.submit_sweep(*SWEEP)
+        assert job.wait(120.) and job.status == 'done'
+    finally:
+        runner.shutdown()
+
+    # The points of the job are cached, and equal the batch of `run_sweep`.
+    reference = run_sweep(*SWEEP[:-1], time_step_tolerance=SWEEP[-1])
+    assert all(cache.get(key) is not None for key in job.key)
+    for (_, result), (_, expected) in zip(job.completed(), reference):
+        assert result.energy == expected.energy
@@ -0,0 +1,60 @@
+"""Behaviour of the nearest grid cell lookup of the location data."""
+import numpy as np
+import pytest
+
+from app.location_utils import LocationService
+
+
+class GridLocationService(LocationService):
+    def __init__(self, latitudes, longitudes):
+        super().__init__(latitudes, longitudes)
+        shape = (len(self.latitudes), len(self.longitudes))
+        self.values = np.arange(np.prod(shape), dtype=float).reshape(shape)
+
+    def read_roughness(self, time_index, lat_idx, lon_idx):
+        return self.values[lat_idx, lon_idx]
+
+    def read_altitude(self, lat_idx, lon_idx):
+        return -self.values[lat_idx, lon_idx]
+
+
+def test_regular_grid_indices():
+    service = GridLocationService(np.arange(45., 35., -.5), np.arange(0., 360., .25))
+
+    assert service.latitude_index(40.1) == 10
+    assert service.latitude_index(50.) == 0 and service.latitude_index(30.) == 19
+    # Longitudes west of Greenwich wrap to the 0..360 convention of the grid, also across the last column.
+    assert service.longitude_index(-3.7) == service.longitude_index(356.3) == 1425
+    assert service.longitude_index(359.9) == 0
+    np.testing.assert_array_equal(service.latitude_index([44.9, 36.]), [0, 18])
+    assert service.grid_spacing == (.5, .25)
+
+
+def test_regional_grid_indices():
+    service = GridLocationService([40., 39.], np.arange(-10., 10.5, 1.))
+
+    assert service.longitude_index(350.) == 0
+    assert service.longitude_index(100.) == 20 and service.longitude_index(-100.) == 0
+
+
+def test_irregular_grid_indices():
+    service = GridLocationService([40., 39., 37.], [0., 1., 3.])
+
+    assert service.latitude_index(37.9) == 2
+    assert service.longitude_index(2.1) == 2
+    assert service.longitude_index(0.4) == 0
+
+
+def test_lookup():
+    service = GridLocationService(np.arange(45., 35., -.5), np.arange(-10., 10., .5))
+
+    roughness, altitude = service.lookup(40., 0.)
+    assert roughness == service.values[10, 20] and altitude == -roughness
+    roughness, altitude = service.lookup_many([[40., 45.]], [[0., -10.]])
+    np.testing.assert_array_equal(roughness, [[service.values[10, 20], 0.]])
+    assert altitude.shape == (1, 2)
+
+
+def test_data_access_is_abstract():
+    with pytest.raises(TypeError):
+        LocationService([0., 1.], [0., 1.])
@@ -0,0 +1,35 @@
+"""Behaviour of the binning of sweep samples."""
+import numpy as np
+
+from app.metrics import bin_nearest, bin_rounded
+
+
+def test_bin_nearest():
+    x = np.array([0., 0.2, 1.1, 2., 1.9, 0.5])
+    y = np.array([1., 2., 3., 4., 5., 6.])
+    centres, groups, quartiles = bin_nearest(x, y, n_bins=3)
+
+    np.testing.assert_allclose(centres, [0., 1., 2.])
+    # The sample halfway between the first two centres belongs to the lower bin.
+    assert [g.tolist() for g in groups] == [[1., 2., 6.], [3.], [4., 5.]]
+    np.testing.assert_allclose(quartiles[0], np.percentile([1., 2., 6.], [25, 50, 75]))
+
+
+def test_bin_nearest_skips_empty_bins():
+    centres, groups, quartiles = bin_nearest([0., 10.], [1., 2.], n_bins=5)
+    np.testing.assert_allclose(centres, [0., 10.])
+    assert len(groups) == 2 and quartiles.shape == (2, 3)
+
+    centres, groups, quartiles = bin_nearest([], [])
+    assert len(centres) == 0 and groups == [] and quartiles.shape == (0, 3)
+
+
+def test_bin_rounded():
+    bins, groups = bin_rounded([5.4, 6.5, 4.6, 7.5, 5.], [1., 2., 3., 4., 5.])
+
+    # Halfway values are rounded to the even integer.
+    assert bins.tolist() == [5, 6, 8]
+    assert [g.tolist() for g in groups] == [[1., 3., 5.], [2.], [4.]]
+
+    bins, groups = bin_rounded([], [])
+    assert len(bins) == 0 and groups == []
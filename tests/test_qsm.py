@@ -0,0 +1,91 @@
+"""Regression checks of the QSM engine, run from the repository root with `python -m pytest`."""
+import numpy as np
+import pytest
+
+from app.qsm import Cycle, CycleBatch, LogProfile, SystemProperties, TractionPhaseHybrid
+from app.sweep import kite_system_properties, sweep_cycle_settings, sweep_point_inputs
+
+
+def system_properties():
+    return SystemProperties({
+        'kite_projected_area': 7.,
+        'kite_mass': 4.,
+        'tether_density': 724.,
+        'tether_diameter': 0.002,
+        'kite_lift_coefficient_powered': 0.69,
+        'kite_drag_coefficient_powered': 0.69 / 3.6,
+        'kite_lift_coefficient_depowered': .17,
+        'kite_drag_coefficient_depowered': .17 / 3.5,
+        'reeling_speed_min_limit': 0.,
+        'reeling_speed_max_limit': 10.,
+        'tether_force_min_limit': 500.,
+        'tether_force_max_limit': 50000.,
+    })
+
+
+def environment(wind_speed):
+    env_state = LogProfile()
+    env_state.set_reference_height(10)
+    env_state.set_reference_wind_speed(wind_speed)
+    env_state.set_reference_roughness_length(0.073)
+    env_state.set_altitude_ground(1450)
+    return env_state
+
+
+def test_hybrid_traction_cycle():
+    settings = {
+        'cycle': {
+            'tether_length_start_retraction': 200,
+            'tether_length_end_retraction': 100,
+            'elevation_angle_traction': 26.6*np.pi/180.,
+            'traction_phase': TractionPhaseHybrid,
+        },
+        'retraction': {'control': ('tether_force_ground', 900), 'time_step': .1},
+        'transition': {'control': ('tether_force_ground', 900), 'time_step': .1},
+        'traction': {'control': ('max_power_reeling_factor', 3069), 'azimuth_angle': 10.6*np.pi/180.,
+                     'course_angle': 96.4*np.pi/180., 'time_step': .1},
+    }
+    cycle = Cycle(settings)
+    error_in_phase, duration, average_power = cycle.run_simulation(system_properties(), environment(9.))[:3]
+
+    assert error_in_phase is None
+    assert duration > 0 and average_power > 0
+    assert cycle.traction_phase.n_crosswind_patterns > 0
+
+
+def test_batch_matches_cycles():
+    sys_props = kite_system_properties(7.)
+    tether_angle = 26.6*np.pi/180.
+    _, time_steps, environments, _ = sweep_point_inputs(sys_props, np.array([6., 12., 18.]), 10., 0.073, 1450., 200.,
+                                                        100., tether_angle)
+    batch = CycleBatch(sweep_cycle_settings(time_steps, 200., 100., tether_angle))
+    batch.run_simulation(sys_props, environments)
+
+    for i, (time_step, env_state) in enumerate(zip(time_steps, environments)):
+        cycle = Cycle(sweep_cycle_settings(float(time_step), 200., 100., tether_angle))
+        cycle.run_simulation(sys_props, env_state)
+        assert batch.average_power[i] == pytest.approx(cycle.average_power, rel=1e-12)
+        assert np.array_equal(batch.results[i]['phase_id'], cycle.phase_id)
+
+
+def test_adaptive_time_stepping():
+    sys_props = kite_system_properties(7.)
+    tether_angle = 26.6*np.pi/180.
+    _, time_steps, environments, _ = sweep_point_inputs(sys_props, np.array([8., 15.]), 10., 0.073, 1450., 200.,
+                                                        100., tether_angle)
+    tolerance = 1e-2
+    batch = CycleBatch(sweep_cycle_settings(time_steps, 200., 100., tether_angle, tolerance))
+    batch.run_simulation(sys_props, environments)
+
+    for i, (time_step, env_state) in enumerate(zip(time_steps, environments)):
+        fixed = Cycle(sweep_cycle_settings(float(time_step), 200., 100., tether_angle))
+        fixed.run_simulation(sys_props, env_state)
+        adaptive = Cycle(sweep_cycle_settings(float(time_step), 200., 100., tether_angle, tolerance))
+        adaptive.run_simulation(sys_props, env_state)
+
+        assert batch.energy[i] == pytest.approx(adaptive.energy, rel=1e-12)
+        assert len(batch.results[i]['time']) == len(adaptive.time)
+        assert len(adaptive.time) < len(fixed.time)/2
+        assert adaptive.traction_phase.energy == pytest.approx(fixed.traction_phase.energy, rel=tolerance)
+        assert adaptive.retraction_phase.energy == pytest.approx(fixed.retraction_phase.energy, rel=tolerance)
+        assert adaptive.duration == pytest.approx(fixed.duration, rel=tolerance)
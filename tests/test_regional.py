@@ -0,0 +1,48 @@
+"""Behaviour of the regional power maps."""
+import numpy as np
+import pytest
+
+import app.regional
+from app.location_utils import LocationService
+from app.regional import quantize_sites, run_regional
+from app.sweep import kite_system_properties
+
+
+class SiteLocationService(LocationService):
+    def __init__(self):
+        super().__init__(np.arange(41., 39., -.25), np.arange(-4., -2., .25))
+
+    def read_roughness(self, time_index, lat_idx, lon_idx):
+        return np.where(np.asarray(lat_idx) % 2, 0.05, 0.1)
+
+    def read_altitude(self, lat_idx, lon_idx):
+        return np.where(np.asarray(lon_idx) == 0, np.nan, 500.)
+
+
+def test_quantize_sites():
+    roughness, altitude = quantize_sites([0.1, 0.1001, 0., 0.2], [503., 498., 500., np.nan])
+
+    assert roughness[0] == roughness[1] and altitude[0] == altitude[1] == 500.
+    assert np.isnan(roughness[2:]).all() and np.isnan(altitude[2:]).all()
+
+
+def test_resume_from_checkpoints(tmp_path, monkeypatch):
+    args = (kite_system_properties(7.), SiteLocationService(), (40., 40.5, -4., -3.5), [8.])
+    kwargs = dict(checkpoint_dir=str(tmp_path), chunk_size=1, max_workers=1, time_step_tolerance=1e-2)
+    calls = []
+    result = run_regional(*args, **kwargs, progress=lambda *p: calls.append(p))
+
+    assert result.mean_power.shape == (1, 3, 3)
+    # Cells without data are not simulated, the two remaining sites are simulated once each.
+    assert np.isnan(result.mean_power[0, :, 0]).all() and np.isfinite(result.mean_power[0, :, 1:]).all()
+    assert calls == [(0, 2), (1, 2), (2, 2)]
+
+    def fail(*args):
+        raise AssertionError("Checkpointed chunks should not be simulated again.")
+    monkeypatch.setattr(app.regional, 'simulate_sites', fail)
+    resumed = run_regional(*args, **kwargs)
+    np.testing.assert_array_equal(resumed.mean_power, result.mean_power)
+    np.testing.assert_array_equal(resumed.energy, result.energy)
+
+    with pytest.raises(AssertionError):
+        run_regional(*args[:3], [9.], **kwargs)
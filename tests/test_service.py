@@ -0,0 +1,19 @@
+"""Behaviour of the coalescing simulation service."""
+from app.service import SimulationService, parse_request
+
+
+def test_identical_requests_share_a_computation():
+    service = SimulationService(max_workers=1)
+    params = parse_request('sweep', {'kite_area': 7., 'wind_speeds': [8.], 'time_step_tolerance': 1e-2})
+    try:
+        first = service.submit('sweep', params)
+        second = service.submit('sweep', dict(params))
+        response = first.result(timeout=120.)
+        assert second is first or second.result() == response
+        cached = service.submit('sweep', params)
+        assert cached.result() == response
+    finally:
+        service.shutdown()
+
+    assert service.stats['requests'] == 3 and service.stats['computed'] == 1
+    assert service.stats['coalesced'] + service.stats['cache_hits'] == 2